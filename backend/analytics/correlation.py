@@ -0,0 +1,148 @@
+"""
+Correlation of survey factor scores with employee exits.
+
+Each employee's mean ``SurveyResponse.score`` per factor becomes one cell of
+an employees x factors matrix (NaN where the employee has no scored answer
+for the factor), and the exit outcome is a 0/1 vector: 1 for employees with
+an ``EmployeeTurnover`` record. The point-biserial correlation of every
+column with the outcome is the Pearson correlation over the column's
+non-missing cells, computed for all factors at once from masked sums.
+
+Confidence intervals use the Fisher transformation, ``z = atanh(r)`` with
+standard error ``1 / sqrt(n - 3)``, so they need at least four employees.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg
+
+from surveys.models import Factor, SurveyResponse
+from .models import EmployeeTurnover, RiskFactor
+
+# Two-sided 95% normal quantile.
+Z_95 = 1.959963984540054
+
+# Fewest employees with a score needed to report a factor.
+MIN_SAMPLE_SIZE = 4
+
+
+@dataclass
+class FactorCorrelation:
+    """Correlation of one factor's scores with exits."""
+
+    factor_id: int
+    correlation: float
+    sample_size: int
+    ci_lower: float
+    ci_upper: float
+
+
+def score_matrix(employees=None):
+    """
+    Return ``(employee_ids, factor_ids, scores)`` where ``scores[i, j]`` is the
+    mean score of employee ``i`` on factor ``j``, NaN if there is none.
+
+    ``employees`` optionally limits the rows to an ``Employee`` queryset.
+    """
+    responses = SurveyResponse.objects.filter(score__isnull=False, question__factor__isnull=False)
+    if employees is not None:
+        responses = responses.filter(assignment__employee__in=employees.values('pk'))
+    rows = list(
+        responses.values_list(
+            'assignment__employee_id', 'question__factor_id'
+        ).annotate(mean_score=Avg('score')).order_by()
+    )
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, 0))
+
+    owners, factors, values = (np.array(column) for column in zip(*rows))
+    employee_ids, row = np.unique(owners.astype(np.int64), return_inverse=True)
+    factor_ids, column = np.unique(factors.astype(np.int64), return_inverse=True)
+    scores = np.full((len(employee_ids), len(factor_ids)), np.nan)
+    scores[row, column] = values.astype(np.float64)
+    return employee_ids, factor_ids, scores
+
+
+def correlate(scores, outcome):
+    """
+    Point-biserial correlation of each column of ``scores`` with ``outcome``.
+
+    Returns ``(r, n)`` arrays; ``r`` is NaN where a column or its outcomes
+    have no variance.
+    """
+    present = ~np.isnan(scores)
+    x = np.where(present, scores, 0.0)
+    y = present * outcome[:, None]
+
+    n = present.sum(axis=0).astype(np.float64)
+    sum_x, sum_y = x.sum(axis=0), y.sum(axis=0)
+    # Centered sums; y is 0/1 so its sum of squares equals its sum.
+    sxy = (x * y).sum(axis=0) - sum_x * sum_y / np.maximum(n, 1)
+    sxx = (x * x).sum(axis=0) - sum_x * sum_x / np.maximum(n, 1)
+    syy = sum_y - sum_y * sum_y / np.maximum(n, 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = sxy / np.sqrt(sxx * syy)
+    r[(sxx <= 1e-12) | (syy <= 1e-12)] = np.nan
+    return np.clip(r, -1.0, 1.0), n.astype(np.int64)
+
+
+def confidence_interval(r, n, z=Z_95):
+    """Fisher-z confidence bounds for arrays of correlations and sample sizes."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = np.arctanh(np.clip(r, -0.999999, 0.999999))
+        margin = z / np.sqrt(n - 3.0)
+    return np.tanh(center - margin), np.tanh(center + margin)
+
+
+def analyze():
+    """Correlate every scored factor with exits; returns ``FactorCorrelation`` rows."""
+    employee_ids, factor_ids, scores = score_matrix()
+    if not len(factor_ids):
+        return []
+    exited = np.fromiter(
+        EmployeeTurnover.objects.values_list('employee_id', flat=True).distinct(),
+        dtype=np.int64
+    )
+    outcome = np.isin(employee_ids, exited).astype(np.float64)
+
+    r, n = correlate(scores, outcome)
+    lower, upper = confidence_interval(r, n)
+    keep = ~np.isnan(r) & (n >= MIN_SAMPLE_SIZE)
+    return [
+        FactorCorrelation(
+            factor_id=int(factor_ids[j]),
+            correlation=round(float(r[j]), 4),
+            sample_size=int(n[j]),
+            ci_lower=round(float(lower[j]), 4),
+            ci_upper=round(float(upper[j]), 4),
+        )
+        for j in np.flatnonzero(keep)
+    ]
+
+
+def record(analysis_date):
+    """
+    Store the current correlations as ``RiskFactor`` rows dated
+    ``analysis_date`` and return them, strongest first. Rows of earlier runs
+    are kept, since reports refer to them by id.
+    """
+    results = sorted(analyze(), key=lambda result: -abs(result.correlation))
+    with transaction.atomic():
+        risk_factors = RiskFactor.objects.bulk_create([
+            RiskFactor(
+                factor_id=result.factor_id,
+                correlation=result.correlation,
+                sample_size=result.sample_size,
+                ci_lower=result.ci_lower,
+                ci_upper=result.ci_upper,
+                analysis_date=analysis_date,
+            )
+            for result in results
+        ])
+    names = dict(Factor.objects.filter(pk__in=[result.factor_id for result in results]).values_list('pk', 'name'))
+    for risk_factor in risk_factors:
+        risk_factor.factor_name = names.get(risk_factor.factor_id)
+    return risk_factors
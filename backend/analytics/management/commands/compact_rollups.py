@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import DEFAULT_WINDOW_DAYS, compact, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Repair recent turnover and survey rollups and drop daily rows past retention; run nightly.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=DEFAULT_WINDOW_DAYS,
+                            help='Days of survey activity to recompute')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute every rollup from the source tables')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            rebuild()
+            self.stdout.write(self.style.SUCCESS('Rebuilt all rollups.'))
+            return
+        dropped = compact(window=options['window'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Recomputed the last {options['window']} days and dropped {dropped} daily rows."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from analytics.risk import score
+
+
+class Command(BaseCommand):
+    help = 'Fit the turnover-risk model and update employee risk scores and bands.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help='Reuse the latest model and only score employees whose inputs changed')
+
+    def handle(self, *args, **options):
+        def report(result):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{result.scored} employees scored")
+
+        result = score(incremental=options['incremental'], progress=report)
+
+        if result.model_id is None:
+            self.stdout.write(self.style.WARNING(
+                'No model: scoring needs both employees who left and employees who stayed.'
+            ))
+            return
+        fitted = 'fitted new' if result.fitted else 'reused'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {result.scored} employees in {result.elapsed:.2f}s ({fitted} model {result.model_id})."
+        ))
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_alter_employeeturnover_performance_rating_and_more'),
+        ('departments', '0001_initial'),
+        ('surveys', '0004_keyset_indexes'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeeturnover',
+            index=models.Index(fields=['exit_date', 'id'], name='turnover_exit_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='riskfactor',
+            name='ci_lower',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='riskfactor',
+            name='ci_upper',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
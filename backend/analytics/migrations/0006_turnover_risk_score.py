@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_risk_factor_confidence_interval'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TurnoverRiskModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fitted_at', models.DateTimeField(auto_now_add=True)),
+                ('sample_size', models.IntegerField()),
+                ('exit_count', models.IntegerField()),
+                ('factor_ids', models.JSONField()),
+                ('feature_names', models.JSONField()),
+                ('intercept', models.FloatField()),
+                ('coefficients', models.JSONField()),
+                ('means', models.JSONField()),
+                ('scales', models.JSONField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_turnover_risk_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department_key', models.PositiveIntegerField(default=0)),
+                ('factor_key', models.PositiveIntegerField(default=0)),
+                ('hires', models.IntegerField(default=0)),
+                ('exits', models.IntegerField(default=0)),
+                ('assignments_issued', models.IntegerField(default=0)),
+                ('assignments_completed', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('score_count', models.IntegerField(default=0)),
+                ('day', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department_key', models.PositiveIntegerField(default=0)),
+                ('factor_key', models.PositiveIntegerField(default=0)),
+                ('hires', models.IntegerField(default=0)),
+                ('exits', models.IntegerField(default=0)),
+                ('assignments_issued', models.IntegerField(default=0)),
+                ('assignments_completed', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('score_count', models.IntegerField(default=0)),
+                ('month', models.DateField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'department_key', 'factor_key'), name='dailyrollup_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrollup',
+            constraint=models.UniqueConstraint(fields=('month', 'department_key', 'factor_key'), name='monthlyrollup_key'),
+        ),
+    ]
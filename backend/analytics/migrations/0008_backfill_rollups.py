@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from analytics.rollups import rebuild
+
+
+def backfill_rollups(apps, schema_editor):
+    rebuild(registry=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_rollups'),
+        ('surveys', '0012_survey_drafts'),
+        ('users', '0002_turnover_risk_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
+from .rollups import EMPLOYEE_FACTS, employee_facts, record_difference
+
 User = get_user_model()
 
 class RiskFactor(models.Model):
@@ -11,8 +13,11 @@ class RiskFactor(models.Model):
         on_delete=models.CASCADE,
         related_name='risk_correlations'
     )
-    correlation = models.FloatField()  # 0.0 to 1.0
+    correlation = models.FloatField()  # point-biserial, -1.0 to 1.0
     sample_size = models.IntegerField()
+    # 95% confidence interval of the correlation
+    ci_lower = models.FloatField(null=True, blank=True)
+    ci_upper = models.FloatField(null=True, blank=True)
     analysis_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -32,6 +37,24 @@ class TurnoverAnalytics(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+class TurnoverRiskModel(models.Model):
+    """Fitted parameters of the logistic turnover-risk model (see analytics.risk)"""
+
+    fitted_at = models.DateTimeField(auto_now_add=True)
+    sample_size = models.IntegerField()
+    exit_count = models.IntegerField()
+    factor_ids = models.JSONField()
+    feature_names = models.JSONField()
+    intercept = models.FloatField()
+    coefficients = models.JSONField()
+    # Standardization applied to each feature before the coefficients
+    means = models.JSONField()
+    scales = models.JSONField()
+
+    def __str__(self):
+        return f"Risk model {self.fitted_at:%Y-%m-%d %H:%M} (n={self.sample_size})"
+
+
 class EmployeeTurnover(models.Model):
     """Model to track employee turnover events"""
 
@@ -86,6 +109,11 @@ class EmployeeTurnover(models.Model):
         related_name='recorded_turnovers'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['exit_date', 'id'], name='turnover_exit_date_id_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         """Automatically calculate tenure in months based on employee.hire_date and exit_date"""
         if self.employee and self.exit_date:
@@ -93,7 +121,58 @@ class EmployeeTurnover(models.Model):
             if hire_date:
                 delta_months = (self.exit_date.year - hire_date.year) * 12 + (self.exit_date.month - hire_date.month)
                 self.tenure_months = max(delta_months, 0)
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # An exit can also start counting the employee's hire
+            before = employee_facts(self.employee_id, EMPLOYEE_FACTS)
+            super().save(*args, **kwargs)
+            record_difference(before, employee_facts(self.employee_id, EMPLOYEE_FACTS))
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            before = employee_facts(self.employee_id, EMPLOYEE_FACTS)
+            result = super().delete(*args, **kwargs)
+            record_difference(before, employee_facts(self.employee_id, EMPLOYEE_FACTS))
+        return result
 
     def __str__(self):
-        return f"{self.employee.user.email} - {self.exit_date}"
\ No newline at end of file
+        return f"{self.employee.user.email} - {self.exit_date}"
+
+
+class RollupFacts(models.Model):
+    """
+    Additive facts per period, department and factor (see analytics.rollups).
+
+    Keys are plain ids with 0 for "none", so the unique constraint also
+    covers rows without a department or factor.
+    """
+
+    department_key = models.PositiveIntegerField(default=0)
+    factor_key = models.PositiveIntegerField(default=0)
+    hires = models.IntegerField(default=0)
+    exits = models.IntegerField(default=0)
+    assignments_issued = models.IntegerField(default=0)
+    assignments_completed = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    score_count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class DailyRollup(RollupFacts):
+    day = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'department_key', 'factor_key'], name='dailyrollup_key'),
+        ]
+
+
+class MonthlyRollup(RollupFacts):
+    # First day of the month
+    month = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'department_key', 'factor_key'], name='monthlyrollup_key'),
+        ]
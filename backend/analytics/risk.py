@@ -0,0 +1,275 @@
+"""
+Turnover-risk model maintaining ``Employee.risk_score`` and ``turnover_risk``.
+
+A logistic regression predicts whether an employee leaves from:
+
+* their mean survey score per factor, multiplied by ``Factor.weight``;
+* tenure in years, up to the exit date for employees who left;
+* the number of completed trainings (``log1p``) and the share of assigned
+  trainings completed.
+
+The model is fitted with Newton iterations and an L2 penalty on every
+employee who is active or has an ``EmployeeTurnover`` record, labelled by
+whether they have one. Features are standardized and missing factor scores
+are imputed with the mean. Fitted parameters are stored as a
+``TurnoverRiskModel`` so later runs can score without refitting.
+
+Feature matrices are built from three grouped queries per run and scored in
+one matrix product. ``changed_employees`` selects active employees whose
+inputs may have changed since they were last scored, for incremental runs.
+Rescoring clears ``risk_scored_at`` of employees whose response scores
+changed; a change to any factor since the model was fitted makes an
+incremental run refit and score everyone, as weights scale every employee's
+features.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Exists, Min, OuterRef, Q
+from django.utils import timezone
+
+from surveys.dashboard import invalidate as invalidate_dashboard
+from surveys.models import Factor, SurveyAssignment
+from trainings.models import TrainingAssignment
+from users.models import Employee
+from .correlation import score_matrix
+from .models import EmployeeTurnover, TurnoverRiskModel
+
+# Probability bounds of the MEDIUM and HIGH bands.
+MEDIUM_RISK = 0.3
+HIGH_RISK = 0.6
+
+# Strength of the L2 penalty on the (standardized) coefficients.
+L2_PENALTY = 1.0
+
+MAX_ITERATIONS = 25
+TOLERANCE = 1e-8
+
+# Precision of stored scores; also bounds the number of UPDATE statements.
+SCORE_DECIMALS = 3
+
+WRITE_BATCH_SIZE = 1000
+
+_OTHER_FEATURES = ['tenure_years', 'trainings_completed', 'training_completion_rate']
+
+
+@dataclass
+class RiskScoringResult:
+    """Counters reported by a scoring run."""
+
+    model_id: int = None
+    fitted: bool = False
+    scored: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self):
+        return {
+            'model_id': self.model_id,
+            'fitted': self.fitted,
+            'scored': self.scored,
+            'elapsed_seconds': round(self.elapsed, 3),
+        }
+
+
+def band(probabilities):
+    """Map risk probabilities to ``turnover_risk`` choices."""
+    return np.where(
+        probabilities >= HIGH_RISK, 'HIGH', np.where(probabilities >= MEDIUM_RISK, 'MEDIUM', 'LOW')
+    )
+
+
+def population():
+    """Employees the model learns from: active or with a recorded exit."""
+    exited = EmployeeTurnover.objects.filter(employee=OuterRef('pk'))
+    return Employee.objects.filter(Q(is_active=True) | Exists(exited))
+
+
+def changed_employees(model):
+    """
+    Active employees not scored by ``model`` yet (including those whose
+    scores were re-graded), or with a survey completed or a training assigned
+    or completed since they were last scored.
+    """
+    surveys = SurveyAssignment.objects.filter(
+        employee=OuterRef('pk'), completed_at__gt=OuterRef('risk_scored_at')
+    )
+    trainings = TrainingAssignment.objects.filter(employee=OuterRef('pk')).filter(
+        Q(assigned_at__gt=OuterRef('risk_scored_at')) | Q(completion_date__gte=OuterRef('risk_scored_at__date'))
+    )
+    return Employee.objects.filter(is_active=True).filter(
+        Q(risk_scored_at__isnull=True) | Q(risk_scored_at__lt=model.fitted_at) | Exists(surveys) | Exists(trainings)
+    )
+
+
+def factors_changed(model):
+    """Whether a factor was added or edited, e.g. reweighted, after ``model`` was fitted."""
+    return Factor.objects.filter(updated_at__gt=model.fitted_at).exists()
+
+
+def features(employees, factor_ids, as_of):
+    """
+    Build the raw feature matrix for an ``Employee`` queryset.
+
+    Returns ``(employee_ids, matrix, exited)``; columns follow ``factor_ids``
+    and then ``_OTHER_FEATURES``, with NaN for missing factor scores.
+    """
+    rows = list(
+        employees.values_list('pk', 'hire_date').annotate(exit_date=Min('turnover_records__exit_date')).order_by('pk')
+    )
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, len(factor_ids) + len(_OTHER_FEATURES))), np.empty(0)
+
+    employee_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    hired = np.array([row[1] for row in rows], dtype='datetime64[D]')
+    left = np.array([row[2] or as_of for row in rows], dtype='datetime64[D]')
+    exited = np.array([row[2] is not None for row in rows], dtype=np.float64)
+    tenure = (left - hired).astype(np.float64) / 365.25
+
+    matrix = np.full((len(employee_ids), len(factor_ids) + len(_OTHER_FEATURES)), np.nan)
+
+    scored_ids, scored_factors, scores = score_matrix(employees)
+    weights = dict(Factor.objects.filter(pk__in=factor_ids).values_list('pk', 'weight'))
+    columns = {factor_id: position for position, factor_id in enumerate(factor_ids)}
+    keep = [position for position, factor_id in enumerate(scored_factors) if factor_id in columns]
+    if len(scored_ids) and keep:
+        target = [columns[scored_factors[position]] for position in keep]
+        row = np.searchsorted(employee_ids, scored_ids)
+        weighted = scores[:, keep] * np.array([weights.get(factor_ids[column], 1.0) for column in target])
+        matrix[np.ix_(row, target)] = weighted
+
+    training = {
+        employee_id: (total, completed)
+        for employee_id, total, completed in TrainingAssignment.objects.filter(
+            employee__in=employees.values('pk')
+        ).values_list('employee_id').annotate(
+            total=Count('pk'), completed=Count('pk', filter=Q(status='COMPLETED'))
+        ).order_by()
+    }
+    totals = np.array([training.get(employee_id, (0, 0)) for employee_id in employee_ids.tolist()], dtype=np.float64)
+
+    base = len(factor_ids)
+    matrix[:, base] = tenure
+    matrix[:, base + 1] = np.log1p(totals[:, 1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        matrix[:, base + 2] = np.where(totals[:, 0] > 0, totals[:, 1] / totals[:, 0], 0.0)
+    return employee_ids, matrix, exited
+
+
+def _standardize(matrix, means, scales):
+    standardized = (matrix - means) / scales
+    return np.where(np.isnan(standardized), 0.0, standardized)
+
+
+def _sigmoid(values):
+    return 1.0 / (1.0 + np.exp(-np.clip(values, -35.0, 35.0)))
+
+
+def fit_logistic(x, y, penalty=L2_PENALTY):
+    """
+    Fit ``P(y=1) = sigmoid(intercept + x @ coefficients)`` by Newton's method
+    with an L2 penalty that leaves the intercept alone.
+    """
+    design = np.hstack([np.ones((len(x), 1)), x])
+    weights = np.zeros(design.shape[1])
+    ridge = np.full(design.shape[1], penalty)
+    ridge[0] = 0.0
+    for _ in range(MAX_ITERATIONS):
+        p = _sigmoid(design @ weights)
+        gradient = design.T @ (y - p) - ridge * weights
+        hessian = (design * (p * (1 - p))[:, None]).T @ design + np.diag(ridge)
+        step = np.linalg.solve(hessian + 1e-9 * np.eye(len(weights)), gradient)
+        weights += step
+        if np.max(np.abs(step)) < TOLERANCE:
+            break
+    return weights[0], weights[1:]
+
+
+def fit(as_of=None):
+    """
+    Fit and store a new model. Returns ``None`` when the population lacks
+    either leavers or stayers to learn from.
+    """
+    as_of = as_of or timezone.now().date()
+    factor_ids = list(Factor.objects.order_by('pk').values_list('pk', flat=True))
+    _, matrix, exited = features(population(), factor_ids, as_of)
+    if not exited.any() or exited.all():
+        return None
+
+    present = ~np.isnan(matrix)
+    counts = np.maximum(present.sum(axis=0), 1)
+    means = np.where(present, matrix, 0.0).sum(axis=0) / counts
+    scales = np.sqrt(np.where(present, (matrix - means) ** 2, 0.0).sum(axis=0) / counts)
+    # Columns without data or variance carry no signal; keep them inert.
+    scales = np.where(scales < 1e-9, 1.0, scales)
+
+    intercept, coefficients = fit_logistic(_standardize(matrix, means, scales), exited)
+    return TurnoverRiskModel.objects.create(
+        sample_size=len(exited),
+        exit_count=int(exited.sum()),
+        factor_ids=factor_ids,
+        feature_names=[f'factor_{factor_id}' for factor_id in factor_ids] + _OTHER_FEATURES,
+        intercept=float(intercept),
+        coefficients=coefficients.tolist(),
+        means=means.tolist(),
+        scales=scales.tolist(),
+    )
+
+
+def predict(model, employees, as_of=None):
+    """Return ``(employee_ids, probabilities)`` for an ``Employee`` queryset."""
+    as_of = as_of or timezone.now().date()
+    employee_ids, matrix, _ = features(employees, model.factor_ids, as_of)
+    x = _standardize(matrix, np.array(model.means), np.array(model.scales))
+    return employee_ids, _sigmoid(model.intercept + x @ np.array(model.coefficients))
+
+
+def score(incremental=False, progress=None):
+    """
+    Score active employees and store ``risk_score``, ``risk_scored_at`` and
+    the ``turnover_risk`` band.
+
+    A full run refits the model and scores everyone. An incremental run
+    reuses the latest model (fitting one only if none exists or
+    ``factors_changed``) and scores ``changed_employees``.
+    """
+    result = RiskScoringResult()
+    started = time.perf_counter()
+
+    model = TurnoverRiskModel.objects.order_by('-fitted_at', '-pk').first() if incremental else None
+    if model is not None and factors_changed(model):
+        model = None
+    if model is None:
+        model = fit()
+        result.fitted = model is not None
+    if model is None:
+        result.elapsed = time.perf_counter() - started
+        return result
+    result.model_id = model.pk
+
+    employees = changed_employees(model) if incremental else Employee.objects.filter(is_active=True)
+    employee_ids, probabilities = predict(model, employees)
+    scored_at = timezone.now()
+
+    # Scores are stored with SCORE_DECIMALS, so employees sharing a value
+    # are written by one UPDATE; at most 10 ** SCORE_DECIMALS + 1 statements
+    # per run however large the workforce is.
+    values, groups = np.unique(np.round(probabilities, SCORE_DECIMALS), return_inverse=True)
+    order = np.argsort(groups, kind='stable')
+    bounds = np.searchsorted(groups[order], np.arange(len(values) + 1))
+    with transaction.atomic():
+        for position, (value, level) in enumerate(zip(values.tolist(), band(values).tolist())):
+            ids = employee_ids[order[bounds[position]:bounds[position + 1]]].tolist()
+            for start in range(0, len(ids), WRITE_BATCH_SIZE):
+                Employee.objects.filter(pk__in=ids[start:start + WRITE_BATCH_SIZE]).update(
+                    risk_score=value, risk_scored_at=scored_at, turnover_risk=level
+                )
+            result.scored += len(ids)
+            if progress is not None:
+                progress(result)
+        invalidate_dashboard()
+
+    result.elapsed = time.perf_counter() - started
+    return result
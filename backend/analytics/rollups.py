@@ -0,0 +1,314 @@
+"""
+Daily and monthly rollups of turnover and survey activity.
+
+``DailyRollup`` and ``MonthlyRollup`` hold additive facts per period,
+department and factor, so trend charts read a range of small rows instead of
+scanning exits, assignments and responses:
+
+* ``hires`` and ``exits``, dated by ``Employee.hire_date`` and
+  ``EmployeeTurnover.exit_date``. Exits carry the exit record's factor.
+  Headcount at the end of a month is the running sum of hires minus exits
+  up to it.
+* ``assignments_issued`` and ``assignments_completed``, dated by
+  ``assigned_at`` and ``completed_at``.
+* ``score_sum`` and ``score_count`` of scored responses, dated by their
+  assignment's ``completed_at`` and keyed by the question's factor.
+
+Write paths report what they change as a ``RollupDelta`` that is added to
+both tables with ``F()`` updates, the way ``surveys.statistics`` keeps
+survey statistics. Departments are resolved when the delta is applied, so
+facts land in the employee's department at that time. Employee and exit
+record writes instead compare ``employee_facts`` snapshots taken before and
+after, computed by the same queries as the repair pass, so both count hires
+and exits alike; deleting an employee takes out all of their facts.
+Deleting or editing assignments (directly or with their survey) does the
+same with ``assignment_facts``.
+
+``compact`` is the nightly repair and compaction pass. It recomputes hires
+and exits over all time, since hire dates, departments and active flags can
+change without a write that reports them. It recomputes survey facts for the
+last ``window`` days and drops daily rows older than ``DAILY_RETENTION_DAYS``,
+whose totals stay in the monthly table.
+
+Models are looked up through the app registry because model modules import
+this one for their save hooks.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+from django.utils import timezone
+
+EMPLOYEE_FACTS = ('hires', 'exits')
+SURVEY_FACTS = ('assignments_issued', 'assignments_completed', 'score_sum', 'score_count')
+FACTS = EMPLOYEE_FACTS + SURVEY_FACTS
+
+DAILY_RETENTION_DAYS = 400
+
+# Days of survey activity recomputed by each compaction.
+DEFAULT_WINDOW_DAYS = 35
+
+
+def _model(name):
+    return apps.get_model('analytics', name)
+
+
+def month_of(day):
+    return day.replace(day=1)
+
+
+def as_day(value):
+    """Local calendar day of a date or datetime."""
+    if isinstance(value, datetime.datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return value
+
+
+class RollupDelta:
+    """Accumulates fact changes keyed by day, department and factor."""
+
+    def __init__(self):
+        self.facts = defaultdict(lambda: dict.fromkeys(FACTS, 0))
+
+    def add(self, day, department_id=None, employee_id=None, factor_id=None, **changes):
+        """
+        Add ``changes`` to the facts of ``day``. Pass ``employee_id`` instead
+        of ``department_id`` to use the employee's department at apply time.
+        """
+        key = (as_day(day), department_id, employee_id, factor_id or 0)
+        facts = self.facts[key]
+        for name, value in changes.items():
+            facts[name] += value
+
+    def merge(self, other):
+        for key, changes in other.facts.items():
+            facts = self.facts[key]
+            for name, value in changes.items():
+                facts[name] += value
+
+    def _resolved(self):
+        employee_ids = {key[2] for key in self.facts if key[2] is not None}
+        departments = {}
+        if employee_ids:
+            departments = dict(
+                apps.get_model('users', 'Employee').objects.filter(pk__in=employee_ids).values_list(
+                    'pk', 'user__department_id'
+                )
+            )
+        resolved = defaultdict(lambda: dict.fromkeys(FACTS, 0))
+        for (day, department_id, employee_id, factor_id), changes in self.facts.items():
+            if employee_id is not None:
+                department_id = departments.get(employee_id)
+            facts = resolved[(day, department_id or 0, factor_id)]
+            for name, value in changes.items():
+                facts[name] += value
+        return resolved
+
+    def apply(self):
+        """Write the accumulated changes to the daily and monthly rows."""
+        if not self.facts:
+            return
+        with transaction.atomic():
+            for (day, department_key, factor_key), changes in sorted(self._resolved().items()):
+                changes = {name: value for name, value in changes.items() if value}
+                if not changes:
+                    continue
+                key = {'department_key': department_key, 'factor_key': factor_key}
+                _increment(_model('DailyRollup'), {'day': day, **key}, changes)
+                _increment(_model('MonthlyRollup'), {'month': month_of(day), **key}, changes)
+        self.facts.clear()
+
+
+def _increment(model, key, changes):
+    updates = {name: F(name) + value for name, value in changes.items()}
+    if model.objects.filter(**key).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **changes)
+    except IntegrityError:
+        # Created concurrently; add to that row instead.
+        model.objects.filter(**key).update(**updates)
+
+
+def _snapshot(facts, **filters):
+    snapshot = defaultdict(dict)
+    for day, department_key, factor_key, values in _source_facts('day', None, facts, **filters):
+        snapshot[(day, department_key, factor_key)].update(values)
+    return snapshot
+
+
+def employee_facts(employee_id, facts=FACTS):
+    """
+    Daily ``facts`` contributed by one employee, as
+    ``{(day, department_key, factor_key): {fact: value}}``.
+    """
+    return _snapshot(facts, employee_id=employee_id)
+
+
+def assignment_facts(assignment_ids):
+    """Daily survey facts contributed by the given assignments, like ``employee_facts``."""
+    assignment_ids = list(assignment_ids)
+    if not assignment_ids:
+        return {}
+    return _snapshot(SURVEY_FACTS, assignment_ids=assignment_ids)
+
+
+def record_difference(before, after):
+    """Add the change from one ``employee_facts`` or ``assignment_facts`` snapshot to another."""
+    delta = RollupDelta()
+    for key in before.keys() | after.keys():
+        old, new = before.get(key, {}), after.get(key, {})
+        changes = {name: (new.get(name) or 0) - (old.get(name) or 0) for name in old.keys() | new.keys()}
+        day, department_key, factor_key = key
+        delta.add(day, department_id=department_key, factor_id=factor_key, **changes)
+    delta.apply()
+
+
+def record_assignments(assignments):
+    """Count newly issued assignments (objects with ``employee_id`` and ``assigned_at``)."""
+    delta = RollupDelta()
+    for assignment in assignments:
+        delta.add(assignment.assigned_at or timezone.now(), employee_id=assignment.employee_id, assignments_issued=1)
+    delta.apply()
+
+
+# Recomputation from the source tables.
+
+def _source_facts(period, start, facts, employee_id=None, assignment_ids=None, registry=apps):
+    """
+    Yield ``(period_start, department_key, factor_key, {fact: value})`` from
+    the source tables from day ``start`` on (``None`` for all time),
+    optionally for one employee or some assignments (survey facts only).
+    ``period`` is ``'day'`` or ``'month'``.
+    """
+    Employee = registry.get_model('users', 'Employee')
+    EmployeeTurnover = registry.get_model('analytics', 'EmployeeTurnover')
+    SurveyAssignment = registry.get_model('surveys', 'SurveyAssignment')
+    SurveyResponse = registry.get_model('surveys', 'SurveyResponse')
+
+    def bucket(field, is_datetime):
+        if period == 'month':
+            return TruncMonth(field)
+        return TruncDate(field) if is_datetime else F(field)
+
+    def ranged(queryset, field, is_datetime):
+        if start is None:
+            return queryset
+        lookup = f'{field}__date' if is_datetime else field
+        return queryset.filter(**{f'{lookup}__gte': start})
+
+    def grouped(queryset, field, is_datetime, owner, department, factor, assignment=None, **aggregates):
+        if employee_id is not None:
+            queryset = queryset.filter(**{owner: employee_id})
+        if assignment_ids is not None:
+            queryset = queryset.filter(**{f'{assignment}__in': assignment_ids})
+        rows = ranged(queryset, field, is_datetime).annotate(
+            rollup_period=bucket(field, is_datetime),
+            rollup_department=Coalesce(department, Value(0)),
+            rollup_factor=Value(0) if factor is None else Coalesce(factor, Value(0)),
+        ).values('rollup_period', 'rollup_department', 'rollup_factor').annotate(**aggregates).order_by()
+        for row in rows:
+            yield as_day(row.pop('rollup_period')), row.pop('rollup_department'), row.pop('rollup_factor'), row
+
+    if 'hires' in facts:
+        exited = EmployeeTurnover.objects.filter(employee=OuterRef('pk'))
+        yield from grouped(
+            Employee.objects.filter(Q(is_active=True) | Exists(exited)), 'hire_date', False, 'pk',
+            'user__department_id', None, hires=Count('pk')
+        )
+    if 'exits' in facts:
+        yield from grouped(
+            EmployeeTurnover.objects.all(), 'exit_date', False, 'employee_id',
+            Coalesce('department_id', 'employee__user__department_id'), 'factor_id', exits=Count('pk')
+        )
+    if 'assignments_issued' in facts:
+        yield from grouped(
+            SurveyAssignment.objects.all(), 'assigned_at', True, 'employee_id',
+            'employee__user__department_id', None, 'pk', assignments_issued=Count('pk')
+        )
+    if 'assignments_completed' in facts:
+        yield from grouped(
+            SurveyAssignment.objects.filter(is_completed=True, completed_at__isnull=False), 'completed_at', True,
+            'employee_id', 'employee__user__department_id', None, 'pk', assignments_completed=Count('pk')
+        )
+    if 'score_sum' in facts:
+        yield from grouped(
+            SurveyResponse.objects.filter(
+                score__isnull=False, assignment__is_completed=True, assignment__completed_at__isnull=False
+            ), 'assignment__completed_at', True, 'assignment__employee_id',
+            'assignment__employee__user__department_id', 'question__factor_id', 'assignment_id',
+            score_sum=Sum('score'), score_count=Count('pk')
+        )
+
+
+def _replace(model, period_field, period, start, facts, registry):
+    """Overwrite ``facts`` of rows from ``start`` on with values from the sources."""
+    fresh = defaultdict(dict)
+    for period_start, department_key, factor_key, values in _source_facts(period, start, facts, registry=registry):
+        fresh[(period_start, department_key, factor_key)].update(values)
+
+    rows = model.objects.all()
+    if start is not None:
+        rows = rows.filter(**{f'{period_field}__gte': start})
+
+    changed = []
+    for row in rows.iterator():
+        key = (getattr(row, period_field), row.department_key, row.factor_key)
+        values = fresh.pop(key, {})
+        new = {name: values.get(name) or 0 for name in facts}
+        if any(getattr(row, name) != value for name, value in new.items()):
+            for name, value in new.items():
+                setattr(row, name, value)
+            changed.append(row)
+    model.objects.bulk_update(changed, list(facts), batch_size=1000)
+    model.objects.bulk_create(
+        [
+            model(**{period_field: period_start}, department_key=department_key, factor_key=factor_key, **values)
+            for (period_start, department_key, factor_key), values in fresh.items()
+        ],
+        batch_size=1000
+    )
+
+
+def rebuild(facts=FACTS, start=None, registry=apps):
+    """
+    Recompute ``facts`` from day ``start`` on (all time if ``None``) in both
+    tables. Monthly rows are recomputed from the first of ``start``'s month.
+    Data migrations pass their app ``registry``.
+    """
+    employee_facts = [name for name in facts if name in EMPLOYEE_FACTS]
+    survey_facts = [name for name in facts if name in SURVEY_FACTS]
+    if 'score_sum' in survey_facts or 'score_count' in survey_facts:
+        survey_facts = sorted(set(survey_facts) | {'score_sum', 'score_count'}, key=FACTS.index)
+    daily_start = start
+    if daily_start is None or daily_start < retention_start():
+        daily_start = retention_start()
+    with transaction.atomic():
+        for group in (employee_facts, survey_facts):
+            if not group:
+                continue
+            _replace(registry.get_model('analytics', 'DailyRollup'), 'day', 'day', daily_start, group, registry)
+            _replace(
+                registry.get_model('analytics', 'MonthlyRollup'), 'month', 'month',
+                None if start is None else month_of(start), group, registry
+            )
+
+
+def retention_start():
+    return timezone.localdate() - datetime.timedelta(days=DAILY_RETENTION_DAYS)
+
+
+def compact(window=DEFAULT_WINDOW_DAYS):
+    """
+    Nightly pass: recompute hires and exits over all time and survey facts
+    for the last ``window`` days, then drop daily rows past retention.
+    Returns the number of daily rows dropped.
+    """
+    rebuild(EMPLOYEE_FACTS)
+    rebuild(SURVEY_FACTS, start=timezone.localdate() - datetime.timedelta(days=window))
+    return _model('DailyRollup').objects.filter(day__lt=retention_start()).delete()[0]
@@ -24,6 +24,26 @@ class EmployeeTurnoverSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'created_by']
 
+class RiskFactorSerializer(serializers.ModelSerializer):
+    factor_name = serializers.CharField(source='factor.name', read_only=True)
+
+    class Meta:
+        model = RiskFactor
+        fields = [
+            'id', 'factor', 'factor_name', 'correlation', 'sample_size',
+            'ci_lower', 'ci_upper', 'analysis_date'
+        ]
+
+
+class TurnoverAnalyticsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TurnoverAnalytics
+        fields = [
+            'id', 'report_date', 'overall_rate', 'monthly_rates',
+            'department_rates', 'risk_factors', 'metadata', 'created_at'
+        ]
+
+
 class FactorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Factor
@@ -47,9 +67,7 @@ class QuestionSerializer(serializers.ModelSerializer):
 
 
 class SurveySerializer(serializers.ModelSerializer):
-    response_count = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
-    question_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Survey
@@ -58,19 +76,13 @@ class SurveySerializer(serializers.ModelSerializer):
             'created_by_name', 'is_active', 'created_at', 'updated_at',
             'question_count', 'response_count'
         ]
-        read_only_fields = ['created_by', 'created_at', 'updated_at', 'response_count']
+        read_only_fields = ['created_by', 'created_at', 'updated_at', 'question_count', 'response_count']
 
     def get_created_by_name(self, obj):
         if obj.created_by:
             return f"{obj.created_by.first_name} {obj.created_by.last_name}"
         return ""
 
-    def get_question_count(self, obj):
-        return obj.questions.count()
-
-    def get_response_count(self, obj):
-        return obj.assignments.filter(is_completed=True).count()
-
 
 class SurveyWithQuestionsSerializer(SurveySerializer):
     questions = QuestionSerializer(many=True, read_only=True)
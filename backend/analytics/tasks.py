@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.registry import register
+from .correlation import record as record_risk_factors
+from .models import TurnoverAnalytics
+from .risk import score as score_risk
+from .rollups import DEFAULT_WINDOW_DAYS, compact as compact_rollups
+from .turnover import compute as compute_turnover
+
+
+@register('analytics.generate_report')
+def generate_report(job, generated_by=None):
+    """
+    Generate a new turnover analytics report with associated risk factors
+    """
+    current_date = timezone.now().date()
+
+    job.set_progress(0.1, 'Computing turnover rates')
+    rates = compute_turnover(current_date)
+
+    job.set_progress(0.5, 'Correlating factor scores with exits and saving report')
+    # One transaction, so a failed attempt leaves nothing behind for the retry
+    with transaction.atomic():
+        risk_factors = record_risk_factors(current_date)
+
+        # Create analytics record
+        analytics = TurnoverAnalytics.objects.create(
+            report_date=current_date,
+            overall_rate=rates['overall_rate'],
+            monthly_rates=rates['monthly_rates'],
+            department_rates=rates['department_rates'],
+            risk_factors=[
+                {
+                    'id': rf.id,
+                    'factor': rf.factor_name,
+                    'correlation': rf.correlation,
+                    'sample_size': rf.sample_size,
+                    'ci_lower': rf.ci_lower,
+                    'ci_upper': rf.ci_upper,
+                }
+                for rf in risk_factors
+            ],
+            metadata={**rates['metadata'], 'generated_by': generated_by}
+        )
+
+    return {
+        'report_id': analytics.id,
+        'report_date': analytics.report_date.isoformat()
+    }
+
+
+@register('analytics.score_risk')
+def score_risk_task(job, incremental=False):
+    """Refit the risk model and rescore employees, or rescore changed ones."""
+    def report(result):
+        job.set_progress(0.5, f"{result.scored} employees scored")
+
+    return score_risk(incremental=incremental, progress=report).as_dict()
+
+
+@register('analytics.compact_rollups')
+def compact_rollups_task(job, window=DEFAULT_WINDOW_DAYS):
+    """Nightly rollup repair and compaction."""
+    return {'daily_rows_dropped': compact_rollups(window=window)}
@@ -0,0 +1,74 @@
+import datetime
+import math
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from analytics.correlation import Z_95, confidence_interval, correlate, record
+from analytics.models import EmployeeTurnover, RiskFactor
+from surveys.authoring import create_questions
+from surveys.models import Factor, SurveyAssignment, SurveyResponse
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class CorrelateTests(SimpleTestCase):
+    def test_matches_pearson_over_present_cells(self):
+        outcome = np.array([1.0, 0.0, 1.0, 0.0, 0.0, 1.0])
+        scores = np.array([
+            [1.0, 4.0],
+            [5.0, np.nan],
+            [2.0, 3.0],
+            [4.0, 1.0],
+            [5.0, 2.0],
+            [1.0, np.nan],
+        ])
+
+        r, n = correlate(scores, outcome)
+
+        self.assertEqual(list(n), [6, 4])
+        self.assertAlmostEqual(r[0], np.corrcoef(scores[:, 0], outcome)[0, 1])
+        present = ~np.isnan(scores[:, 1])
+        self.assertAlmostEqual(r[1], np.corrcoef(scores[present, 1], outcome[present])[0, 1])
+
+    def test_columns_without_variance_are_nan(self):
+        scores = np.array([[3.0, 1.0], [3.0, 2.0], [3.0, 3.0]])
+
+        r, _ = correlate(scores, np.array([1.0, 0.0, 1.0]))
+        self.assertTrue(np.isnan(r[0]))
+
+        r, _ = correlate(scores, np.zeros(3))
+        self.assertTrue(np.isnan(r).all())
+
+
+class ConfidenceIntervalTests(SimpleTestCase):
+    def test_fisher_z_bounds(self):
+        lower, upper = confidence_interval(np.array([0.5, 0.0]), np.array([28, 103]))
+
+        margin = Z_95 / math.sqrt(25)
+        self.assertAlmostEqual(lower[0], math.tanh(math.atanh(0.5) - margin))
+        self.assertAlmostEqual(upper[0], math.tanh(math.atanh(0.5) + margin))
+        self.assertAlmostEqual(lower[1], -upper[1])
+        self.assertAlmostEqual(upper[1], math.tanh(Z_95 / 10))
+
+
+class RecordTests(TestCase):
+    def test_rerun_keeps_rows_earlier_reports_refer_to(self):
+        admin = make_user('admin@example.com', role='ADMIN')
+        survey = make_survey(admin)
+        [question] = create_questions([{
+            'survey': survey, 'text': 'Rate pay', 'type': 'RATING', 'factor': Factor.objects.create(name='Pay')
+        }])
+        for number, score in enumerate([1, 2, 4, 5, 1]):
+            employee = make_employee(f'e{number}@example.com')
+            assignment = SurveyAssignment.objects.create(survey=survey, employee=employee, assigned_by=admin)
+            SurveyResponse.objects.create(assignment=assignment, question=question, answer={'value': score}, score=score)
+            if score < 3:
+                EmployeeTurnover.objects.create(employee=employee, exit_date=datetime.date(2026, 1, 1))
+
+        today = datetime.date(2026, 2, 1)
+        [first] = record(today)
+        [second] = record(today)
+
+        self.assertLess(first.correlation, 0)
+        self.assertEqual(first.sample_size, 5)
+        self.assertEqual(set(RiskFactor.objects.values_list('pk', flat=True)), {first.pk, second.pk})
@@ -0,0 +1,93 @@
+import datetime
+import math
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from analytics import risk
+from analytics.models import EmployeeTurnover
+from surveys.authoring import create_questions
+from surveys.models import Factor, SurveyAssignment, SurveyResponse
+from surveys.rescoring import rescore
+from surveys.tests.utils import make_employee, make_survey, make_user
+from users.models import Employee
+
+
+class FitLogisticTests(SimpleTestCase):
+    def test_intercept_alone_is_the_log_odds(self):
+        intercept, coefficients = risk.fit_logistic(np.empty((8, 0)), np.array([1.0, 1.0] + [0.0] * 6))
+
+        self.assertAlmostEqual(intercept, math.log(2 / 6))
+        self.assertEqual(len(coefficients), 0)
+
+    def test_solution_zeroes_the_penalized_gradient(self):
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(200, 2))
+        y = (x[:, 0] + rng.normal(size=200) > 0).astype(np.float64)
+
+        intercept, coefficients = risk.fit_logistic(x, y, penalty=2.0)
+
+        p = 1.0 / (1.0 + np.exp(-(intercept + x @ coefficients)))
+        self.assertAlmostEqual(np.sum(y - p), 0.0)
+        np.testing.assert_allclose(x.T @ (y - p), 2.0 * coefficients, atol=1e-8)
+        self.assertGreater(coefficients[0], abs(coefficients[1]))
+
+
+class ScoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = make_user('admin@example.com', role='ADMIN')
+        survey = make_survey(admin)
+        cls.factor = Factor.objects.create(name='Pay')
+        [cls.question] = create_questions([{
+            'survey': survey, 'text': 'Paid fairly?', 'type': 'RADIO', 'options': ['Yes', 'No'],
+            'has_scoring': True, 'scoring_guide': {'Yes': 5, 'No': 1}, 'factor': cls.factor
+        }])
+        cls.employees = []
+        for number, answer in enumerate(['Yes', 'Yes', 'No', 'Yes', 'No', 'No']):
+            leaver = number in (2, 4)
+            employee = make_employee(f'e{number}@example.com', is_active=not leaver)
+            assignment = SurveyAssignment.objects.create(
+                survey=survey, employee=employee, assigned_by=admin, is_completed=True, completed_at=timezone.now()
+            )
+            SurveyResponse.objects.create(
+                assignment=assignment, question=cls.question, answer={'value': answer},
+                score=cls.question.scoring_guide[answer]
+            )
+            if leaver:
+                EmployeeTurnover.objects.create(employee=employee, exit_date=datetime.date(2026, 1, 1))
+            cls.employees.append(employee)
+
+    def test_full_run_scores_active_employees(self):
+        result = risk.score()
+
+        self.assertTrue(result.fitted)
+        self.assertEqual(result.scored, 4)
+        scores = dict(Employee.objects.filter(is_active=True).values_list('pk', 'risk_score'))
+        stayer, dissatisfied = self.employees[0], self.employees[5]
+        self.assertGreater(scores[dissatisfied.pk], scores[stayer.pk])
+        self.assertFalse(Employee.objects.filter(is_active=True, risk_scored_at__isnull=True).exists())
+        self.assertEqual(risk.score(incremental=True).scored, 0)
+
+    def test_incremental_run_scores_employees_with_regraded_responses(self):
+        risk.score()
+        self.question.scoring_guide = {'Yes': 5, 'No': 2}
+        self.question.save()
+        rescore()
+
+        result = risk.score(incremental=True)
+
+        self.assertFalse(result.fitted)
+        self.assertEqual(result.scored, 1)
+
+    def test_incremental_run_refits_after_a_factor_is_reweighted(self):
+        first = risk.score()
+        self.factor.weight = 2.0
+        self.factor.save()
+
+        result = risk.score(incremental=True)
+
+        self.assertTrue(result.fitted)
+        self.assertNotEqual(result.model_id, first.model_id)
+        self.assertEqual(result.scored, 4)
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from analytics.models import MonthlyRollup
+from surveys.authoring import create_questions
+from surveys.models import Factor, SurveyAssignment
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class AssignmentRollupTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.factor = Factor.objects.create(name='Pay')
+        cls.survey = make_survey(cls.admin)
+        [cls.question] = create_questions([{
+            'survey': cls.survey, 'text': 'Paid fairly?', 'type': 'RADIO', 'options': ['Yes', 'No'],
+            'has_scoring': True, 'scoring_guide': {'Yes': 3, 'No': 1}, 'factor': cls.factor
+        }])
+        cls.employee = make_employee('employee@example.com')
+
+    def setUp(self):
+        cache.clear()
+        self.assignment = SurveyAssignment.objects.create(
+            survey=self.survey, employee=self.employee, assigned_by=self.admin
+        )
+        self.client.force_authenticate(self.employee.user)
+        response = self.client.post(f'/api/surveys/forms/{self.survey.pk}/submit/', {
+            'assignment_id': self.assignment.pk, 'responses': [{'question_id': self.question.pk, 'answer': 'Yes'}]
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(self.admin)
+
+    def totals(self):
+        totals = dict.fromkeys(('assignments_issued', 'assignments_completed', 'score_sum', 'score_count'), 0)
+        for row in MonthlyRollup.objects.values(*totals):
+            for name, value in row.items():
+                totals[name] += value
+        return totals
+
+    def test_submission_is_counted(self):
+        self.assertEqual(
+            self.totals(),
+            {'assignments_issued': 1, 'assignments_completed': 1, 'score_sum': 3.0, 'score_count': 1}
+        )
+
+    def test_deleting_assignment_removes_its_facts(self):
+        response = self.client.delete(f'/api/surveys/assignments/{self.assignment.pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(set(self.totals().values()), {0})
+
+    def test_deleting_survey_removes_facts_of_its_assignments(self):
+        response = self.client.delete(f'/api/surveys/forms/{self.survey.pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(set(self.totals().values()), {0})
+
+    def test_reopening_assignment_removes_completion_and_scores(self):
+        response = self.client.patch(f'/api/surveys/assignments/{self.assignment.pk}/', {'is_completed': False})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.totals(),
+            {'assignments_issued': 1, 'assignments_completed': 0, 'score_sum': 0, 'score_count': 0}
+        )
+
+    def test_trends_read_rollups(self):
+        response = self.client.get('/api/analytics/analytics/trends/', {'months': 1})
+
+        self.assertEqual(response.status_code, 200)
+        [month] = response.data['months']
+        self.assertEqual(
+            (month['assignments_issued'], month['assignments_completed'], month['average_score']), (1, 1, 3.0)
+        )
+        self.assertEqual(
+            [(row['factor_id'], row['average_score']) for row in response.data['factors']], [(self.factor.pk, 3.0)]
+        )
+
+        self.client.delete(f'/api/surveys/assignments/{self.assignment.pk}/')
+        [month] = self.client.get('/api/analytics/analytics/trends/', {'months': 1}).data['months']
+        self.assertEqual((month['assignments_issued'], month['average_score']), (0, None))
@@ -0,0 +1,61 @@
+import datetime
+
+from django.test import SimpleTestCase, TestCase
+
+from analytics import turnover
+from analytics.models import EmployeeTurnover
+from surveys.tests.utils import make_department, make_employee
+
+
+class MonthStartsTests(SimpleTestCase):
+    def test_window_crosses_the_year_boundary(self):
+        self.assertEqual(
+            turnover.month_starts(datetime.date(2026, 2, 10), 3),
+            [datetime.date(2025, 12, 1), datetime.date(2026, 1, 1), datetime.date(2026, 2, 1)]
+        )
+
+    def test_rate_without_headcount_is_zero(self):
+        self.assertEqual(turnover.turnover_rate(1, 0, 0), 0.0)
+        self.assertEqual(turnover.turnover_rate(1, 3, 1), 0.5)
+
+
+class ComputeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        sales, support = make_department('Sales'), make_department('Support')
+        early = datetime.date(2025, 1, 1)
+        make_employee('kept@example.com', department=sales, hire_date=early)
+        make_employee('hired@example.com', department=sales, hire_date=datetime.date(2026, 2, 15))
+        make_employee('staying@example.com', department=support, hire_date=early)
+        # Left at an unknown date: not part of any headcount.
+        make_employee('unknown@example.com', department=support, hire_date=early, is_active=False)
+        # moved@ has no department on the exit record; it counts for Support.
+        for email, department, exit_department, exit_date in [
+            ('left@example.com', sales, sales, datetime.date(2026, 2, 10)),
+            ('moved@example.com', support, None, datetime.date(2026, 1, 20)),
+            ('later@example.com', support, support, datetime.date(2026, 4, 5)),
+        ]:
+            employee = make_employee(email, department=department, hire_date=early, is_active=False)
+            EmployeeTurnover.objects.create(employee=employee, exit_date=exit_date, department=exit_department)
+
+    def test_rates_per_month_department_and_window(self):
+        report = turnover.compute(datetime.date(2026, 3, 31), months=3)
+
+        self.assertEqual(
+            [(row['month'], row['hires'], row['exits'], row['headcount'], row['rate']) for row in report['monthly_rates']],
+            [
+                ('2026-01', 0, 1, 4, round(1 / 4.5, 4)),
+                ('2026-02', 1, 1, 4, 0.25),
+                ('2026-03', 0, 0, 4, 0.0),
+            ]
+        )
+        self.assertEqual(
+            [(row['department'], row['employee_count'], row['left_count'], row['rate'])
+             for row in report['department_rates']],
+            [('Sales', 2, 1, 0.5), ('Support', 2, 1, 0.4)]
+        )
+        self.assertEqual(report['overall_rate'], round(2 / 4.5, 4))
+        self.assertEqual(report['metadata'], {
+            'period_start': '2026-01-01', 'period_end': '2026-03-31', 'months': 3,
+            'headcount_start': 5, 'headcount_end': 4, 'exits': 2,
+        })
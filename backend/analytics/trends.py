@@ -0,0 +1,111 @@
+"""
+Turnover and survey trends read from ``MonthlyRollup``.
+
+Every series comes from range queries over the monthly rows: one for the
+headcount at the start of the range (hires minus exits before it), one for
+the months in range per department and one per factor.
+"""
+
+from django.db.models import Sum
+
+from departments.models import Department
+from surveys.models import Factor
+from .models import MonthlyRollup
+from .turnover import turnover_rate
+
+_SUMMED = ('hires', 'exits', 'assignments_issued', 'assignments_completed', 'score_sum', 'score_count')
+
+
+def _average(total, count):
+    return round(total / count, 4) if count else None
+
+
+def trends(months, department_id=None):
+    """
+    Monthly series for the first days of month in ``months`` (ascending),
+    optionally for one department, with per-department and per-factor totals
+    over the whole range.
+    """
+    start, end = months[0], months[-1]
+    rows = MonthlyRollup.objects.all()
+    if department_id is not None:
+        rows = rows.filter(department_key=department_id)
+
+    opening = {
+        row['department_key']: (row['hires'] or 0) - (row['exits'] or 0)
+        for row in rows.filter(month__lt=start).values('department_key').annotate(
+            hires=Sum('hires'), exits=Sum('exits')
+        ).order_by()
+    }
+    in_range = rows.filter(month__gte=start, month__lte=end)
+    monthly = {
+        (row['month'], row['department_key']): row
+        for row in in_range.values('month', 'department_key').annotate(
+            **{name: Sum(name) for name in _SUMMED}
+        ).order_by()
+    }
+    factor_rows = list(
+        in_range.filter(factor_key__gt=0).values('factor_key').annotate(
+            exits=Sum('exits'), score_sum=Sum('score_sum'), score_count=Sum('score_count')
+        ).order_by('factor_key')
+    )
+
+    departments = set(opening) | {key[1] for key in monthly}
+    series = [dict.fromkeys(('headcount_start', 'headcount_end', *_SUMMED), 0) for _ in months]
+    per_department = {}
+    for department in departments:
+        headcount = opening.get(department, 0)
+        first, left = headcount, 0
+        for position, month in enumerate(months):
+            row = monthly.get((month, department), {})
+            totals = series[position]
+            totals['headcount_start'] += headcount
+            headcount += (row.get('hires') or 0) - (row.get('exits') or 0)
+            totals['headcount_end'] += headcount
+            for name in _SUMMED:
+                totals[name] += row.get(name) or 0
+            left += row.get('exits') or 0
+        per_department[department] = (first, headcount, left)
+
+    names = dict(Department.objects.filter(pk__in=[pk for pk in departments if pk]).values_list('pk', 'name'))
+    factor_names = dict(
+        Factor.objects.filter(pk__in=[row['factor_key'] for row in factor_rows]).values_list('pk', 'name')
+    )
+    return {
+        'months': [
+            {
+                'month': month.strftime('%Y-%m'),
+                'rate': turnover_rate(totals['exits'], totals['headcount_start'], totals['headcount_end']),
+                'headcount': totals['headcount_end'],
+                'hires': totals['hires'],
+                'exits': totals['exits'],
+                'assignments_issued': totals['assignments_issued'],
+                'assignments_completed': totals['assignments_completed'],
+                'average_score': _average(totals['score_sum'], totals['score_count']),
+            }
+            for month, totals in zip(months, series)
+        ],
+        'departments': sorted(
+            (
+                {
+                    'department_id': department or None,
+                    'department': names.get(department, 'Unassigned'),
+                    'rate': turnover_rate(left, first, last),
+                    'employee_count': last,
+                    'left_count': left,
+                }
+                for department, (first, last, left) in per_department.items()
+            ),
+            key=lambda row: (-row['rate'], row['department'])
+        ),
+        'factors': [
+            {
+                'factor_id': row['factor_key'],
+                'factor': factor_names.get(row['factor_key']),
+                'exits': row['exits'] or 0,
+                'average_score': _average(row['score_sum'] or 0, row['score_count'] or 0),
+                'score_count': row['score_count'] or 0,
+            }
+            for row in factor_rows
+        ],
+    }
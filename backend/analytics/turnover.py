@@ -0,0 +1,151 @@
+"""
+Turnover rates computed from exit records and employee hire dates.
+
+The report window is the last ``months`` calendar months up to the report
+date. Headcount is rebuilt from grouped counts rather than per employee:
+for every department, hires before the window plus hires per month, minus
+exits before the window and exits per month. That is four ``GROUP BY``
+queries regardless of how many employees there are.
+
+An employee counts from ``hire_date`` until ``EmployeeTurnover.exit_date``.
+Inactive employees without an exit record left at an unknown date, so they
+are left out of headcount altogether. Exits are attributed to the
+department stored on the exit record, falling back to the employee's
+current department.
+
+A period's rate is ``exits / average headcount``, where the average is
+taken over the headcount at the start and the end of the period.
+"""
+
+import datetime
+
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.db.models.functions import Coalesce, TruncMonth
+
+from departments.models import Department
+from users.models import Employee
+from .models import EmployeeTurnover
+
+DEFAULT_MONTHS = 12
+
+
+def month_starts(report_date, months):
+    """First days of the ``months`` calendar months ending with ``report_date``'s."""
+    index = report_date.year * 12 + report_date.month - 1
+    return [
+        datetime.date(position // 12, position % 12 + 1, 1)
+        for position in range(index - months + 1, index + 1)
+    ]
+
+
+def turnover_rate(exits, start_headcount, end_headcount):
+    """Exits over the average of the opening and closing headcount."""
+    average = (start_headcount + end_headcount) / 2
+    return round(exits / average, 4) if average else 0.0
+
+
+def _grouped(queryset, date_field, department, start, end):
+    """
+    Return ``({department: count before start}, {(department, month): count})``
+    for rows whose ``date_field`` is on or before ``end``.
+    """
+    queryset = queryset.filter(**{f'{date_field}__lte': end}).annotate(bucket_department=department)
+    before = dict(
+        queryset.filter(**{f'{date_field}__lt': start}).values_list('bucket_department').annotate(count=Count('pk'))
+        .order_by()
+    )
+    monthly = {
+        (row['bucket_department'], row['month']): row['count']
+        for row in queryset.filter(**{f'{date_field}__gte': start}).annotate(
+            month=TruncMonth(date_field)
+        ).values('bucket_department', 'month').annotate(count=Count('pk')).order_by()
+    }
+    return before, monthly
+
+
+def _as_date(value):
+    # TruncMonth of a DateField yields dates, but some backends return datetimes.
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def compute(report_date, months=DEFAULT_MONTHS):
+    """
+    Compute turnover for the window ending at ``report_date``.
+
+    Returns a dict with ``overall_rate``, ``monthly_rates``,
+    ``department_rates`` and window ``metadata``, shaped for
+    ``TurnoverAnalytics``.
+    """
+    starts = month_starts(report_date, months)
+    start = starts[0]
+
+    exited = EmployeeTurnover.objects.filter(employee=OuterRef('pk'))
+    employees = Employee.objects.filter(Q(is_active=True) | Exists(exited))
+    hires_before, hires = _grouped(employees, 'hire_date', F('user__department'), start, report_date)
+    exits_before, exits = _grouped(
+        EmployeeTurnover.objects.all(), 'exit_date',
+        Coalesce('department', 'employee__user__department'), start, report_date
+    )
+
+    departments = set(hires_before) | set(exits_before) | {key[0] for key in hires} | {key[0] for key in exits}
+    hires = {(department, _as_date(month)): count for (department, month), count in hires.items()}
+    exits = {(department, _as_date(month)): count for (department, month), count in exits.items()}
+
+    # Walk the months once per department; the loops are over grouped
+    # counts, never over employees.
+    monthly = [{'headcount_start': 0, 'headcount_end': 0, 'exits': 0, 'hires': 0} for _ in starts]
+    per_department = {}
+    for department in departments:
+        headcount = hires_before.get(department, 0) - exits_before.get(department, 0)
+        opening, left = headcount, 0
+        for position, month in enumerate(starts):
+            hired, gone = hires.get((department, month), 0), exits.get((department, month), 0)
+            totals = monthly[position]
+            totals['headcount_start'] += headcount
+            headcount += hired - gone
+            totals['headcount_end'] += headcount
+            totals['hires'] += hired
+            totals['exits'] += gone
+            left += gone
+        per_department[department] = (opening, headcount, left)
+
+    names = dict(Department.objects.filter(pk__in=[pk for pk in departments if pk is not None]).values_list('pk', 'name'))
+    department_rates = sorted(
+        (
+            {
+                'department_id': department,
+                'department': names.get(department, 'Unassigned'),
+                'rate': turnover_rate(left, opening, closing),
+                'employee_count': closing,
+                'left_count': left,
+            }
+            for department, (opening, closing, left) in per_department.items()
+        ),
+        key=lambda row: (-row['rate'], row['department'])
+    )
+
+    total_exits = sum(totals['exits'] for totals in monthly)
+    opening = monthly[0]['headcount_start'] if monthly else 0
+    closing = monthly[-1]['headcount_end'] if monthly else 0
+    return {
+        'overall_rate': turnover_rate(total_exits, opening, closing),
+        'monthly_rates': [
+            {
+                'month': month.strftime('%Y-%m'),
+                'rate': turnover_rate(totals['exits'], totals['headcount_start'], totals['headcount_end']),
+                'exits': totals['exits'],
+                'hires': totals['hires'],
+                'headcount': totals['headcount_end'],
+            }
+            for month, totals in zip(starts, monthly)
+        ],
+        'department_rates': department_rates,
+        'metadata': {
+            'period_start': start.isoformat(),
+            'period_end': report_date.isoformat(),
+            'months': months,
+            'headcount_start': opening,
+            'headcount_end': closing,
+            'exits': total_exits,
+        },
+    }
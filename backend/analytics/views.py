@@ -2,12 +2,17 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
 from .models import EmployeeTurnover
+from django.utils import timezone
 from users.permissions import IsAdmin, IsHROfficer
-from surveys.models import Factor
+from jobs.views import accepted
 from .models import TurnoverAnalytics, RiskFactor
 from .serializers import *
+from .trends import trends as rollup_trends
+from .turnover import month_starts
+
+TRENDS_MONTHS = 12
+TRENDS_MAX_MONTHS = 120
 
 class TurnoverRecordViewSet(viewsets.ModelViewSet):
     """
@@ -16,6 +21,7 @@ class TurnoverRecordViewSet(viewsets.ModelViewSet):
     queryset = EmployeeTurnover.objects.all().order_by('-exit_date')
     serializer_class = EmployeeTurnoverSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-exit_date', '-id')
 
 class AnalyticsViewSet(viewsets.ViewSet):
     """
@@ -41,64 +47,10 @@ class AnalyticsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'])
     def generate(self, request):
         """
-        Generate a new turnover analytics report with associated risk factors
+        Queue generation of a new turnover analytics report.
+        Returns 202 with the id of the background job.
         """
-        try:
-            current_date = timezone.now().date()
-            overall_rate = 0.12
-
-            # Monthly rates (simulated)
-            monthly_rates = []
-            monthly_rates.reverse()
-
-            # Department turnover data (simulated)
-            department_rates = [
-                {'department': 'Engineering', 'rate': 0.08, 'employee_count': 45, 'left_count': 4},
-                {'department': 'Sales', 'rate': 0.15, 'employee_count': 20, 'left_count': 3},
-                {'department': 'Marketing', 'rate': 0.10, 'employee_count': 10, 'left_count': 1},
-                {'department': 'Customer Support', 'rate': 0.20, 'employee_count': 15, 'left_count': 3},
-            ]
-
-            # Sample risk factor generation (linked to existing Factor records)
-            risk_factor_data = [
-                ('Work-Life Balance', 0.75),
-                ('Compensation Satisfaction', 0.68),
-                ('Manager Relationship', 0.62),
-                ('Career Development', 0.58),
-                ('Company Culture', 0.45),
-                ('Commute Time', 0.35),
-            ]
-
-            created_risk_factors = []
-            for factor_name, correlation in risk_factor_data:
-                factor = Factor.objects.filter(name=factor_name).first()
-                if factor:
-                    risk_factor = RiskFactor.objects.create(
-                        factor=factor,
-                        correlation=correlation,
-                        sample_size=100,  # you can replace with actual calc
-                        analysis_date=current_date
-                    )
-                    created_risk_factors.append(risk_factor)
-
-            # Create analytics record
-            analytics = TurnoverAnalytics.objects.create(
-                report_date=current_date,
-                overall_rate=overall_rate,
-                monthly_rates=monthly_rates,
-                department_rates=department_rates,
-                metadata={'generated_by': request.user.id}
-            )
-            analytics.risk_factors.set(created_risk_factors)
-
-            return Response({
-                'message': 'Analytics report generated successfully.',
-                'report_id': analytics.id,
-                'report_date': analytics.report_date
-            }, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return accepted(request, 'analytics.generate_report', {'generated_by': request.user.id})
 
     @action(detail=False, methods=['get'])
     def risk_factors(self, request):
@@ -108,3 +60,21 @@ class AnalyticsViewSet(viewsets.ViewSet):
         queryset = RiskFactor.objects.all().order_by('-analysis_date')
         serializer = RiskFactorSerializer(queryset, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def trends(self, request):
+        """
+        Monthly turnover and survey activity read from the rollup tables.
+        ``months`` (default 12, at most 120) ends with the current month;
+        admins may pass ``department``, HR officers see their own.
+        """
+        try:
+            months = min(max(int(request.query_params.get('months', TRENDS_MONTHS)), 1), TRENDS_MAX_MONTHS)
+            department_id = request.query_params.get('department')
+            department_id = int(department_id) if department_id else None
+        except ValueError:
+            return Response({'detail': 'months and department must be integers.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if request.user.role == 'HR':
+            department_id = request.user.department_id or 0
+        return Response(rollup_trends(month_starts(timezone.localdate(), months), department_id))
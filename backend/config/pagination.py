@@ -0,0 +1,124 @@
+"""Keyset (cursor) pagination shared by the list endpoints."""
+
+import datetime
+import decimal
+import json
+import uuid
+
+from django.db.models import F, Q
+from rest_framework.pagination import CursorPagination
+
+
+def _reversed(ordering):
+    return tuple(order[1:] if order.startswith('-') else f'-{order}' for order in ordering)
+
+
+def _order_by(ordering):
+    # NULLs sort as the largest value in both directions, on every database.
+    return [
+        F(order[1:]).desc(nulls_first=True) if order.startswith('-') else F(order).asc(nulls_last=True)
+        for order in ordering
+    ]
+
+
+def _encode(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over an indexed, stable ordering.
+
+    Pages are selected with ``WHERE key > cursor`` instead of ``OFFSET``, so
+    latency stays flat as tables grow; cursors are opaque. Views can set
+    ``keyset_ordering`` to paginate on other indexed columns, ending in a
+    unique one. The cursor holds the values of every ordering column (NULLs
+    included, which sort last), so rows sharing a value in a leading column
+    are ordered by the following ones and neither repeated nor skipped at
+    page boundaries.
+
+    Every list is paginated, ``page_size`` rows at a time (at most
+    ``max_page_size``); clients follow the ``next`` links.
+    """
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        queryset = queryset.order_by(*_order_by(_reversed(self.ordering) if reverse else self.ordering))
+        if current_position is not None:
+            queryset = queryset.filter(self._after(current_position, reverse))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'keyset_ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def _after(self, position, reverse):
+        """Rows strictly past ``position`` in the (possibly reversed) ordering."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            # Cursor from before positions held every ordering column.
+            values = [position]
+        condition, equal = Q(pk__in=[]), Q()
+        for order, value in zip(self.ordering, values):
+            name = order.lstrip('-')
+            if reverse != order.startswith('-'):
+                # Towards smaller values; NULL is above every value.
+                past = Q(**{f'{name}__isnull': False}) if value is None else Q(**{f'{name}__lt': value})
+            elif value is None:
+                past = Q(pk__in=[])
+            else:
+                past = Q(**{f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+            condition |= equal & past
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            name = order.lstrip('-')
+            values.append(instance[name] if isinstance(instance, dict) else getattr(instance, name))
+        return json.dumps(values, default=_encode)
@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     'departments',
     'trainings',
     'analytics',
+    'jobs',
 ]
 
 MIDDLEWARE = [
@@ -80,6 +81,16 @@ DATABASES = {
     }
 }
 
+# Cache
+# Survey definitions are cached per content version; use a shared backend
+# (e.g. Redis or Memcached) when running several application processes.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,6 +130,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.KeysetPagination',
 }
 
 # JWT Settings
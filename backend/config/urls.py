@@ -10,4 +10,5 @@ urlpatterns = [
     path('api/departments/', include('departments.urls')),
     path('api/trainings/', include('trainings.urls')),
     path('api/analytics/', include('analytics.urls')),
+    path('api/jobs/', include('jobs.urls')),
 ]
\ No newline at end of file
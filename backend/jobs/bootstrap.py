@@ -0,0 +1,12 @@
+"""
+Process initializer for the job worker pool.
+
+Kept free of model imports: spawned processes unpickle the initializer
+before Django is set up.
+"""
+
+
+def init_process():
+    """Initializer for spawned worker processes."""
+    import django
+    django.setup()
@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+
+from jobs.bootstrap import init_process
+from jobs.registry import autodiscover
+from jobs.worker import claim, execute, heartbeat, requeue, requeue_stale
+
+# Most seconds between heartbeats of running jobs.
+HEARTBEAT_INTERVAL = 30
+
+
+class Command(BaseCommand):
+    help = 'Run the background job worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                            help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds between queue polls when idle')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='Requeue running jobs without a heartbeat for this many seconds')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        autodiscover()
+        workers = max(options['workers'], 1)
+        poll_interval = options['poll_interval']
+        heartbeat_interval = min(HEARTBEAT_INTERVAL, options['stale_after'] / 3)
+
+        self.stdout.write(f"Job worker started with {workers} processes.")
+        pool = self._pool(workers)
+        try:
+            running = {}
+            last_heartbeat = time.monotonic()
+            while True:
+                if running and time.monotonic() - last_heartbeat >= heartbeat_interval:
+                    heartbeat(list(running.values()))
+                    last_heartbeat = time.monotonic()
+                requeue_stale(options['stale_after'])
+                free = workers - len(running)
+                if free > 0:
+                    claimed = claim(free)
+                    try:
+                        while claimed:
+                            future = pool.submit(execute, claimed[0])
+                            running[future] = claimed.pop(0)
+                    except BrokenProcessPool:
+                        pool = self._restart(pool, workers, [*running.values(), *claimed])
+                        running = {}
+                        continue
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        ok = future.result()
+                    except BrokenProcessPool:
+                        running[future] = job_id
+                        broken = True
+                        continue
+                    except Exception as exc:
+                        self.stderr.write(f"Job {job_id} crashed its worker: {exc}")
+                        continue
+                    self.stdout.write(f"Job {job_id} {'succeeded' if ok else 'failed'}.")
+                if broken:
+                    pool = self._restart(pool, workers, list(running.values()))
+                    running = {}
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _pool(self, workers):
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_process)
+
+    def _restart(self, pool, workers, job_ids):
+        """Replace a pool whose worker process died and requeue the jobs it was running."""
+        pool.shutdown(wait=False, cancel_futures=True)
+        requeued = requeue(job_ids)
+        self.stderr.write(
+            f"A worker process died; requeued {requeued} of {len(job_ids)} running jobs and restarted the pool."
+        )
+        return self._pool(workers)
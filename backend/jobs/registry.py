@@ -0,0 +1,53 @@
+"""
+Task registry for background jobs.
+
+Apps register task functions in a ``tasks`` module::
+
+    @register('surveys.rescore')
+    def rescore_task(job, survey_id=None):
+        ...
+
+A task receives the ``Job`` and the job payload as keyword arguments and
+returns a JSON-serializable result.
+"""
+
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+_tasks = {}
+_discovered = False
+
+
+def register(name):
+    def decorator(func):
+        _tasks[name] = func
+        return func
+    return decorator
+
+
+def autodiscover():
+    """Import the ``tasks`` module of every installed app once."""
+    global _discovered
+    if not _discovered:
+        autodiscover_modules('tasks')
+        _discovered = True
+
+
+def get_task(name):
+    autodiscover()
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise LookupError(f"No task registered as '{name}'") from None
+
+
+def enqueue(name, payload=None, user=None, max_attempts=3):
+    """Create a pending job for a registered task."""
+    get_task(name)
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=user,
+        max_attempts=max_attempts
+    )
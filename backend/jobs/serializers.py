@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'name', 'status', 'progress', 'message', 'result', 'error',
+            'attempts', 'max_attempts', 'created_by', 'created_at',
+            'started_at', 'finished_at', 'updated_at'
+        ]
+        read_only_fields = fields
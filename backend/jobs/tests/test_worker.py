@@ -0,0 +1,125 @@
+import io
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs.management.commands.run_jobs import Command
+from jobs.models import Job
+from jobs.worker import RETRY_BASE_DELAY, claim, execute, requeue_stale
+
+
+def make_job(**fields):
+    return Job.objects.create(name='tests.job', **fields)
+
+
+class ClaimTests(TestCase):
+    def test_claims_due_pending_jobs_in_order(self):
+        later = make_job(run_after=timezone.now() - timedelta(minutes=1))
+        first = make_job(run_after=timezone.now() - timedelta(minutes=2))
+        make_job(run_after=timezone.now() + timedelta(minutes=1))
+        make_job(status='RUNNING')
+
+        self.assertEqual(claim(5), [first.pk, later.pk])
+
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), ('RUNNING', 1))
+        self.assertEqual(claim(5), [])
+
+    def test_respects_limit(self):
+        jobs = [make_job() for _ in range(3)]
+
+        self.assertEqual(claim(2), [jobs[0].pk, jobs[1].pk])
+
+
+class RequeueStaleTests(TestCase):
+    def make_running(self, attempts, age):
+        job = make_job(status='RUNNING', attempts=attempts)
+        Job.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(seconds=age))
+        return job
+
+    def test_requeues_stale_jobs_and_fails_exhausted_ones(self):
+        stale = self.make_running(attempts=1, age=120)
+        exhausted = self.make_running(attempts=3, age=120)
+        alive = self.make_running(attempts=1, age=10)
+
+        self.assertEqual(requeue_stale(60), 1)
+
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            (statuses[stale.pk], statuses[exhausted.pk], statuses[alive.pk]), ('PENDING', 'FAILED', 'RUNNING')
+        )
+
+
+@mock.patch('jobs.worker.connections')
+class ExecuteTests(TestCase):
+    def run_job(self, task, attempts):
+        job = make_job(status='RUNNING', attempts=attempts)
+        with mock.patch('jobs.worker.get_task', return_value=task):
+            ok = execute(job.pk)
+        job.refresh_from_db()
+        return ok, job
+
+    def test_success_stores_result(self, connections):
+        ok, job = self.run_job(lambda job: {'done': True}, attempts=1)
+
+        self.assertTrue(ok)
+        self.assertEqual((job.status, job.result, job.progress), ('SUCCEEDED', {'done': True}, 1.0))
+
+    def test_failure_retries_with_exponential_backoff(self, connections):
+        def fail(job):
+            raise ValueError('boom')
+
+        before = timezone.now()
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            ok, job = self.run_job(fail, attempts=2)
+
+        self.assertFalse(ok)
+        self.assertEqual((job.status, job.error), ('PENDING', 'boom'))
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=RETRY_BASE_DELAY * 2))
+
+    def test_last_attempt_fails_the_job(self, connections):
+        def fail(job):
+            raise ValueError
+
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            ok, job = self.run_job(fail, attempts=3)
+
+        self.assertFalse(ok)
+        self.assertEqual((job.status, job.error), ('FAILED', 'ValueError'))
+
+
+class FakePool:
+    """Stands in for the process pool; ``broken`` pools fail every job."""
+
+    def __init__(self, broken):
+        self.broken = broken
+
+    def submit(self, fn, job_id):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool('A worker process died'))
+        else:
+            future.set_result(True)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class RunJobsTests(TestCase):
+    def test_broken_pool_is_restarted_and_its_jobs_requeued(self):
+        job = make_job()
+        pools = iter([FakePool(broken=True), FakePool(broken=False)])
+        stderr = io.StringIO()
+
+        with mock.patch.object(Command, '_pool', side_effect=lambda workers: next(pools)):
+            call_command('run_jobs', '--once', '--workers=1', stdout=io.StringIO(), stderr=stderr)
+
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+        self.assertIn('requeued 1 of 1', stderr.getvalue())
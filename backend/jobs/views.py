@@ -0,0 +1,33 @@
+from django.urls import reverse
+from rest_framework import viewsets, permissions, status
+from rest_framework.response import Response
+
+from .models import Job
+from .registry import enqueue
+from .serializers import JobSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for background job status and progress.
+    Admins see all jobs, other users only the jobs they started.
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == 'ADMIN':
+            return Job.objects.all()
+        return Job.objects.filter(created_by=user)
+
+
+def accepted(request, name, payload=None):
+    """Enqueue a job and return a 202 response pointing at its status."""
+    job = enqueue(name, payload, user=request.user)
+    return Response({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': request.build_absolute_uri(reverse('job-detail', args=[job.id]))
+    }, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,133 @@
+"""
+Job claiming and execution.
+
+Workers claim pending jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` where
+the database supports it and fall back to a per-row compare-and-set update
+otherwise. Failed jobs are retried with exponential backoff until
+``max_attempts`` is reached. The worker refreshes ``updated_at`` of the jobs
+it runs, so only jobs whose worker died go stale.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+RETRY_BASE_DELAY = 30  # seconds; doubled after each failed attempt
+
+logger = logging.getLogger(__name__)
+
+
+def _claim_update(queryset, now):
+    return queryset.update(
+        status='RUNNING',
+        started_at=now,
+        finished_at=None,
+        attempts=F('attempts') + 1,
+        updated_at=now
+    )
+
+
+def claim(limit):
+    """Mark up to ``limit`` due jobs as running and return their ids."""
+    now = timezone.now()
+    due = Job.objects.filter(status='PENDING', run_after__lte=now).order_by('run_after', 'id')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            if ids:
+                _claim_update(Job.objects.filter(id__in=ids), now)
+        return ids
+
+    claimed = []
+    for job_id in due.values_list('id', flat=True)[:limit]:
+        if _claim_update(Job.objects.filter(id=job_id, status='PENDING'), now):
+            claimed.append(job_id)
+    return claimed
+
+
+def heartbeat(job_ids):
+    """Mark running jobs as alive."""
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, status='RUNNING').update(updated_at=timezone.now())
+
+
+def _release(jobs, error):
+    now = timezone.now()
+    jobs.filter(attempts__gte=F('max_attempts')).update(
+        status='FAILED',
+        error=error,
+        finished_at=now,
+        updated_at=now
+    )
+    return jobs.filter(attempts__lt=F('max_attempts')).update(
+        status='PENDING',
+        run_after=now,
+        updated_at=now
+    )
+
+
+def requeue_stale(timeout):
+    """
+    Return running jobs without a heartbeat for ``timeout`` to the queue, or
+    fail them if they have no attempts left. Returns the number requeued.
+    """
+    stale = Job.objects.filter(
+        status='RUNNING', updated_at__lt=timezone.now() - timedelta(seconds=timeout)
+    )
+    return _release(stale, 'The worker running this job stopped responding')
+
+
+def requeue(job_ids):
+    """
+    Like ``requeue_stale``, for running jobs whose worker process is known
+    to have died. Returns the number requeued.
+    """
+    if not job_ids:
+        return 0
+    return _release(
+        Job.objects.filter(pk__in=job_ids, status='RUNNING'), 'The worker running this job crashed'
+    )
+
+
+def execute(job_id):
+    """Run one claimed job and record its outcome."""
+    try:
+        job = Job.objects.get(pk=job_id)
+        try:
+            result = get_task(job.name)(job, **job.payload)
+        except Exception as exc:
+            logger.exception('Job %s (%s) failed on attempt %s', job.pk, job.name, job.attempts)
+            error = str(exc) or exc.__class__.__name__
+            if job.attempts < job.max_attempts:
+                delay = RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+                Job.objects.filter(pk=job.pk).update(
+                    status='PENDING',
+                    error=error,
+                    run_after=timezone.now() + timedelta(seconds=delay)
+                )
+            else:
+                Job.objects.filter(pk=job.pk).update(
+                    status='FAILED',
+                    error=error,
+                    finished_at=timezone.now()
+                )
+            return False
+
+        Job.objects.filter(pk=job.pk).update(
+            status='SUCCEEDED',
+            result=result,
+            progress=1.0,
+            error='',
+            finished_at=timezone.now()
+        )
+        return True
+    finally:
+        connections.close_all()
+
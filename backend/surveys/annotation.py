@@ -0,0 +1,130 @@
+"""
+Offline sentiment annotation of free-text answers.
+
+Responses with ``answer_text`` and no ``ResponseAnnotation`` are streamed in
+primary-key chunks, analyzed with ``surveys.sentiment`` in a process pool
+and written back with ``bulk_create``. Since only unannotated responses are
+selected, an interrupted run resumes where it stopped. Submissions that
+change a text answer delete its annotation so it is picked up again.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from django.db.models import Avg, Count, Q
+
+from .models import ResponseAnnotation, SurveyResponse
+from .sentiment import LEXICON_VERSION, analyze_batch
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class AnnotationResult:
+    """Counters reported by an annotation run."""
+
+    annotated: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def responses_per_second(self):
+        return self.annotated / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'annotated': self.annotated,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'responses_per_second': round(self.responses_per_second, 1),
+        }
+
+
+def pending(survey_id=None):
+    """Free-text responses that have no annotation yet."""
+    responses = SurveyResponse.objects.filter(answer_text__isnull=False, annotation__isnull=True)
+    if survey_id is not None:
+        responses = responses.filter(assignment__survey_id=survey_id)
+    return responses
+
+
+def discard_stale():
+    """Delete annotations made with an older lexicon so they are redone."""
+    return ResponseAnnotation.objects.filter(lexicon_version__lt=LEXICON_VERSION).delete()[0]
+
+
+def _slices(items, count):
+    size = -(-len(items) // count)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def annotate(survey_id=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, progress=None):
+    """
+    Annotate every pending response.
+
+    With ``workers`` above one, each chunk is split across that many
+    processes. ``progress`` is called with the result after every chunk.
+    """
+    result = AnnotationResult()
+    started = time.perf_counter()
+    responses = pending(survey_id)
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        last_pk = 0
+        while True:
+            chunk = list(
+                responses.filter(pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', 'answer_text', 'assignment__survey_id', 'question__factor_id'
+                )[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_pk = chunk[-1][0]
+
+            items = [(pk, text) for pk, text, _, _ in chunk]
+            if pool is None:
+                analyzed = analyze_batch(items)
+            else:
+                analyzed = [row for rows in pool.map(analyze_batch, _slices(items, workers)) for row in rows]
+
+            owners = {pk: (survey, factor) for pk, _, survey, factor in chunk}
+            ResponseAnnotation.objects.bulk_create(
+                [
+                    ResponseAnnotation(
+                        response_id=pk,
+                        survey_id=owners[pk][0],
+                        factor_id=owners[pk][1],
+                        sentiment=sentiment,
+                        keywords=keywords,
+                        lexicon_version=LEXICON_VERSION,
+                    )
+                    for pk, sentiment, keywords in analyzed
+                ],
+                ignore_conflicts=True
+            )
+            result.annotated += len(analyzed)
+            result.elapsed = time.perf_counter() - started
+            if progress is not None:
+                progress(result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def factor_sentiment(survey_id):
+    """Average text sentiment per factor of a survey, from stored annotations."""
+    return list(
+        ResponseAnnotation.objects.filter(survey_id=survey_id).values(
+            'factor_id', 'factor__name'
+        ).annotate(
+            response_count=Count('pk'),
+            avg_sentiment=Avg('sentiment'),
+            negative_count=Count('pk', filter=Q(sentiment__lt=0)),
+        ).order_by('factor_id')
+    )
@@ -0,0 +1,104 @@
+"""
+Typed columns for closed-form answers.
+
+Alongside the raw ``answer`` JSON, responses to closed-form questions store
+their value in a typed column so analytics can group and filter on plain
+integers instead of parsing JSON:
+
+* ``answer_index``: position of the selected option (RADIO, DROPDOWN)
+* ``answer_number``: numeric value (RATING)
+* ``answer_mask``: bitmask of selected option positions (CHECKBOX)
+
+Free-text answers (TEXT, TEXTAREA) are copied to ``answer_text``, which
+backs full-text search (see ``surveys.search``).
+
+Option positions beyond ``MASK_BITS`` and values that are not among the
+question's options are left out.
+"""
+
+from .scoring import multi_values, single_value
+
+TYPED_FIELDS = ['answer_index', 'answer_number', 'answer_mask']
+STORED_FIELDS = [*TYPED_FIELDS, 'answer_text']
+
+# Bits available in a signed 64-bit column.
+MASK_BITS = 63
+
+REFRESH_BATCH_SIZE = 2000
+
+
+def _option_positions(options):
+    positions = {}
+    for position, option in enumerate(options or ()):
+        positions.setdefault(str(option), position)
+    return positions
+
+
+def encode(question_type, options, answer):
+    """Return ``(answer_index, answer_number, answer_mask)`` for an answer."""
+    if question_type in ('RADIO', 'DROPDOWN'):
+        value = single_value(answer)
+        if value is None:
+            return None, None, None
+        return _option_positions(options).get(str(value)), None, None
+
+    if question_type == 'RATING':
+        try:
+            return None, float(single_value(answer)), None
+        except (ValueError, TypeError):
+            return None, None, None
+
+    if question_type == 'CHECKBOX':
+        positions = _option_positions(options)
+        mask = 0
+        for value in multi_values(answer):
+            position = positions.get(str(value))
+            if position is not None and position < MASK_BITS:
+                mask |= 1 << position
+        return None, None, mask
+
+    return None, None, None
+
+
+def text(question_type, answer):
+    """Return the searchable text of a free-text answer, or ``None``."""
+    if question_type not in ('TEXT', 'TEXTAREA'):
+        return None
+    value = single_value(answer)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def fill(response, question=None):
+    """Set the typed columns of a response from its answer."""
+    question = question or response.question
+    response.answer_index, response.answer_number, response.answer_mask = encode(
+        question.type, question.options, response.answer
+    )
+    response.answer_text = text(question.type, response.answer)
+    return response
+
+
+def refresh(question):
+    """Re-encode stored answers of a question, e.g. after its options changed."""
+    from .models import SurveyResponse
+
+    changed = []
+    updated = 0
+    for response in SurveyResponse.objects.filter(question=question).only(
+        'id', 'answer', *STORED_FIELDS
+    ).iterator(chunk_size=REFRESH_BATCH_SIZE):
+        old = [getattr(response, name) for name in STORED_FIELDS]
+        fill(response, question)
+        if old != [getattr(response, name) for name in STORED_FIELDS]:
+            changed.append(response)
+        if len(changed) >= REFRESH_BATCH_SIZE:
+            SurveyResponse.objects.bulk_update(changed, STORED_FIELDS)
+            updated += len(changed)
+            changed = []
+    if changed:
+        SurveyResponse.objects.bulk_update(changed, STORED_FIELDS)
+        updated += len(changed)
+    return updated
@@ -0,0 +1,78 @@
+"""
+Bulk survey assignment.
+
+Targets are resolved to employee ids with one query and new assignments are
+inserted with ``bulk_create(ignore_conflicts=True)`` in batches, relying on
+the ``(survey, employee)`` unique constraint to skip duplicates.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+
+from analytics.rollups import record_assignments
+from .dashboard import invalidate as invalidate_dashboard
+from .models import SurveyAssignment
+from .statistics import StatisticsDelta
+from users.models import Employee
+
+ASSIGN_BATCH_SIZE = 1000
+
+
+def resolve_employees(employee_ids=(), department_ids=(), all_active=False, department=None):
+    """
+    Return the ids of the targeted employees.
+
+    ``department`` restricts the result to one department (used for HR).
+    """
+    employees = Employee.objects.all()
+    if all_active:
+        employees = employees.filter(is_active=True, user__is_active=True)
+    else:
+        employees = employees.filter(
+            Q(id__in=employee_ids)
+            | Q(user__department_id__in=department_ids, is_active=True, user__is_active=True)
+        )
+    if department is not None:
+        employees = employees.filter(user__department=department)
+    return list(employees.order_by('id').values_list('id', flat=True))
+
+
+def bulk_assign(survey, employee_ids, assigned_by, due_date=None):
+    """
+    Assign ``survey`` to every employee in ``employee_ids``.
+
+    Returns ``(created, skipped)`` where skipped employees already had the
+    survey assigned, including any assigned concurrently.
+    """
+    with transaction.atomic():
+        existing = set(
+            SurveyAssignment.objects.filter(survey=survey).values_list('employee_id', flat=True)
+        )
+        new_ids = [employee_id for employee_id in employee_ids if employee_id not in existing]
+        created = SurveyAssignment.objects.bulk_create(
+            [
+                SurveyAssignment(
+                    survey=survey,
+                    employee_id=employee_id,
+                    assigned_by=assigned_by,
+                    due_date=due_date
+                )
+                for employee_id in new_ids
+            ],
+            batch_size=ASSIGN_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+        # Conflicting rows are skipped silently, so count what was inserted.
+        inserted = SurveyAssignment.objects.filter(survey=survey).count() - len(existing)
+        if inserted == len(new_ids):
+            record_assignments(created)
+        else:
+            record_assignments(
+                SurveyAssignment.objects.filter(survey=survey, employee_id__in=new_ids, assigned_by=assigned_by)
+            )
+
+        delta = StatisticsDelta(survey.id)
+        delta.assignments_added(inserted)
+        delta.apply()
+        invalidate_dashboard()
+    return inserted, len(employee_ids) - inserted
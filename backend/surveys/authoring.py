@@ -0,0 +1,120 @@
+"""
+Bulk question authoring and survey cloning.
+
+These paths write with ``bulk_create``/``bulk_update`` instead of saving
+one question at a time, so they take over what ``Question.save()`` and the
+single-row views do on the side: adjusting ``Survey.question_count``,
+bumping ``scoring_version`` (with ``F()``, so concurrent writers cannot lose
+a bump) and ``Survey.content_version``, and refreshing data derived from
+changed questions, including the statistics of surveys whose questions
+changed factor.
+"""
+
+from django.db import transaction
+from django.db.models import F
+
+from .answers import refresh as refresh_typed_answers
+from .counters import adjust as adjust_counters
+from .models import Question, ResponseAnnotation, Survey
+from .scoring import invalidate as invalidate_scorer
+from .statistics import rebuild as rebuild_statistics
+
+# Most questions accepted by one bulk request.
+BULK_MAX_QUESTIONS = 500
+
+# Fields whose change requires re-encoding stored answers.
+_ANSWER_SHAPE_FIELDS = {'type', 'options'}
+
+
+def create_questions(items):
+    """Create questions from validated serializer data in one insert."""
+    with transaction.atomic():
+        questions = Question.objects.bulk_create([Question(**item) for item in items])
+        per_survey = {}
+        for question in questions:
+            per_survey[question.survey_id] = per_survey.get(question.survey_id, 0) + 1
+        for survey_id, count in per_survey.items():
+            adjust_counters(survey_id, questions=count)
+        Survey.bump_content_version(per_survey)
+    return questions
+
+
+def update_questions(changes):
+    """
+    Apply ``[(question, validated_data), ...]`` with one ``bulk_update``.
+
+    Questions must not move between surveys. Returns the updated questions.
+    """
+    fields = set()
+    reshaped, refactored = [], []
+    with transaction.atomic():
+        for question, data in changes:
+            if _ANSWER_SHAPE_FIELDS & data.keys() and any(
+                getattr(question, name) != data[name] for name in _ANSWER_SHAPE_FIELDS & data.keys()
+            ):
+                reshaped.append(question)
+            if 'factor' in data and question.factor_id != getattr(data['factor'], 'pk', None):
+                refactored.append(question)
+            for name, value in data.items():
+                setattr(question, name, value)
+            fields.update(data)
+            question.scoring_version = F('scoring_version') + 1
+
+        questions = [question for question, _ in changes]
+        Question.objects.bulk_update(questions, [*fields, 'scoring_version'])
+
+        for question in reshaped:
+            refresh_typed_answers(question)
+        for question in refactored:
+            ResponseAnnotation.objects.filter(response__question=question).update(factor_id=question.factor_id)
+        for survey_id in sorted({question.survey_id for question in refactored}):
+            rebuild_statistics(survey_id)
+        Survey.bump_content_version({question.survey_id for question in questions})
+
+    for question in questions:
+        invalidate_scorer(question.pk)
+    # Reload the bumped versions so callers do not see F() expressions.
+    versions = dict(
+        Question.objects.filter(pk__in=[question.pk for question in questions]).values_list('pk', 'scoring_version')
+    )
+    for question in questions:
+        question.scoring_version = versions[question.pk]
+    return questions
+
+
+def reorder_questions(survey, question_ids):
+    """Set ``order`` of the survey's questions to their position in ``question_ids``."""
+    questions = [Question(pk=question_id, order=position) for position, question_id in enumerate(question_ids)]
+    with transaction.atomic():
+        Question.objects.bulk_update(questions, ['order'])
+        Survey.bump_content_version([survey.pk])
+
+
+def clone_survey(survey, user, title=None):
+    """Copy a survey and its questions for ``user``; statistics start empty."""
+    questions = list(Question.objects.filter(survey=survey).order_by('order', 'id'))
+    with transaction.atomic():
+        clone = Survey.objects.create(
+            title=title or f"{survey.title} (copy)",
+            description=survey.description,
+            category=survey.category,
+            created_by=user,
+            is_active=survey.is_active,
+            question_count=len(questions)
+        )
+        Question.objects.bulk_create([
+            Question(
+                survey=clone,
+                text=question.text,
+                type=question.type,
+                options=question.options,
+                is_required=question.is_required,
+                order=question.order,
+                factor_id=question.factor_id,
+                has_scoring=question.has_scoring,
+                scoring_points=question.scoring_points,
+                scoring_guide=question.scoring_guide,
+            )
+            for question in questions
+        ])
+    return clone
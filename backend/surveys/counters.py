@@ -0,0 +1,44 @@
+"""
+Denormalized ``Survey.question_count`` and ``Survey.response_count``.
+
+Counters are changed with ``F()`` updates in the same transaction as the
+write that affects them; ``repair`` recomputes them with one UPDATE.
+"""
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Question, Survey, SurveyAssignment
+
+
+def adjust(survey_id, questions=0, responses=0):
+    """Add ``questions`` and ``responses`` to a survey's counters."""
+    changes = {}
+    if questions:
+        changes['question_count'] = F('question_count') + questions
+    if responses:
+        changes['response_count'] = F('response_count') + responses
+    if changes:
+        Survey.objects.filter(pk=survey_id).update(**changes)
+
+
+def _count(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.filter(survey=OuterRef('pk')).order_by().values('survey')
+            .annotate(count=Count('pk')).values('count'),
+            output_field=IntegerField()
+        ),
+        Value(0)
+    )
+
+
+def repair(survey_ids=None):
+    """Recompute the counters of the given surveys (or of all surveys)."""
+    surveys = Survey.objects.all()
+    if survey_ids is not None:
+        surveys = surveys.filter(pk__in=survey_ids)
+    return surveys.update(
+        question_count=_count(Question.objects.all()),
+        response_count=_count(SurveyAssignment.objects.filter(is_completed=True)),
+    )
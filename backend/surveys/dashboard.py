@@ -0,0 +1,142 @@
+"""
+Cached turnover dashboard aggregate.
+
+The dashboard is built from four grouped queries: employee counts per
+department and risk band via conditional aggregation, assignment counts,
+the top risk factors and one bounded page of high-risk employees. Results
+are cached per scope (all employees for admins, a department for HR) and
+page, under a version that employee, assignment and response writes bump
+once their transaction commits. The timeout only bounds how long a write
+through a path that does not bump the version can go unnoticed.
+"""
+
+import time
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+
+DASHBOARD_TIMEOUT = 10 * 60
+
+HIGH_RISK_PAGE_SIZE = 10
+HIGH_RISK_MAX_PAGE_SIZE = 100
+
+TOP_FACTORS = 5
+
+# Scope covering every employee, as opposed to a department id.
+ALL = 'all'
+
+_VERSION_KEY = 'surveys:turnover-dashboard-version'
+
+_RISK_LEVELS = (
+    ('LOW', 'Low Risk', '#16A34A', 'lowRiskCount'),
+    ('MEDIUM', 'Medium Risk', '#EAB308', 'mediumRiskCount'),
+    ('HIGH', 'High Risk', '#DC2626', 'highRiskCount'),
+)
+
+
+def _bump():
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        # Start from the clock so a lost counter cannot revive old entries.
+        cache.set(_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate():
+    """Drop cached dashboards once the current transaction commits."""
+    transaction.on_commit(_bump)
+
+
+def _version():
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_VERSION_KEY, version, None):
+            version = cache.get(_VERSION_KEY, version)
+    return version
+
+
+def _compute(department_id, limit, offset):
+    Employee = apps.get_model('users', 'Employee')
+    SurveyAssignment = apps.get_model('surveys', 'SurveyAssignment')
+    SurveyResponse = apps.get_model('surveys', 'SurveyResponse')
+
+    employees = Employee.objects.all()
+    assignments = SurveyAssignment.objects.all()
+    if department_id != ALL:
+        employees = employees.filter(user__department_id=department_id)
+        assignments = assignments.filter(employee__user__department_id=department_id)
+
+    departments = list(
+        employees.values('user__department__name').annotate(
+            count=Count('id'),
+            **{key: Count('id', filter=Q(turnover_risk=level)) for level, _, _, key in _RISK_LEVELS}
+        ).order_by('user__department__name')
+    )
+    by_risk = {key: sum(row[key] for row in departments) for _, _, _, key in _RISK_LEVELS}
+
+    surveys = assignments.aggregate(
+        pending=Count('id', filter=Q(is_completed=False)),
+        completed=Count('id', filter=Q(is_completed=True)),
+    )
+
+    top_factors = SurveyResponse.objects.filter(
+        score__isnull=False,
+        question__factor__type='TURNOVER'
+    ).values('question__factor__name').annotate(avg=Avg('score')).order_by('-avg')[:TOP_FACTORS]
+
+    high_risk = employees.filter(turnover_risk='HIGH').order_by(
+        F('risk_score').desc(nulls_last=True), 'id'
+    ).values('id', 'risk_score', 'user__first_name', 'user__last_name', 'user__email', 'user__department__name')
+
+    return {
+        'total': sum(row['count'] for row in departments),
+        'byRisk': [
+            {'name': name, 'value': by_risk[key], 'color': color}
+            for _, name, color, key in _RISK_LEVELS
+        ],
+        'byDepartment': [
+            {'name': row['user__department__name'] or 'N/A', 'count': row['count']} for row in departments
+        ],
+        'pendingSurveys': surveys['pending'],
+        'completedSurveys': surveys['completed'],
+        'highRiskEmployees': [
+            {
+                'id': row['id'],
+                'name': f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__email'],
+                'department': row['user__department__name'] or 'N/A',
+                'riskScore': row['risk_score'],
+            }
+            for row in high_risk[offset:offset + limit]
+        ],
+        'highRiskTotal': by_risk['highRiskCount'],
+        'highRiskLimit': limit,
+        'highRiskOffset': offset,
+        'topRiskFactors': [
+            {'factor': row['question__factor__name'], 'avgScore': round(row['avg'], 2)} for row in top_factors
+        ],
+        'riskByDepartment': [
+            {
+                'department': row['user__department__name'] or 'N/A',
+                **{key: row[key] for _, _, _, key in _RISK_LEVELS},
+            }
+            for row in departments
+        ],
+    }
+
+
+def turnover_dashboard(department_id=ALL, limit=HIGH_RISK_PAGE_SIZE, offset=0):
+    """
+    Return the dashboard for one department (``None`` for employees without
+    one) or for ``ALL`` employees, with ``limit`` high-risk employees from
+    ``offset``.
+    """
+    scope = ALL if department_id == ALL else f'department-{department_id}'
+    key = f'surveys:turnover-dashboard:{_version()}:{scope}:{limit}:{offset}'
+    data = cache.get(key)
+    if data is None:
+        data = _compute(department_id, limit, offset)
+        cache.set(key, data, DASHBOARD_TIMEOUT)
+    return data
@@ -0,0 +1,103 @@
+"""
+Cached survey definitions.
+
+A survey definition (the survey with its questions and factors) is rendered
+once per ``Survey.content_version`` and kept in the cache. The current
+version of each survey is itself cached, as is each employee's right to see
+the survey, so repeat requests can be answered, or turned into a 304 through
+the ETag, without a database query. Any change to a survey, one of its
+questions or one of their factors bumps the version and drops the cached
+version entry; deleting an assignment drops the employee's access entry.
+
+Dropped entries only leave every process's view with a cache shared between
+processes. With a process-local cache such as the default ``LocMemCache``,
+version entries expire after ``VERSION_TIMEOUT``, so other processes can
+serve the previous definition for up to that long after a change. Access
+entries always expire after ``ACCESS_TIMEOUT``, which bounds how long an
+employee keeps seeing a survey after losing the assignment some other way,
+e.g. with the employee record.
+"""
+
+from django.apps import apps
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+# Lifetime of version entries in a process-local cache.
+VERSION_TIMEOUT = 60
+DEFINITION_TIMEOUT = 24 * 60 * 60
+ACCESS_TIMEOUT = 5 * 60
+
+
+def shared_cache():
+    """Whether the default cache is shared between processes."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _version_key(survey_id):
+    return f'surveys:definition-version:{survey_id}'
+
+
+def _definition_key(survey_id, version):
+    return f'surveys:definition:{survey_id}:{version}'
+
+
+def _access_key(survey_id, user_id):
+    return f'surveys:definition-access:{survey_id}:{user_id}'
+
+
+def forget(survey_ids):
+    """Drop cached versions once the current transaction commits."""
+    keys = [_version_key(survey_id) for survey_id in survey_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def current_version(survey_id):
+    """Return the survey's content version, or ``None`` if it does not exist."""
+    key = _version_key(survey_id)
+    version = cache.get(key)
+    if version is None:
+        Survey = apps.get_model('surveys', 'Survey')
+        version = Survey.objects.filter(pk=survey_id).values_list('content_version', flat=True).first()
+        if version is None:
+            return None
+        cache.set(key, version, DEFINITION_TIMEOUT if shared_cache() else VERSION_TIMEOUT)
+    return version
+
+
+def can_view(survey_id, user, version):
+    """
+    Whether ``user`` has an assignment for the survey. A granted check is
+    cached for the survey's current ``version``.
+    """
+    key = _access_key(survey_id, user.pk)
+    if cache.get(key) == version:
+        return True
+    SurveyAssignment = apps.get_model('surveys', 'SurveyAssignment')
+    allowed = SurveyAssignment.objects.filter(survey_id=survey_id, employee__user=user).exists()
+    if allowed:
+        cache.set(key, version, ACCESS_TIMEOUT)
+    return allowed
+
+
+def forget_access(survey_id, user_ids):
+    """Drop cached access checks once the current transaction commits."""
+    keys = [_access_key(survey_id, user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def etag(survey_id, version):
+    return f'"survey-{survey_id}-v{version}"'
+
+
+def get_definition(survey_id, version, render):
+    """Return the rendered definition, calling ``render()`` on a cache miss."""
+    key = _definition_key(survey_id, version)
+    data = cache.get(key)
+    if data is None:
+        data = render()
+        cache.set(key, data, DEFINITION_TIMEOUT)
+    return data
@@ -0,0 +1,93 @@
+"""
+Answer distributions of closed-form questions.
+
+Histograms are computed with one ``GROUP BY`` over the typed answer columns
+(see ``surveys.answers``), optionally split by department and by month of
+submission, and pivoted into one row per group in Python.
+"""
+
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from .answers import MASK_BITS
+from .models import SurveyResponse
+
+GROUPINGS = {
+    'department': ('assignment__employee__user__department_id', 'assignment__employee__user__department__name'),
+    'month': ('month',),
+}
+
+_VALUE_FIELDS = {
+    'RADIO': 'answer_index',
+    'DROPDOWN': 'answer_index',
+    'CHECKBOX': 'answer_mask',
+    'RATING': 'answer_number',
+}
+
+
+def supports(question):
+    """Whether answers to ``question`` have a typed column to group on."""
+    return question.type in _VALUE_FIELDS
+
+
+def _label(question, value_field, value):
+    if value_field == 'answer_number':
+        return int(value) if value == int(value) else value
+    options = question.options or []
+    return options[value] if value < len(options) else value
+
+
+def _group(row, group_by):
+    group = {}
+    if 'department' in group_by:
+        group['department_id'] = row['assignment__employee__user__department_id']
+        group['department'] = row['assignment__employee__user__department__name']
+    if 'month' in group_by:
+        group['month'] = row['month'].strftime('%Y-%m') if row['month'] else None
+    return group
+
+
+def distribution(question, group_by=(), responses=None):
+    """
+    Return answer counts of ``question`` per group.
+
+    ``group_by`` is a subset of ``GROUPINGS``; ``responses`` optionally
+    narrows the responses considered (e.g. to a department).
+    """
+    value_field = _VALUE_FIELDS[question.type]
+    if responses is None:
+        responses = SurveyResponse.objects.all()
+    responses = responses.filter(question=question, **{f'{value_field}__isnull': False})
+    if 'month' in group_by:
+        responses = responses.annotate(month=TruncMonth('submitted_at'))
+
+    group_fields = [field for name in GROUPINGS if name in group_by for field in GROUPINGS[name]]
+    rows = responses.values(*group_fields, value_field).annotate(
+        count=Count('id')
+    ).order_by(*group_fields, value_field)
+
+    groups = {}
+    for row in rows:
+        key = tuple(row[field] for field in group_fields)
+        entry = groups.get(key)
+        if entry is None:
+            entry = groups[key] = {**_group(row, group_by), 'total': 0, 'counts': {}}
+        count, value = row['count'], row[value_field]
+        entry['total'] += count
+
+        if value_field == 'answer_mask':
+            values = [bit for bit in range(MASK_BITS) if value >> bit & 1]
+        else:
+            values = [value]
+        for value in values:
+            label = _label(question, value_field, value)
+            entry['counts'][label] = entry['counts'].get(label, 0) + count
+
+    return {
+        'question_id': question.id,
+        'type': question.type,
+        'options': question.options,
+        'group_by': [name for name in GROUPINGS if name in group_by],
+        'total': sum(entry['total'] for entry in groups.values()),
+        'groups': list(groups.values()),
+    }
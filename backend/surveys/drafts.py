@@ -0,0 +1,281 @@
+"""
+Draft autosave with write-behind buffering.
+
+Autosaves are merged into a per-assignment entry in the cache and the
+assignment is appended to a queue that is also kept in the cache. Queued
+drafts are written to ``SurveyDraft`` with bulk upserts by ``flush``, which
+the ``flush_survey_drafts`` command runs every ``FLUSH_INTERVAL`` seconds;
+autosaves also flush when the queue is full or its oldest entry is due.
+Reads always go to the cache first, so buffering is not visible to clients.
+Drafts of assignments deleted in the meantime are dropped when flushed.
+
+Buffered drafts survive restarts of web processes, but not the loss of the
+cache: autosaves made since the last flush are lost with it, which is about
+one ``FLUSH_INTERVAL`` while the flush command is running and unbounded if
+it is not.
+
+Buffering needs a cache shared by every process. With a process-local
+backend such as the default ``LocMemCache``, autosaves are written through
+to the database instead.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .definitions import shared_cache
+from .models import SurveyAssignment, SurveyDraft
+
+FLUSH_INTERVAL = 10  # seconds
+FLUSH_BATCH = 500
+BUFFER_TIMEOUT = 24 * 60 * 60
+MAX_ANSWERS = 1000
+
+# Queue slots still missing this long after the last flush belong to
+# autosaves that failed between taking a slot and filling it.
+MISSING_SLOT_GRACE = 60  # seconds
+FLUSH_LOCK_TIMEOUT = 5 * 60  # seconds
+
+_SEQUENCE_KEY = 'surveys:draft-queue:sequence'
+_CURSOR_KEY = 'surveys:draft-queue:cursor'
+_LOCK_KEY = 'surveys:draft-queue:lock'
+
+
+def _key(assignment_id):
+    return f'surveys:draft:{assignment_id}'
+
+
+def _queued_key(assignment_id):
+    return f'surveys:draft-queued:{assignment_id}'
+
+
+def _slot_key(sequence):
+    return f'surveys:draft-queue:{sequence}'
+
+
+def buffered():
+    """Whether autosaves are buffered, i.e. the cache is shared between processes."""
+    return shared_cache()
+
+
+def _enqueue(assignment_id):
+    # Queue each draft once until a flush picks it up; the marker expires so
+    # a slot lost by a failed autosave does not keep the draft out for long.
+    if not cache.add(_queued_key(assignment_id), True, FLUSH_INTERVAL):
+        return
+    cache.add(_SEQUENCE_KEY, 0, None)
+    sequence = cache.incr(_SEQUENCE_KEY)
+    cache.set(_slot_key(sequence), (assignment_id, time.time()), BUFFER_TIMEOUT)
+
+
+def _forget(*assignment_ids):
+    cache.delete_many([key for pk in assignment_ids for key in (_key(pk), _queued_key(pk))])
+
+
+def load(assignment_id, user):
+    """
+    Return the draft entry of the user's assignment, or ``None`` if the
+    assignment is not theirs. The entry is cached, so repeat calls do not
+    touch the database.
+    """
+    entry = cache.get(_key(assignment_id))
+    if entry is not None and entry['user_id'] == user.pk:
+        return entry
+
+    assignment = SurveyAssignment.objects.filter(
+        pk=assignment_id, employee__user=user
+    ).values('survey_id', 'is_completed').first()
+    if assignment is None:
+        return None
+    draft = SurveyDraft.objects.filter(assignment_id=assignment_id).values('answers', 'saved_at').first()
+    entry = {
+        'assignment_id': assignment_id,
+        'user_id': user.pk,
+        'survey_id': assignment['survey_id'],
+        'is_completed': assignment['is_completed'],
+        'answers': draft['answers'] if draft else {},
+        'saved_at': draft['saved_at'] if draft else None,
+    }
+    cache.set(_key(assignment_id), entry, BUFFER_TIMEOUT)
+    return entry
+
+
+def save(entry, answers, replace=False):
+    """
+    Merge ``{question_id: answer}`` into a loaded draft entry, or replace
+    its answers, and buffer it (or write it, without a shared cache).
+    """
+    if replace:
+        entry['answers'] = {}
+    entry['answers'].update({str(question_id): answer for question_id, answer in answers.items()})
+    entry['saved_at'] = timezone.now()
+    cache.set(_key(entry['assignment_id']), entry, BUFFER_TIMEOUT)
+    if buffered():
+        _enqueue(entry['assignment_id'])
+        maybe_flush()
+    else:
+        _write([entry])
+    return entry
+
+
+def discard(assignment_id):
+    """Delete a draft from the buffer and the database."""
+    _forget(assignment_id)
+    SurveyDraft.objects.filter(assignment_id=assignment_id).delete()
+
+
+def forget(assignment_ids):
+    """
+    Drop the buffered drafts of assignments that are being deleted, once the
+    transaction commits; their rows go with the assignments.
+    """
+    assignment_ids = list(assignment_ids)
+    if assignment_ids:
+        transaction.on_commit(lambda: _forget(*assignment_ids))
+
+
+def _cursor():
+    return cache.get(_CURSOR_KEY) or {'sequence': 0, 'moved_at': time.time()}
+
+
+def maybe_flush():
+    """Flush if the oldest queued draft is due or the queue is full."""
+    position = _cursor()['sequence']
+    end = cache.get(_SEQUENCE_KEY, 0)
+    if end <= position:
+        return 0
+    oldest = cache.get(_slot_key(position + 1))
+    if end - position >= FLUSH_BATCH or (oldest is not None and time.time() - oldest[1] >= FLUSH_INTERVAL):
+        return flush()
+    return 0
+
+
+def flush():
+    """
+    Write queued drafts to the database. Returns the number written.
+
+    Returns 0 without waiting while another process is flushing.
+    """
+    if not buffered() or not cache.add(_LOCK_KEY, True, FLUSH_LOCK_TIMEOUT):
+        return 0
+    try:
+        return _flush_queue()
+    finally:
+        cache.delete(_LOCK_KEY)
+
+
+def _flush_queue():
+    now = time.time()
+    cursor = _cursor()
+    end = cache.get(_SEQUENCE_KEY, 0)
+    if end < cursor['sequence']:
+        # The sequence was evicted and started over.
+        cursor = {'sequence': 0, 'moved_at': now}
+    start = cursor['sequence']
+
+    assignment_ids, reached = set(), None
+    for first in range(start + 1, end + 1, FLUSH_BATCH):
+        sequences = range(first, min(first + FLUSH_BATCH, end + 1))
+        slots = cache.get_many([_slot_key(sequence) for sequence in sequences])
+        for sequence in sequences:
+            slot = slots.get(_slot_key(sequence))
+            if slot is not None:
+                assignment_ids.add(slot[0])
+            elif reached is None:
+                # Possibly an autosave still filling its slot; stop before it.
+                reached = sequence - 1
+    if reached is None or now - cursor['moved_at'] >= MISSING_SLOT_GRACE:
+        reached = end
+
+    # Unmark before reading, so autosaves from here on queue again.
+    assignment_ids = sorted(assignment_ids)
+    cache.delete_many([_queued_key(assignment_id) for assignment_id in assignment_ids])
+    written = 0
+    for first in range(0, len(assignment_ids), FLUSH_BATCH):
+        batch = assignment_ids[first:first + FLUSH_BATCH]
+        written += _write(cache.get_many([_key(assignment_id) for assignment_id in batch]).values())
+
+    if reached > start:
+        cache.delete_many([_slot_key(sequence) for sequence in range(start + 1, reached + 1)])
+        cache.set(_CURSOR_KEY, {'sequence': reached, 'moved_at': now}, None)
+    return written
+
+
+def _write(entries):
+    """
+    Upsert draft entries. Rows already saved from a newer autosave are left
+    alone, and entries of deleted assignments are dropped from the buffer.
+    Returns the number of drafts written.
+    """
+    entries = [entry for entry in entries if entry['saved_at'] is not None]
+    if not entries:
+        return 0
+    assignment_ids = [entry['assignment_id'] for entry in entries]
+    existing = set(SurveyAssignment.objects.filter(pk__in=assignment_ids).values_list('pk', flat=True))
+    deleted = [assignment_id for assignment_id in assignment_ids if assignment_id not in existing]
+    if deleted:
+        _forget(*deleted)
+    stored = dict(
+        SurveyDraft.objects.filter(assignment_id__in=existing).values_list('assignment_id', 'saved_at')
+    )
+    drafts = [
+        SurveyDraft(assignment_id=entry['assignment_id'], answers=entry['answers'], saved_at=entry['saved_at'])
+        for entry in entries
+        if entry['assignment_id'] in existing
+        and (entry['assignment_id'] not in stored or stored[entry['assignment_id']] < entry['saved_at'])
+    ]
+    if not drafts:
+        return 0
+    try:
+        with transaction.atomic():
+            _upsert(drafts)
+    except IntegrityError:
+        # An assignment was deleted since the check; write the rest one by
+        # one so a single vanished assignment cannot hold up the queue.
+        written = 0
+        for draft in drafts:
+            try:
+                with transaction.atomic():
+                    _upsert([draft])
+            except IntegrityError:
+                _forget(draft.assignment_id)
+            else:
+                written += 1
+        return written
+    return len(drafts)
+
+
+def _upsert(drafts):
+    SurveyDraft.objects.bulk_create(
+        drafts,
+        batch_size=FLUSH_BATCH,
+        update_conflicts=True,
+        unique_fields=['assignment'],
+        update_fields=['answers', 'saved_at'],
+    )
+
+
+def promote(assignment, responses_data):
+    """
+    Merge the assignment's draft under the submitted responses and drop it.
+
+    Submitted answers win over drafted ones. Returns the responses to submit.
+    Call inside the submission transaction.
+    """
+    entry = cache.get(_key(assignment.pk))
+    answers = entry['answers'] if entry is not None else None
+    if answers is None:
+        draft = SurveyDraft.objects.filter(assignment_id=assignment.pk).values_list('answers', flat=True).first()
+        if draft is None:
+            return responses_data
+        answers = draft
+
+    merged = {int(question_id): answer for question_id, answer in answers.items()}
+    for item in responses_data:
+        merged[item.get('question_id')] = item.get('answer')
+
+    SurveyDraft.objects.filter(assignment_id=assignment.pk).delete()
+    transaction.on_commit(lambda: _forget(assignment.pk))
+    return [{'question_id': question_id, 'answer': answer} for question_id, answer in merged.items()]
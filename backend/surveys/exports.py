@@ -0,0 +1,164 @@
+"""
+Streaming exports of survey responses.
+
+Assignments and their responses are read with one joined ``values_list``
+query through ``.iterator()`` (a server-side cursor on PostgreSQL) and
+grouped by assignment on the fly, so memory stays constant regardless of
+survey size. Assignments without responses are exported with none, as in
+the JSON export.
+"""
+
+import csv
+import json
+from itertools import groupby
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from .models import SurveyResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+_FIELDS = (
+    'id',
+    'completed_at',
+    'total_score',
+    'employee__user__first_name',
+    'employee__user__last_name',
+    'employee__user__email',
+    'employee__user__department__name',
+    'employee__position',
+    'responses__id',
+    'responses__question_id',
+    'responses__question__text',
+    'responses__answer',
+    'responses__score',
+    'responses__question__scoring_points',
+    'responses__question__has_scoring',
+)
+
+CSV_HEADER = [
+    'assignment_id', 'employee_name', 'employee_email', 'department', 'position',
+    'completed_at', 'total_score', 'response_id', 'question_id', 'question_text',
+    'answer', 'score', 'max_points', 'has_scoring',
+]
+
+
+# Leading characters that make spreadsheet applications evaluate a cell.
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _rows(assignments):
+    """One row per response, or a single row without one for assignments with none."""
+    return assignments.order_by(
+        'id', 'responses__question__order', 'responses__question_id'
+    ).values_list(*_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _employee_details(row):
+    return {
+        'name': f"{row[3]} {row[4]}".strip() or row[5],
+        'email': row[5],
+        'department': row[6] or 'N/A',
+        'position': row[7] or 'N/A',
+    }
+
+
+def with_responses(assignments):
+    """Prefetch everything ``assignment_item`` reads with a single prefetch query."""
+    return assignments.select_related('employee__user__department').prefetch_related(
+        Prefetch(
+            'responses',
+            queryset=SurveyResponse.objects.select_related('question').order_by('question__order', 'question_id')
+        )
+    )
+
+
+def assignment_item(assignment):
+    """Nested representation of an assignment loaded through ``with_responses``."""
+    user = assignment.employee.user
+    return {
+        'id': assignment.id,
+        'employee_details': {
+            'name': f"{user.first_name} {user.last_name}".strip() or user.email,
+            'email': user.email,
+            'department': user.department.name if user.department else 'N/A',
+            'position': assignment.employee.position or 'N/A',
+        },
+        'completed_at': assignment.completed_at,
+        'total_score': assignment.total_score,
+        'responses': [
+            {
+                'id': response.id,
+                'question_text': response.question.text,
+                'question_id': response.question_id,
+                'answer': response.answer,
+                'score': response.score,
+                'max_points': response.question.scoring_points,
+                'has_scoring': response.question.has_scoring,
+            }
+            for response in assignment.responses.all()
+        ],
+    }
+
+
+def iter_assignments(assignments):
+    """Yield one dict per assignment with its responses, streamed from a single query."""
+    for assignment_id, rows in groupby(_rows(assignments), key=lambda row: row[0]):
+        rows = list(rows)
+        first = rows[0]
+        yield {
+            'id': assignment_id,
+            'employee_details': _employee_details(first),
+            'completed_at': first[1],
+            'total_score': first[2],
+            'responses': [
+                {
+                    'id': row[8],
+                    'question_text': row[10],
+                    'question_id': row[9],
+                    'answer': row[11],
+                    'score': row[12],
+                    'max_points': row[13],
+                    'has_scoring': row[14],
+                }
+                for row in rows
+                if row[8] is not None
+            ],
+        }
+
+
+def iter_ndjson(assignments):
+    """Yield one JSON document per assignment, newline separated."""
+    for item in iter_assignments(assignments):
+        yield json.dumps(item, cls=DjangoJSONEncoder) + '\n'
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    """Quote text a spreadsheet would run as a formula (CSV injection)."""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(assignments):
+    """Yield CSV lines, one per response and one per assignment without responses."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for row in _rows(assignments):
+        details = _employee_details(row)
+        answer = row[11]
+        if answer is not None and not isinstance(answer, str):
+            answer = json.dumps(answer, cls=DjangoJSONEncoder)
+        completed_at = row[1].isoformat() if row[1] else ''
+        yield writer.writerow([_cell(value) for value in (
+            row[0], details['name'], details['email'], details['department'], details['position'],
+            completed_at, row[2], row[8], row[9], row[10], answer, row[12], row[13], row[14],
+        )])
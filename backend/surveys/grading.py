@@ -0,0 +1,119 @@
+"""
+Manual grading of survey responses.
+
+Assignment totals are maintained by delta: when a response's score changes,
+the difference between its new and old weighted score is added to the
+assignment total while the assignment row is locked, instead of re-summing
+every response of the assignment.
+"""
+
+from django.db import transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from analytics.rollups import RollupDelta
+from .dashboard import invalidate as invalidate_dashboard
+from .models import SurveyAssignment, SurveyResponse
+from .statistics import StatisticsDelta
+from .submission import weighted_score
+
+
+def contribution(response):
+    """Weighted amount a response adds to its assignment's total."""
+    if not response.question.has_scoring:
+        return 0
+    return weighted_score(response.score, response.question) or 0
+
+
+def _full_totals(assignment_ids):
+    """Recompute totals from scratch for assignments that have none yet."""
+    rows = SurveyResponse.objects.filter(
+        assignment_id__in=assignment_ids,
+        question__has_scoring=True,
+        score__isnull=False
+    ).values('assignment_id').annotate(
+        total=Sum(F('score') * Coalesce(F('question__factor__weight'), Value(1.0)))
+    )
+    totals = {assignment_id: 0 for assignment_id in assignment_ids}
+    totals.update({row['assignment_id']: row['total'] for row in rows})
+    return totals
+
+
+def apply_scores(queryset, scores):
+    """
+    Set manual scores and update assignment totals by delta.
+
+    ``queryset`` limits which responses may be graded and ``scores`` maps
+    response id to the new score. Scores must already be validated against
+    each question's maximum. Returns ``{assignment_id: total_score}`` for
+    every assignment touched; ids that are not in ``queryset`` are ignored.
+    """
+    assignment_ids = sorted(set(
+        queryset.filter(pk__in=scores).values_list('assignment_id', flat=True)
+    ))
+    if not assignment_ids:
+        return {}
+
+    with transaction.atomic():
+        # Lock in primary-key order so concurrent graders cannot deadlock.
+        assignments = {
+            assignment.pk: assignment
+            for assignment in SurveyAssignment.objects.select_for_update().filter(
+                pk__in=assignment_ids
+            ).order_by('pk').only('pk', 'survey_id', 'employee_id', 'is_completed', 'completed_at', 'total_score')
+        }
+        old_totals = {pk: assignment.total_score for pk, assignment in assignments.items()}
+        responses = list(
+            queryset.filter(pk__in=scores).select_related('question__factor')
+        )
+
+        deltas = dict.fromkeys(assignments, 0)
+        statistics = {}
+        rollup = RollupDelta()
+        for response in responses:
+            old, old_score = contribution(response), response.score
+            response.score = scores[response.pk]
+            deltas[response.assignment_id] += contribution(response) - old
+
+            assignment = assignments[response.assignment_id]
+            statistics.setdefault(assignment.survey_id, StatisticsDelta(assignment.survey_id)).response_changed(
+                response.question.factor_id, old_score, response.score
+            )
+            if assignment.is_completed and assignment.completed_at is not None:
+                for sign, score in ((-1, old_score), (1, response.score)):
+                    if score is not None:
+                        rollup.add(
+                            assignment.completed_at, employee_id=assignment.employee_id,
+                            factor_id=response.question.factor_id, score_sum=sign * score, score_count=sign
+                        )
+
+        SurveyResponse.objects.bulk_update(responses, ['score'])
+
+        missing = [pk for pk, assignment in assignments.items() if assignment.total_score is None]
+        totals = _full_totals(missing) if missing else {}
+        for pk, assignment in assignments.items():
+            if pk not in totals:
+                totals[pk] = assignment.total_score + deltas[pk]
+            assignment.total_score = totals[pk]
+
+        SurveyAssignment.objects.bulk_update(list(assignments.values()), ['total_score'])
+
+        for pk, assignment in assignments.items():
+            if assignment.is_completed:
+                statistics.setdefault(
+                    assignment.survey_id, StatisticsDelta(assignment.survey_id)
+                ).assignment_changed(True, old_totals[pk], True, assignment.total_score)
+        for delta in statistics.values():
+            delta.apply()
+        rollup.apply()
+        invalidate_dashboard()
+    return totals
+
+
+def validate_score(response, score):
+    """Return an error message if ``score`` is outside the question's range."""
+    if response.question.has_scoring:
+        max_points = response.question.scoring_points
+        if score < 0 or score > max_points:
+            return f'Score must be between 0 and {max_points}'
+    return None
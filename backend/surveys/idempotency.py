@@ -0,0 +1,97 @@
+"""
+Idempotent survey submission.
+
+A submission sent with an ``Idempotency-Key`` stores a ``SubmissionReceipt``
+in the same transaction as the responses. Retries with the same key get the
+stored result back without writing responses again: from the cache when
+possible, otherwise from the receipt table after taking the assignment lock,
+which also serializes duplicates that arrive while the first is in flight.
+A key reused for another assignment, whose receipt can be committed while
+this request runs, is reported as a conflict.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import SubmissionReceipt
+from .submission import lock_assignment, submit_assignment
+
+MAX_KEY_LENGTH = 255
+RECEIPT_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a different request."""
+
+
+def fingerprint(survey_id, assignment_id, responses_data):
+    payload = json.dumps(
+        {'survey': survey_id, 'assignment': assignment_id, 'responses': responses_data},
+        sort_keys=True, cls=DjangoJSONEncoder
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_key(user_id, key):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'surveys:submit-receipt:{user_id}:{digest}'
+
+
+def _replay(receipt, request_fingerprint):
+    if receipt['fingerprint'] != request_fingerprint:
+        raise IdempotencyConflict
+    return receipt['total_score'], True
+
+
+def submit_once(survey, user, assignment_id, responses_data, key):
+    """
+    Submit at most once per ``(user, key)``.
+
+    Returns ``(total_score, replayed)``. Raises ``IdempotencyConflict`` if the
+    key was used with a different payload and
+    ``SurveyAssignment.DoesNotExist`` if the assignment is not the user's.
+    """
+    request_fingerprint = fingerprint(survey.id, assignment_id, responses_data)
+    cache_key = _cache_key(user.pk, key)
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return _replay(cached, request_fingerprint)
+
+    try:
+        with transaction.atomic():
+            assignment = lock_assignment(survey, user, assignment_id)
+            receipt = SubmissionReceipt.objects.filter(user=user, key=key).values(
+                'fingerprint', 'total_score'
+            ).first()
+            if receipt is not None:
+                cache.set(cache_key, receipt, RECEIPT_CACHE_TIMEOUT)
+                return _replay(receipt, request_fingerprint)
+
+            total_score = submit_assignment(assignment, responses_data)
+            SubmissionReceipt.objects.create(
+                user=user,
+                key=key,
+                assignment=assignment,
+                fingerprint=request_fingerprint,
+                total_score=total_score
+            )
+            receipt = {'fingerprint': request_fingerprint, 'total_score': total_score}
+            transaction.on_commit(lambda: cache.set(cache_key, receipt, RECEIPT_CACHE_TIMEOUT))
+    except IntegrityError:
+        # The assignment lock does not cover a request with the same key for
+        # another assignment; its receipt won the race.
+        if SubmissionReceipt.objects.filter(user=user, key=key).exists():
+            raise IdempotencyConflict
+        raise
+    return total_score, False
+
+
+def prune(older_than):
+    """Delete receipts created more than ``older_than`` ago."""
+    return SubmissionReceipt.objects.filter(created_at__lt=timezone.now() - older_than).delete()[0]
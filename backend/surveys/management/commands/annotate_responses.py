@@ -0,0 +1,37 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from surveys.annotation import DEFAULT_CHUNK_SIZE, annotate, discard_stale
+
+
+class Command(BaseCommand):
+    help = 'Extract sentiment and keywords from free-text answers that have not been annotated yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--survey', type=int, help='Only annotate responses to this survey id')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Responses loaded per chunk')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of worker processes')
+        parser.add_argument('--redo-stale', action='store_true',
+                            help='First discard annotations made with an older lexicon')
+
+    def handle(self, *args, **options):
+        if options['redo_stale']:
+            self.stdout.write(f"Discarded {discard_stale()} stale annotations.")
+
+        def report(result):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{result.annotated} responses annotated")
+
+        result = annotate(
+            survey_id=options['survey'],
+            chunk_size=options['chunk_size'],
+            workers=max(options['workers'], 1),
+            progress=report
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Annotated {result.annotated} responses in {result.elapsed:.2f}s "
+            f"({result.responses_per_second:.0f} responses/s)."
+        ))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from surveys.drafts import FLUSH_INTERVAL, buffered, flush
+
+
+class Command(BaseCommand):
+    help = 'Write buffered survey draft autosaves to the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None,
+                            help=f'Keep running, flushing every this many seconds (e.g. {FLUSH_INTERVAL})')
+
+    def handle(self, *args, **options):
+        if not buffered():
+            self.stdout.write('Drafts are written through; the cache is not shared between processes.')
+            return
+        interval = options['interval']
+        while True:
+            written = flush()
+            self.stdout.write(self.style.SUCCESS(f"Flushed {written} drafts."))
+            if interval is None:
+                break
+            time.sleep(interval)
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from surveys.idempotency import prune
+
+
+class Command(BaseCommand):
+    help = 'Delete idempotency receipts of old survey submissions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7,
+                            help='Keep receipts created within this many days')
+
+    def handle(self, *args, **options):
+        deleted = prune(timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} submission receipts."))
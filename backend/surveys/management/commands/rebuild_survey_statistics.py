@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from surveys.models import Survey
+from surveys.statistics import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized survey statistics from responses and assignments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--survey', type=int, help='Only rebuild this survey id')
+
+    def handle(self, *args, **options):
+        surveys = Survey.objects.order_by('pk').values_list('pk', flat=True)
+        if options['survey']:
+            surveys = surveys.filter(pk=options['survey'])
+
+        count = 0
+        for survey_id in surveys.iterator():
+            rebuild(survey_id)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt statistics for {count} surveys."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from surveys.counters import repair
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized question and response counters of surveys.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--survey', type=int, action='append', help='Only repair these survey ids')
+
+    def handle(self, *args, **options):
+        count = repair(options['survey'])
+        self.stdout.write(self.style.SUCCESS(f"Repaired counters of {count} surveys."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from surveys.rescoring import DEFAULT_CHUNK_SIZE, rescore
+
+
+class Command(BaseCommand):
+    help = 'Recompute response scores and weighted assignment totals after scoring changes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--survey', type=int, help='Only rescore this survey id')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Assignments loaded per chunk')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would change without writing')
+
+    def handle(self, *args, **options):
+        def report(result):
+            if options['verbosity'] > 1:
+                self.stdout.write(
+                    f"{result.assignments_scanned} assignments, "
+                    f"{result.responses_scanned} responses scanned"
+                )
+
+        result = rescore(
+            survey_id=options['survey'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            progress=report
+        )
+
+        verb = 'would change' if result.dry_run else 'changed'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {result.assignments_scanned} assignments and {result.responses_scanned} responses "
+            f"in {result.elapsed:.2f}s ({result.responses_per_second:.0f} responses/s); "
+            f"{result.responses_changed} scores and {result.totals_changed} totals {verb}."
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0002_question_scoring_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_assignments', models.PositiveIntegerField(default=0)),
+                ('completed_assignments', models.PositiveIntegerField(default=0)),
+                ('score_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('score_sum_sq', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('survey', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='surveys.survey')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SurveyFactorStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('response_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('score_sum_sq', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('factor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='survey_statistics', to='surveys.factor')),
+                ('survey', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='factor_statistics', to='surveys.survey')),
+            ],
+            options={
+                'unique_together': {('survey', 'factor')},
+            },
+        ),
+    ]
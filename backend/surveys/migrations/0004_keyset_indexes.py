@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0003_survey_statistics'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='surveyassignment',
+            index=models.Index(fields=['employee', 'id'], name='surveyassign_employee_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='surveyassignment',
+            index=models.Index(fields=['survey', 'is_completed', 'id'], name='surveyassign_survey_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='surveyresponse',
+            index=models.Index(fields=['question', 'id'], name='surveyresp_question_id_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:12
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Survey = apps.get_model('surveys', 'Survey')
+    Question = apps.get_model('surveys', 'Question')
+    SurveyAssignment = apps.get_model('surveys', 'SurveyAssignment')
+
+    def count(queryset):
+        return Coalesce(
+            Subquery(
+                queryset.filter(survey=OuterRef('pk')).order_by().values('survey')
+                .annotate(count=Count('pk')).values('count'),
+                output_field=IntegerField()
+            ),
+            Value(0)
+        )
+
+    Survey.objects.update(
+        question_count=count(Question.objects.all()),
+        response_count=count(SurveyAssignment.objects.filter(is_completed=True)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='survey',
+            name='question_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='survey',
+            name='response_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0005_survey_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='survey',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
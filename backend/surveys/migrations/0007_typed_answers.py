@@ -0,0 +1,63 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:18
+
+from django.db import migrations, models
+
+from surveys.answers import TYPED_FIELDS, encode
+
+BATCH_SIZE = 2000
+
+
+def backfill_typed_answers(apps, schema_editor):
+    Question = apps.get_model('surveys', 'Question')
+    SurveyResponse = apps.get_model('surveys', 'SurveyResponse')
+
+    questions = Question.objects.filter(type__in=['RADIO', 'DROPDOWN', 'RATING', 'CHECKBOX'])
+    for question in questions.only('id', 'type', 'options'):
+        last_pk = 0
+        while True:
+            batch = list(
+                SurveyResponse.objects.filter(question_id=question.id, pk__gt=last_pk)
+                .order_by('pk').only('id', 'answer')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for response in batch:
+                response.answer_index, response.answer_number, response.answer_mask = encode(
+                    question.type, question.options, response.answer
+                )
+            SurveyResponse.objects.bulk_update(batch, TYPED_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0006_survey_content_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='answer_index',
+            field=models.SmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='answer_mask',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='answer_number',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_typed_answers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='surveyresponse',
+            index=models.Index(condition=models.Q(('answer_index__isnull', False)), fields=['question', 'answer_index'], name='surveyresp_answer_index_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='surveyresponse',
+            index=models.Index(condition=models.Q(('answer_number__isnull', False)), fields=['question', 'answer_number'], name='surveyresp_answer_number_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0007_typed_answers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='surveyresponse',
+            index=models.Index(condition=models.Q(('answer_mask__isnull', False)), fields=['question', 'answer_mask'], name='surveyresp_answer_mask_idx'),
+        ),
+    ]
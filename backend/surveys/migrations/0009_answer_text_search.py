@@ -0,0 +1,104 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:19
+
+from django.db import migrations, models
+
+from surveys.answers import text
+
+BATCH_SIZE = 2000
+
+FTS_TABLE = 'surveys_response_fts'
+RESPONSE_TABLE = 'surveys_surveyresponse'
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        answer_text, content='{RESPONSE_TABLE}', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {RESPONSE_TABLE}
+    WHEN new.answer_text IS NOT NULL BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, answer_text) VALUES (new.id, new.answer_text);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {RESPONSE_TABLE}
+    WHEN old.answer_text IS NOT NULL BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, answer_text) VALUES ('delete', old.id, old.answer_text);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF answer_text ON {RESPONSE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, answer_text)
+            SELECT 'delete', old.id, old.answer_text WHERE old.answer_text IS NOT NULL;
+        INSERT INTO {FTS_TABLE}(rowid, answer_text)
+            SELECT new.id, new.answer_text WHERE new.answer_text IS NOT NULL;
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def _gin_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Must match surveys.search.search_vector() for the index to be used.
+    return GinIndex(
+        SearchVector('answer_text', config='english'),
+        name='surveyresp_answer_text_fts',
+        condition=models.Q(answer_text__isnull=False)
+    )
+
+
+def backfill_answer_text(apps, schema_editor):
+    Question = apps.get_model('surveys', 'Question')
+    SurveyResponse = apps.get_model('surveys', 'SurveyResponse')
+
+    for question in Question.objects.filter(type__in=['TEXT', 'TEXTAREA']).only('id', 'type'):
+        last_pk = 0
+        while True:
+            batch = list(
+                SurveyResponse.objects.filter(question_id=question.id, pk__gt=last_pk)
+                .order_by('pk').only('id', 'answer')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for response in batch:
+                response.answer_text = text(question.type, response.answer)
+            SurveyResponse.objects.bulk_update(batch, ['answer_text'])
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('surveys', 'SurveyResponse'), _gin_index())
+    elif vendor == 'sqlite':
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('surveys', 'SurveyResponse'), _gin_index())
+    elif vendor == 'sqlite':
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0008_answer_mask_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveyresponse',
+            name='answer_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_answer_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
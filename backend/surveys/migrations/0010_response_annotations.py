@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0009_answer_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponseAnnotation',
+            fields=[
+                ('response', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='annotation', serialize=False, to='surveys.surveyresponse')),
+                ('sentiment', models.FloatField()),
+                ('keywords', models.JSONField(default=list)),
+                ('lexicon_version', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('factor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='response_annotations', to='surveys.factor')),
+                ('survey', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='response_annotations', to='surveys.survey')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['survey', 'factor'], name='respannot_survey_factor_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('surveys', '0011_submission_receipts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyDraft',
+            fields=[
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='draft', serialize=False, to='surveys.surveyassignment')),
+                ('answers', models.JSONField(default=dict)),
+                ('saved_at', models.DateTimeField()),
+            ],
+        ),
+    ]
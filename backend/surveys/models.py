@@ -1,7 +1,14 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from analytics.rollups import assignment_facts, record_assignments, record_difference
+from .answers import STORED_FIELDS as STORED_ANSWER_FIELDS, fill as fill_typed_answer
+from .dashboard import invalidate as invalidate_dashboard
+from .definitions import forget as forget_definitions, forget_access as forget_definition_access
+from .scoring import get_scorer
+
 User = get_user_model()
 
 
@@ -34,6 +41,21 @@ class Factor(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_type_display()})"
 
+    def _survey_ids(self):
+        return set(Question.objects.filter(factor=self).values_list('survey_id', flat=True))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Survey.bump_content_version(self._survey_ids())
+        invalidate_dashboard()
+
+    def delete(self, *args, **kwargs):
+        survey_ids = self._survey_ids()
+        result = super().delete(*args, **kwargs)
+        Survey.bump_content_version(survey_ids)
+        invalidate_dashboard()
+        return result
+
 
 class Survey(models.Model):
     """Survey model - represents a collection of questions."""
@@ -57,10 +79,47 @@ class Survey(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized counters, kept in step with questions and completed assignments
+    question_count = models.PositiveIntegerField(default=0, editable=False)
+    response_count = models.PositiveIntegerField(default=0, editable=False)
+    # Bumped on any change to the survey, its questions or their factors
+    content_version = models.PositiveIntegerField(default=0, editable=False)
     
     def __str__(self):
         return f"{self.title} ({self.get_category_display()})"
 
+    def save(self, *args, **kwargs):
+        """Bump the content version so cached definitions are re-rendered."""
+        adding = self._state.adding
+        if adding:
+            self.content_version += 1
+        else:
+            # Increment in the database; the in-memory value may be stale.
+            self.content_version = F('content_version') + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'content_version'}
+        super().save(*args, **kwargs)
+        if not adding:
+            self.refresh_from_db(fields=['content_version'])
+        forget_definitions([self.pk])
+
+    def delete(self, *args, **kwargs):
+        """Take the survey's assignments out of the rollups."""
+        with transaction.atomic():
+            before = assignment_facts(self.assignments.values_list('pk', flat=True))
+            result = super().delete(*args, **kwargs)
+            record_difference(before, {})
+        return result
+
+    @classmethod
+    def bump_content_version(cls, survey_ids):
+        """Mark the definitions of the given surveys as changed."""
+        survey_ids = sorted(set(survey_ids))
+        if survey_ids:
+            cls.objects.filter(pk__in=survey_ids).update(content_version=F('content_version') + 1)
+            forget_definitions(survey_ids)
+
 
 class Question(models.Model):
     """Question model - represents survey questions."""
@@ -95,6 +154,7 @@ class Question(models.Model):
     has_scoring = models.BooleanField(default=False)
     scoring_points = models.FloatField(default=0.0)  # Points for this question
     scoring_guide = models.JSONField(null=True, blank=True)  # Maps answers to scores
+    scoring_version = models.PositiveIntegerField(default=0, editable=False)  # Invalidates compiled scorers
     
     class Meta:
         ordering = ['order']
@@ -102,6 +162,21 @@ class Question(models.Model):
     def __str__(self):
         return f"{self.text[:50]}... ({self.get_type_display()})"
 
+    def save(self, *args, **kwargs):
+        """Bump the scoring and content versions so cached scorers and definitions are refreshed."""
+        self.scoring_version += 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'scoring_version'}
+        super().save(*args, **kwargs)
+        Survey.bump_content_version([self.survey_id])
+
+    def delete(self, *args, **kwargs):
+        survey_id = self.survey_id
+        result = super().delete(*args, **kwargs)
+        Survey.bump_content_version([survey_id])
+        return result
+
 
 class SurveyAssignment(models.Model):
     """Survey Assignment model - links surveys to employees."""
@@ -130,10 +205,32 @@ class SurveyAssignment(models.Model):
     
     class Meta:
         unique_together = ['survey', 'employee']
+        indexes = [
+            models.Index(fields=['employee', 'id'], name='surveyassign_employee_id_idx'),
+            models.Index(fields=['survey', 'is_completed', 'id'], name='surveyassign_survey_done_idx'),
+        ]
     
     def __str__(self):
         return f"{self.survey.title} - {self.employee.user.email}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            record_assignments([self])
+        invalidate_dashboard()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            before = assignment_facts([self.pk])
+            forget_definition_access(
+                self.survey_id, User.objects.filter(employee_profile__pk=self.employee_id).values_list('pk', flat=True)
+            )
+            result = super().delete(*args, **kwargs)
+            record_difference(before, {})
+        invalidate_dashboard()
+        return result
+
 
 class SurveyResponse(models.Model):
     """Survey Response model - stores employee responses to surveys."""
@@ -151,39 +248,177 @@ class SurveyResponse(models.Model):
     answer = models.JSONField()  # Flexible field to store various response types
     submitted_at = models.DateTimeField(auto_now_add=True)
     score = models.FloatField(null=True, blank=True)  # Stores calculated score for this response
+    # Typed copies of closed-form answers, see surveys.answers
+    answer_index = models.SmallIntegerField(null=True, blank=True, editable=False)
+    answer_number = models.FloatField(null=True, blank=True, editable=False)
+    answer_mask = models.BigIntegerField(null=True, blank=True, editable=False)
+    # Free-text answers, indexed for full-text search, see surveys.search
+    answer_text = models.TextField(null=True, blank=True, editable=False)
     
     class Meta:
         unique_together = ['assignment', 'question']
+        indexes = [
+            models.Index(fields=['question', 'id'], name='surveyresp_question_id_idx'),
+            models.Index(
+                fields=['question', 'answer_index'],
+                name='surveyresp_answer_index_idx',
+                condition=models.Q(answer_index__isnull=False)
+            ),
+            models.Index(
+                fields=['question', 'answer_number'],
+                name='surveyresp_answer_number_idx',
+                condition=models.Q(answer_number__isnull=False)
+            ),
+            models.Index(
+                fields=['question', 'answer_mask'],
+                name='surveyresp_answer_mask_idx',
+                condition=models.Q(answer_mask__isnull=False)
+            ),
+        ]
     
     def __str__(self):
         return f"Response to {self.question.text[:30]}..."
     
+    def save(self, *args, **kwargs):
+        """Keep the typed answer columns and annotation in step with ``answer``."""
+        fill_typed_answer(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'answer' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *STORED_ANSWER_FIELDS}
+        answer_changed = not self._state.adding and (update_fields is None or 'answer' in update_fields)
+        super().save(*args, **kwargs)
+        if answer_changed:
+            # The answer may have changed; let the annotation pipeline redo it.
+            ResponseAnnotation.objects.filter(response_id=self.pk).delete()
+        invalidate_dashboard()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_dashboard()
+        return result
+    
     def calculate_score(self):
         """Calculate the score based on the question's scoring guide."""
-        if not self.question.has_scoring or not self.question.scoring_guide:
-            return None
-        
-        if self.question.type in ('RADIO', 'DROPDOWN'):
-            # For single-choice questions
-            answer_value = self.answer.get('value')
-            return self.question.scoring_guide.get(str(answer_value))
-        
-        elif self.question.type == 'RATING':
-            # For rating questions, the value is the score
-            rating_value = self.answer.get('value')
-            try:
-                return float(rating_value)
-            except (ValueError, TypeError):
-                return None
-        
-        elif self.question.type == 'CHECKBOX':
-            # For multi-choice questions, sum the values of selected options
-            selected_values = self.answer.get('values', [])
-            total = 0
-            for value in selected_values:
-                score = self.question.scoring_guide.get(str(value))
-                if score is not None:
-                    total += score
-            return total
-        
-        return None
\ No newline at end of file
+        return get_scorer(self.question).score(self.answer)
+
+
+class SurveyStatistics(models.Model):
+    """Running totals behind the survey statistics endpoint."""
+    
+    survey = models.OneToOneField(
+        Survey, 
+        on_delete=models.CASCADE, 
+        related_name='statistics'
+    )
+    total_assignments = models.PositiveIntegerField(default=0)
+    completed_assignments = models.PositiveIntegerField(default=0)
+    # Totals of completed assignments that have a total_score
+    score_count = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    score_sum_sq = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Statistics for {self.survey_id}"
+
+
+class SurveyFactorStatistics(models.Model):
+    """Running totals of scored responses per factor within a survey."""
+    
+    survey = models.ForeignKey(
+        Survey, 
+        on_delete=models.CASCADE, 
+        related_name='factor_statistics'
+    )
+    factor = models.ForeignKey(
+        Factor, 
+        on_delete=models.CASCADE, 
+        related_name='survey_statistics'
+    )
+    response_count = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    score_sum_sq = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['survey', 'factor']
+    
+    def __str__(self):
+        return f"Statistics for {self.survey_id} / {self.factor_id}"
+
+
+class ResponseAnnotation(models.Model):
+    """Sentiment and keywords extracted offline from a free-text response."""
+    
+    response = models.OneToOneField(
+        SurveyResponse, 
+        on_delete=models.CASCADE, 
+        primary_key=True, 
+        related_name='annotation'
+    )
+    # Denormalized from the response so per-survey aggregates need no joins
+    survey = models.ForeignKey(
+        Survey, 
+        on_delete=models.CASCADE, 
+        related_name='response_annotations'
+    )
+    factor = models.ForeignKey(
+        Factor, 
+        on_delete=models.SET_NULL, 
+        null=True, 
+        blank=True, 
+        related_name='response_annotations'
+    )
+    sentiment = models.FloatField()  # From -1 (negative) to 1 (positive)
+    keywords = models.JSONField(default=list)
+    lexicon_version = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['survey', 'factor'], name='respannot_survey_factor_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Annotation of {self.response_id}"
+
+
+class SubmissionReceipt(models.Model):
+    """Result of a submission made with an ``Idempotency-Key``, for replays."""
+    
+    user = models.ForeignKey(
+        User, 
+        on_delete=models.CASCADE, 
+        related_name='submission_receipts'
+    )
+    key = models.CharField(max_length=255)
+    assignment = models.ForeignKey(
+        SurveyAssignment, 
+        on_delete=models.CASCADE, 
+        related_name='submission_receipts'
+    )
+    fingerprint = models.CharField(max_length=64)  # SHA-256 of the request payload
+    total_score = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        unique_together = ['user', 'key']
+    
+    def __str__(self):
+        return f"Receipt {self.key} for {self.assignment_id}"
+
+
+class SurveyDraft(models.Model):
+    """Answers saved while a survey is in progress, keyed by question id."""
+    
+    assignment = models.OneToOneField(
+        SurveyAssignment, 
+        on_delete=models.CASCADE, 
+        primary_key=True, 
+        related_name='draft'
+    )
+    answers = models.JSONField(default=dict)
+    saved_at = models.DateTimeField()  # Time of the last autosave, not of the flush
+    
+    def __str__(self):
+        return f"Draft of {self.assignment_id}"
@@ -0,0 +1,182 @@
+"""
+Bulk rescoring of stored survey responses.
+
+Used after a factor weight or a scoring guide changes. Completed assignments
+are streamed in primary-key chunks; for each chunk the responses are scored
+with the compiled scorers, weighted totals are summed with NumPy and only the
+rows whose values actually changed are written back with ``bulk_update``.
+Employees with a changed response score get their ``risk_scored_at`` cleared
+so the next incremental risk run scores them again.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from django.db import transaction
+
+from analytics.rollups import rebuild as rebuild_rollups
+from users.models import Employee
+from .dashboard import invalidate as invalidate_dashboard
+from .models import Question, SurveyAssignment, SurveyResponse
+from .scoring import get_scorer
+from .statistics import rebuild as rebuild_statistics
+
+DEFAULT_CHUNK_SIZE = 1000
+WRITE_BATCH_SIZE = 1000
+
+
+@dataclass
+class RescoreResult:
+    """Counters reported by a rescoring run."""
+
+    dry_run: bool = False
+    assignments_scanned: int = 0
+    responses_scanned: int = 0
+    responses_changed: int = 0
+    totals_changed: int = 0
+    elapsed: float = 0.0
+    surveys_changed: set = field(default_factory=set, repr=False)
+
+    @property
+    def responses_per_second(self):
+        return self.responses_scanned / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'dry_run': self.dry_run,
+            'assignments_scanned': self.assignments_scanned,
+            'responses_scanned': self.responses_scanned,
+            'responses_changed': self.responses_changed,
+            'totals_changed': self.totals_changed,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'responses_per_second': round(self.responses_per_second, 1),
+        }
+
+
+def _as_array(values):
+    """Convert a list of optional floats to a float array with NaN for None."""
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def _rescore_chunk(assignment_rows, questions, survey_id, result):
+    assignment_ids = np.array([row[0] for row in assignment_rows], dtype=np.int64)
+    old_totals = _as_array([row[1] for row in assignment_rows])
+    survey_ids = [row[2] for row in assignment_rows]
+
+    responses = SurveyResponse.objects.filter(
+        assignment__gte=int(assignment_ids[0]),
+        assignment__lte=int(assignment_ids[-1]),
+        assignment__is_completed=True
+    )
+    if survey_id is not None:
+        responses = responses.filter(assignment__survey_id=survey_id)
+    rows = list(responses.values_list('id', 'assignment_id', 'question_id', 'answer', 'score'))
+
+    result.assignments_scanned += len(assignment_rows)
+    result.responses_scanned += len(rows)
+    if not rows:
+        new_totals = np.zeros(len(assignment_rows))
+    else:
+        old_scores = _as_array([row[4] for row in rows])
+        new_scores = old_scores.copy()
+        weights = np.zeros(len(rows))
+
+        by_question = {}
+        for position, row in enumerate(rows):
+            by_question.setdefault(row[2], []).append(position)
+
+        for question_id, positions in by_question.items():
+            question = questions.get(question_id)
+            if question is None or not question.has_scoring:
+                # Stored scores of unscored questions are kept but not totalled.
+                continue
+            weights[positions] = question.factor.weight if question.factor_id else 1.0
+            scorer = get_scorer(question)
+            if scorer.is_automatic:
+                new_scores[positions] = _as_array(scorer.score_many([rows[p][3] for p in positions]))
+
+        changed = ~np.isclose(old_scores, new_scores, equal_nan=True)
+        changed_positions = np.flatnonzero(changed)
+        result.responses_changed += len(changed_positions)
+
+        weighted = np.where(np.isnan(new_scores), 0.0, new_scores) * weights
+        owner = np.searchsorted(assignment_ids, [row[1] for row in rows])
+        new_totals = np.bincount(owner, weights=weighted, minlength=len(assignment_ids))
+
+    totals_changed = np.flatnonzero(~np.isclose(old_totals, new_totals, equal_nan=True))
+    result.totals_changed += len(totals_changed)
+    if rows:
+        result.surveys_changed.update(survey_ids[i] for i in owner[changed_positions])
+    result.surveys_changed.update(survey_ids[i] for i in totals_changed)
+
+    if result.dry_run:
+        return
+
+    with transaction.atomic():
+        if rows and len(changed_positions):
+            SurveyResponse.objects.bulk_update(
+                [
+                    SurveyResponse(
+                        pk=rows[p][0],
+                        score=None if np.isnan(new_scores[p]) else float(new_scores[p])
+                    )
+                    for p in changed_positions
+                ],
+                ['score'],
+                batch_size=WRITE_BATCH_SIZE
+            )
+            regraded = sorted({rows[p][1] for p in changed_positions})
+            Employee.objects.filter(survey_assignments__in=regraded).update(risk_scored_at=None)
+        if len(totals_changed):
+            SurveyAssignment.objects.bulk_update(
+                [
+                    SurveyAssignment(pk=int(assignment_ids[i]), total_score=float(new_totals[i]))
+                    for i in totals_changed
+                ],
+                ['total_score'],
+                batch_size=WRITE_BATCH_SIZE
+            )
+        invalidate_dashboard()
+
+
+def rescore(survey_id=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, progress=None):
+    """
+    Recompute response scores and assignment totals of completed assignments.
+
+    With ``dry_run`` nothing is written; the result still reports how many
+    scores and totals would change. Statistics of surveys with changes, and
+    score rollups if any score changed, are rebuilt at the end. ``progress``
+    is called with the result after every chunk.
+    """
+    result = RescoreResult(dry_run=dry_run)
+    started = time.perf_counter()
+
+    questions = Question.objects.select_related('factor')
+    assignments = SurveyAssignment.objects.filter(is_completed=True)
+    if survey_id is not None:
+        questions = questions.filter(survey_id=survey_id)
+        assignments = assignments.filter(survey_id=survey_id)
+    questions = {question.id: question for question in questions}
+
+    last_pk = 0
+    while True:
+        chunk = list(
+            assignments.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'total_score', 'survey_id')[:chunk_size]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1][0]
+        _rescore_chunk(chunk, questions, survey_id, result)
+        result.elapsed = time.perf_counter() - started
+        if progress is not None:
+            progress(result)
+
+    if not dry_run:
+        for changed_survey_id in sorted(result.surveys_changed):
+            rebuild_statistics(changed_survey_id)
+        if result.responses_changed:
+            rebuild_rollups(['score_sum', 'score_count'])
+
+    result.elapsed = time.perf_counter() - started
+    return result
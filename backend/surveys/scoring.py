@@ -0,0 +1,179 @@
+"""
+Compiled answer scoring.
+
+Each question's scoring guide is compiled once into an immutable lookup and
+kept in a process-wide registry keyed by question id. A compiled scorer is
+reused until the question's ``scoring_version`` changes, which happens on
+every ``Question.save()``.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from types import MappingProxyType
+
+# Maximum number of compiled scorers kept per process.
+REGISTRY_SIZE = 4096
+
+_registry = OrderedDict()
+_registry_lock = Lock()
+
+
+def single_value(answer):
+    """Extract the selected value from ``{'value': x}`` or a bare value."""
+    if isinstance(answer, dict):
+        return answer.get('value')
+    return answer
+
+
+def multi_values(answer):
+    """Extract the selected values from ``{'values': [...]}`` or a bare list."""
+    if isinstance(answer, dict):
+        answer = answer.get('values', [])
+    if isinstance(answer, (list, tuple)):
+        return answer
+    return ()
+
+
+def _compile_guide(scoring_guide):
+    """
+    Freeze a scoring guide into a read-only lookup.
+
+    Keys are stored as strings, and keys that are canonical integer literals
+    (``'1'``, ``'-2'``, not ``'01'``) are also stored as ints so integer
+    answers do not have to be converted with ``str()``.
+    """
+    lookup = {}
+    for key, points in scoring_guide.items():
+        if points is None:
+            continue
+        key = str(key)
+        lookup[key] = points
+        try:
+            number = int(key)
+        except ValueError:
+            continue
+        if str(number) == key:
+            lookup[number] = points
+    return MappingProxyType(lookup)
+
+
+class CompiledScorer:
+    """Scores answers to a single question using a precompiled scoring guide."""
+
+    __slots__ = ('question_id', 'version', 'kind', 'lookup')
+
+    # Scorer kinds
+    NONE = 'NONE'
+    CHOICE = 'CHOICE'
+    MULTI = 'MULTI'
+    RATING = 'RATING'
+    MANUAL = 'MANUAL'
+
+    def __init__(self, question_id, version, kind, lookup=None):
+        self.question_id = question_id
+        self.version = version
+        self.kind = kind
+        self.lookup = lookup
+
+    @classmethod
+    def compile(cls, question):
+        version = question.scoring_version
+        if not question.has_scoring or not question.scoring_guide:
+            return cls(question.id, version, cls.NONE)
+        if question.type in ('RADIO', 'DROPDOWN'):
+            return cls(question.id, version, cls.CHOICE, _compile_guide(question.scoring_guide))
+        if question.type == 'CHECKBOX':
+            return cls(question.id, version, cls.MULTI, _compile_guide(question.scoring_guide))
+        if question.type == 'RATING':
+            return cls(question.id, version, cls.RATING)
+        return cls(question.id, version, cls.MANUAL)
+
+    @property
+    def is_automatic(self):
+        """
+        Whether stored scores for this question can be recomputed from answers.
+
+        Questions without a scoring guide are graded by hand, like ``MANUAL``.
+        """
+        return self.kind not in (self.NONE, self.MANUAL)
+
+    def _lookup(self, value):
+        points = self.lookup.get(value) if isinstance(value, (str, int)) else None
+        if points is None and value is not None and not isinstance(value, str):
+            points = self.lookup.get(str(value))
+        return points
+
+    def score(self, answer):
+        """Return the score for one answer, or ``None`` if it cannot be scored."""
+        kind = self.kind
+        if kind == self.CHOICE:
+            return self._lookup(single_value(answer))
+        if kind == self.MULTI:
+            total = 0
+            for value in multi_values(answer):
+                points = self._lookup(value)
+                if points is not None:
+                    total += points
+            return total
+        if kind == self.RATING:
+            try:
+                return float(single_value(answer))
+            except (ValueError, TypeError):
+                return None
+        return None
+
+    def score_many(self, answers):
+        """Score a sequence of answers to this question."""
+        if self.kind in (self.NONE, self.MANUAL):
+            return [None] * len(answers)
+        score = self.score
+        return [score(answer) for answer in answers]
+
+
+def get_scorer(question):
+    """Return the compiled scorer for ``question``, compiling it if stale."""
+    key = question.id
+    with _registry_lock:
+        scorer = _registry.get(key)
+        if scorer is not None and scorer.version == question.scoring_version:
+            _registry.move_to_end(key)
+            return scorer
+
+    scorer = CompiledScorer.compile(question)
+    if key is not None:
+        with _registry_lock:
+            _registry[key] = scorer
+            _registry.move_to_end(key)
+            while len(_registry) > REGISTRY_SIZE:
+                _registry.popitem(last=False)
+    return scorer
+
+
+def invalidate(question_id):
+    """Drop the compiled scorer of a question from this process."""
+    with _registry_lock:
+        _registry.pop(question_id, None)
+
+
+def score_responses(responses):
+    """
+    Score many unsaved or loaded responses in place.
+
+    ``response.question`` must already be loaded. Responses to questions
+    without scoring get ``score = None``; responses are grouped per question
+    so each scorer is looked up once.
+    """
+    by_question = {}
+    for response in responses:
+        by_question.setdefault(response.question_id, []).append(response)
+
+    for group in by_question.values():
+        question = group[0].question
+        if not question.has_scoring:
+            for response in group:
+                response.score = None
+            continue
+        scores = get_scorer(question).score_many([response.answer for response in group])
+        for response, score in zip(group, scores):
+            response.score = score
+    return responses
@@ -0,0 +1,96 @@
+"""
+Full-text search over free-text answers.
+
+Searches ``SurveyResponse.answer_text``. On PostgreSQL this uses a
+``tsvector`` expression with a GIN index; on SQLite it uses the FTS5 table
+``surveys_response_fts``, kept in step with the responses table by
+triggers. Both indexes are created by migration ``0009_answer_text_search``
+and are maintained by the database on every insert and update, so submits
+need no extra work. Other databases fall back to a case-insensitive
+substring match.
+
+Excerpts are HTML-escaped in the query, so only the highlight tags are markup.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import F, TextField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Replace
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'surveys_response_fts'
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+# Placeholders for the highlight tags while the excerpt is escaped.
+_START = '\x02'
+_STOP = '\x03'
+
+# Same replacements as django.utils.html.escape, '&' first.
+_ESCAPES = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ("'", '&#x27;'))
+
+
+def _highlighted(excerpt):
+    """HTML-escape an excerpt marked with placeholders, then add the tags."""
+    replacements = (*_ESCAPES, (_START, HIGHLIGHT_START), (_STOP, HIGHLIGHT_STOP))
+    for old, new in replacements:
+        excerpt = Replace(excerpt, Value(old), Value(new), output_field=TextField())
+    return excerpt
+
+
+def search_vector():
+    """The indexed ``tsvector`` expression (PostgreSQL only)."""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('answer_text', config=SEARCH_CONFIG)
+
+
+def _postgresql(queryset, query):
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.annotate(document=search_vector()).filter(document=search_query).annotate(
+        rank=SearchRank(search_vector(), search_query),
+        highlight=_highlighted(SearchHeadline(
+            'answer_text', search_query, config=SEARCH_CONFIG, start_sel=_START, stop_sel=_STOP
+        )),
+    )
+
+
+def _sqlite(queryset, query):
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return queryset.annotate(rank=Value(0.0), highlight=F('answer_text')).none()
+    # Quote every term so user input cannot use FTS5 query syntax.
+    match = ' '.join(f'"{term}"' for term in terms)
+    table = queryset.model._meta.db_table
+    matching = f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = "{table}"."id"'
+    return queryset.filter(
+        pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+    ).annotate(
+        # bm25() is lower for better matches
+        rank=RawSQL(f'SELECT -bm25({FTS_TABLE}) {matching}', [match]),
+        highlight=_highlighted(RawSQL(
+            f'SELECT snippet({FTS_TABLE}, 0, %s, %s, %s, 32) {matching}',
+            [_START, _STOP, '…', match], output_field=TextField()
+        )),
+    )
+
+
+def search(queryset, query):
+    """
+    Filter ``queryset`` to responses whose text matches ``query``.
+
+    Matches are annotated with ``rank`` (higher is better) and ``highlight``,
+    an HTML-escaped excerpt with matched terms wrapped in ``<mark>`` tags.
+    """
+    queryset = queryset.filter(answer_text__isnull=False)
+    if connection.vendor == 'postgresql':
+        return _postgresql(queryset, query)
+    if connection.vendor == 'sqlite':
+        return _sqlite(queryset, query)
+    return queryset.filter(answer_text__icontains=query).annotate(
+        rank=Value(1.0), highlight=_highlighted(F('answer_text'))
+    )
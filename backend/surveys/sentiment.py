@@ -0,0 +1,108 @@
+"""
+Lexicon-based sentiment and keyword extraction for free-text answers.
+
+Pure Python with no Django imports, so it can run in spawned worker
+processes without setting up Django. Scores are in ``[-1, 1]``: each
+sentiment word contributes its valence, flipped by a preceding negation and
+scaled by a preceding intensifier, and the sum is squashed with
+``s / sqrt(s * s + NORMALIZATION)``.
+
+Bump ``LEXICON_VERSION`` whenever the word lists change so stored
+annotations can be recomputed.
+"""
+
+import math
+import re
+
+LEXICON_VERSION = 1
+
+NORMALIZATION = 15.0
+
+# Words scanned back from a sentiment word for negations and intensifiers.
+WINDOW = 3
+
+POSITIVE = {
+    'good': 1.0, 'great': 1.5, 'excellent': 2.0, 'amazing': 2.0, 'awesome': 2.0,
+    'happy': 1.5, 'satisfied': 1.5, 'enjoy': 1.2, 'enjoying': 1.2, 'love': 2.0,
+    'like': 0.8, 'nice': 1.0, 'helpful': 1.2, 'supportive': 1.5, 'support': 0.8,
+    'fair': 1.0, 'friendly': 1.2, 'flexible': 1.2, 'appreciated': 1.5,
+    'appreciate': 1.2, 'valued': 1.5, 'rewarding': 1.5, 'motivated': 1.2,
+    'growth': 1.0, 'opportunity': 1.0, 'opportunities': 1.0, 'stable': 1.0,
+    'recommend': 1.2, 'comfortable': 1.0, 'proud': 1.5, 'respect': 1.0,
+    'respected': 1.2, 'clear': 0.6, 'well': 0.5, 'best': 1.5, 'better': 0.8,
+}
+
+NEGATIVE = {
+    'bad': -1.0, 'poor': -1.2, 'terrible': -2.0, 'awful': -2.0, 'horrible': -2.0,
+    'unhappy': -1.5, 'dissatisfied': -1.5, 'hate': -2.0, 'frustrated': -1.5,
+    'frustrating': -1.5, 'stress': -1.2, 'stressed': -1.5, 'stressful': -1.5,
+    'burnout': -2.0, 'exhausted': -1.5, 'tired': -1.0, 'overworked': -1.8,
+    'underpaid': -1.8, 'unfair': -1.5, 'toxic': -2.0, 'ignored': -1.5,
+    'unappreciated': -1.8, 'undervalued': -1.8, 'low': -0.8, 'lack': -1.0,
+    'lacking': -1.0, 'difficult': -0.8, 'hard': -0.5,
+    'worse': -1.2, 'worst': -1.8, 'quit': -1.5, 'leave': -0.8, 'leaving': -1.0,
+    'resign': -1.8, 'problem': -0.8, 'problems': -0.8, 'issue': -0.6,
+    'issues': -0.6, 'late': -0.6, 'micromanage': -1.5, 'micromanagement': -1.5,
+    'boring': -1.0, 'unclear': -0.8, 'disorganized': -1.2,
+}
+
+NEGATIONS = {
+    'not', 'no', 'never', 'nor', "don't", 'dont', "doesn't", 'doesnt', "isn't",
+    'isnt', "wasn't", 'wasnt', "aren't", 'arent', "can't", 'cant', 'cannot',
+    "won't", 'wont', 'without', 'hardly', 'barely',
+}
+
+INTENSIFIERS = {
+    'very': 1.5, 'really': 1.4, 'extremely': 1.8, 'so': 1.3, 'too': 1.3,
+    'quite': 1.2, 'highly': 1.5, 'totally': 1.5, 'completely': 1.6,
+    'slightly': 0.6, 'somewhat': 0.7, 'bit': 0.7,
+}
+
+# Topic keywords associated with turnover, grouped under a canonical term.
+KEYWORDS = {
+    'salary': {'salary', 'salaries', 'pay', 'paid', 'underpaid', 'wage', 'wages', 'compensation', 'bonus'},
+    'manager': {'manager', 'managers', 'management', 'supervisor', 'boss', 'lead', 'micromanage', 'micromanagement'},
+    'workload': {'workload', 'overtime', 'overworked', 'hours', 'deadline', 'deadlines', 'understaffed'},
+    'career': {'career', 'promotion', 'promotions', 'growth', 'development', 'training', 'advancement'},
+    'wellbeing': {'stress', 'stressed', 'stressful', 'burnout', 'exhausted', 'tired', 'health'},
+    'culture': {'culture', 'toxic', 'team', 'colleagues', 'coworkers', 'respect', 'environment'},
+    'benefits': {'benefits', 'insurance', 'leave', 'vacation', 'holidays', 'allowance'},
+    'exit': {'quit', 'quitting', 'resign', 'resigning', 'leaving', 'elsewhere', 'offer'},
+}
+
+_KEYWORD_LOOKUP = {word: topic for topic, words in KEYWORDS.items() for word in words}
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def analyze(text):
+    """Return ``(sentiment, keywords)`` for a piece of text."""
+    tokens = tokenize(text or '')
+    total = 0.0
+    keywords = set()
+
+    for position, token in enumerate(tokens):
+        topic = _KEYWORD_LOOKUP.get(token)
+        if topic is not None:
+            keywords.add(topic)
+
+        valence = POSITIVE.get(token) or NEGATIVE.get(token)
+        if valence is None:
+            continue
+        for previous in tokens[max(position - WINDOW, 0):position]:
+            if previous in NEGATIONS:
+                valence = -valence * 0.75
+            valence *= INTENSIFIERS.get(previous, 1.0)
+        total += valence
+
+    sentiment = total / math.sqrt(total * total + NORMALIZATION) if total else 0.0
+    return round(sentiment, 4), sorted(keywords)
+
+
+def analyze_batch(items):
+    """Analyze ``[(response_id, text), ...]``; used by worker processes."""
+    return [(response_id, *analyze(text)) for response_id, text in items]
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from surveys.models import Factor, Survey, Question, SurveyAssignment, SurveyResponse
 from users.serializers import UserSerializer
+from surveys.authoring import BULK_MAX_QUESTIONS
+from surveys.drafts import MAX_ANSWERS as MAX_DRAFT_ANSWERS
+from surveys.submission import BATCH_MAX_ITEMS
 
 
 
@@ -26,10 +29,52 @@ class QuestionSerializer(serializers.ModelSerializer):
         ]
 
 
+class QuestionItemSerializer(QuestionSerializer):
+    """A question inside a bulk request; the survey is given once per request."""
+
+    class Meta(QuestionSerializer.Meta):
+        fields = [name for name in QuestionSerializer.Meta.fields if name != 'survey']
+
+
+class BulkQuestionCreateSerializer(serializers.Serializer):
+    survey = serializers.PrimaryKeyRelatedField(queryset=Survey.objects.all())
+    questions = QuestionItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_QUESTIONS)
+
+
+class BulkQuestionUpdateSerializer(serializers.Serializer):
+    """Partial updates keyed by question id; each item is validated separately."""
+
+    questions = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=BULK_MAX_QUESTIONS
+    )
+
+    def validate_questions(self, value):
+        if not all(isinstance(item.get('id'), int) for item in value):
+            raise serializers.ValidationError("Every item needs an integer id")
+        if len({item['id'] for item in value}) != len(value):
+            raise serializers.ValidationError("Question ids must be unique")
+        return value
+
+
+class QuestionReorderSerializer(serializers.Serializer):
+    survey = serializers.PrimaryKeyRelatedField(queryset=Survey.objects.all())
+    question_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate(self, data):
+        current = set(data['survey'].questions.values_list('id', flat=True))
+        if len(data['question_ids']) != len(current) or set(data['question_ids']) != current:
+            raise serializers.ValidationError(
+                {'question_ids': "Must list every question of the survey exactly once"}
+            )
+        return data
+
+
+class SurveyCloneSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=200, required=False, allow_blank=False)
+
+
 class SurveySerializer(serializers.ModelSerializer):
-    response_count = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
-    question_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Survey
@@ -38,25 +83,23 @@ class SurveySerializer(serializers.ModelSerializer):
             'created_by_name', 'is_active', 'created_at', 'updated_at',
             'question_count', 'response_count'
         ]
-        read_only_fields = ['created_by', 'created_at', 'updated_at', 'response_count']
+        read_only_fields = ['created_by', 'created_at', 'updated_at', 'question_count', 'response_count']
 
     def get_created_by_name(self, obj):
         if obj.created_by:
             return f"{obj.created_by.first_name} {obj.created_by.last_name}"
         return ""
 
-    def get_question_count(self, obj):
-        return obj.questions.count()
-
-    def get_response_count(self, obj):
-        return obj.assignments.filter(is_completed=True).count()
-
 
 class SurveyWithQuestionsSerializer(SurveySerializer):
     questions = QuestionSerializer(many=True, read_only=True)
 
     class Meta(SurveySerializer.Meta):
-        fields = SurveySerializer.Meta.fields + ['questions']
+        # The definition is cached per content version, so it leaves out the
+        # response counter that changes with every submission.
+        fields = [name for name in SurveySerializer.Meta.fields if name != 'response_count'] + [
+            'content_version', 'questions'
+        ]
 
 
 class SurveyAssignmentSerializer(serializers.ModelSerializer):
@@ -125,6 +168,50 @@ class SurveySubmissionSerializer(serializers.Serializer):
     responses = ResponseSubmissionSerializer(many=True)
 
 
+class SurveyDraftSerializer(serializers.Serializer):
+    """Partial answers keyed by question id, merged into the saved draft."""
+
+    answers = serializers.DictField(child=serializers.JSONField(), allow_empty=True)
+
+    def validate_answers(self, value):
+        if len(value) > MAX_DRAFT_ANSWERS:
+            raise serializers.ValidationError(f"At most {MAX_DRAFT_ANSWERS} answers per draft")
+        if not all(str(key).isdigit() for key in value):
+            raise serializers.ValidationError("Keys must be question ids")
+        return value
+
+
+class BatchSubmissionSerializer(serializers.Serializer):
+    """Completed assignments uploaded together, e.g. by an offline kiosk."""
+
+    submissions = SurveySubmissionSerializer(many=True, allow_empty=False, max_length=BATCH_MAX_ITEMS)
+
+
+class BulkSurveyAssignmentSerializer(serializers.Serializer):
+    """Targets for assigning a survey to many employees at once."""
+
+    employee_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    department_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    all_active = serializers.BooleanField(required=False, default=False)
+    due_date = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, data):
+        if not (data['employee_ids'] or data['department_ids'] or data['all_active']):
+            raise serializers.ValidationError(
+                "Provide employee_ids, department_ids or all_active"
+            )
+        return data
+
+
+class ResponseScoreSerializer(serializers.Serializer):
+    response_id = serializers.IntegerField()
+    score = serializers.FloatField()
+
+
+class BulkScoreSerializer(serializers.Serializer):
+    scores = ResponseScoreSerializer(many=True, allow_empty=False)
+
+
 class SurveyResponseDetailSerializer(serializers.ModelSerializer):
     question_text = serializers.CharField(source='question.text', read_only=True)
     question_id = serializers.IntegerField(source='question.id', read_only=True)
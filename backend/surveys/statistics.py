@@ -0,0 +1,154 @@
+"""
+Incrementally maintained survey statistics.
+
+``SurveyStatistics`` and ``SurveyFactorStatistics`` keep running counts, sums
+and sums of squares so the statistics endpoint reads a handful of rows instead
+of aggregating over every response. Write paths report what they changed as
+``StatisticsDelta`` objects; ``rebuild`` recomputes everything from scratch
+for repair. Write paths that complete or remove assignments also adjust
+``Survey.response_count`` themselves, see ``surveys.counters``.
+"""
+
+import math
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import SurveyAssignment, SurveyFactorStatistics, SurveyResponse, SurveyStatistics
+
+
+class StatisticsDelta:
+    """Accumulates changes to the statistics of one survey."""
+
+    def __init__(self, survey_id):
+        self.survey_id = survey_id
+        self.survey = {
+            'total_assignments': 0,
+            'completed_assignments': 0,
+            'score_count': 0,
+            'score_sum': 0.0,
+            'score_sum_sq': 0.0,
+        }
+        self.factors = {}
+
+    def _score(self, values, sign, value, count_field):
+        if value is None:
+            return
+        values[count_field] += sign
+        values['score_sum'] += sign * value
+        values['score_sum_sq'] += sign * value * value
+
+    def assignment(self, sign, is_completed, total_score):
+        """Add (``sign=1``) or remove (``sign=-1``) an assignment's state."""
+        self.survey['total_assignments'] += sign
+        if is_completed:
+            self.survey['completed_assignments'] += sign
+            self._score(self.survey, sign, total_score, 'score_count')
+
+    def assignments_added(self, count):
+        """Add ``count`` new, not yet completed assignments."""
+        self.survey['total_assignments'] += count
+
+    def assignment_changed(self, old_completed, old_total, new_completed, new_total):
+        self.assignment(-1, old_completed, old_total)
+        self.assignment(1, new_completed, new_total)
+
+    def response(self, sign, factor_id, score):
+        """Add or remove one response score for a factor."""
+        if factor_id is None or score is None:
+            return
+        values = self.factors.setdefault(
+            factor_id, {'response_count': 0, 'score_sum': 0.0, 'score_sum_sq': 0.0}
+        )
+        self._score(values, sign, score, 'response_count')
+
+    def response_changed(self, factor_id, old_score, new_score):
+        self.response(-1, factor_id, old_score)
+        self.response(1, factor_id, new_score)
+
+    @property
+    def completed(self):
+        """Net change in completed assignments, for ``Survey.response_count``."""
+        return self.survey['completed_assignments']
+
+    def merge(self, other):
+        """Add the changes collected in ``other`` for the same survey."""
+        for name, value in other.survey.items():
+            self.survey[name] += value
+        for factor_id, values in other.factors.items():
+            mine = self.factors.setdefault(
+                factor_id, {'response_count': 0, 'score_sum': 0.0, 'score_sum_sq': 0.0}
+            )
+            for name, value in values.items():
+                mine[name] += value
+
+    def apply(self):
+        """Write the accumulated deltas with atomic ``F()`` updates."""
+        with transaction.atomic():
+            changes = {name: value for name, value in self.survey.items() if value}
+            if changes and not SurveyStatistics.objects.filter(survey_id=self.survey_id).update(
+                **{name: F(name) + value for name, value in changes.items()}
+            ):
+                # No row yet: build it from scratch so it includes this change.
+                rebuild(self.survey_id)
+                return
+
+            for factor_id, values in self.factors.items():
+                changes = {name: value for name, value in values.items() if value}
+                if not changes:
+                    continue
+                updated = SurveyFactorStatistics.objects.filter(
+                    survey_id=self.survey_id, factor_id=factor_id
+                ).update(**{name: F(name) + value for name, value in changes.items()})
+                if not updated:
+                    SurveyFactorStatistics.objects.get_or_create(
+                        survey_id=self.survey_id, factor_id=factor_id, defaults=values
+                    )
+
+
+def rebuild(survey_id):
+    """Recompute the statistics rows of a survey from the source tables."""
+    completed = Q(is_completed=True)
+    scored = Q(is_completed=True, total_score__isnull=False)
+    totals = SurveyAssignment.objects.filter(survey_id=survey_id).aggregate(
+        total_assignments=Count('id'),
+        completed_assignments=Count('id', filter=completed),
+        score_count=Count('id', filter=scored),
+        score_sum=Sum('total_score', filter=scored),
+        score_sum_sq=Sum(F('total_score') * F('total_score'), filter=scored),
+    )
+    factor_rows = SurveyResponse.objects.filter(
+        question__survey_id=survey_id,
+        question__factor__isnull=False,
+        score__isnull=False
+    ).values('question__factor_id').annotate(
+        response_count=Count('id'),
+        score_sum=Sum('score'),
+        score_sum_sq=Sum(F('score') * F('score')),
+    )
+
+    with transaction.atomic():
+        SurveyStatistics.objects.update_or_create(
+            survey_id=survey_id,
+            defaults={name: value or 0 for name, value in totals.items()}
+        )
+        SurveyFactorStatistics.objects.filter(survey_id=survey_id).delete()
+        SurveyFactorStatistics.objects.bulk_create([
+            SurveyFactorStatistics(
+                survey_id=survey_id,
+                factor_id=row['question__factor_id'],
+                response_count=row['response_count'],
+                score_sum=row['score_sum'],
+                score_sum_sq=row['score_sum_sq'],
+            )
+            for row in factor_rows
+        ])
+
+
+def summarize(count, total, total_sq):
+    """Return ``(mean, standard deviation)`` from running sums."""
+    if not count:
+        return None, None
+    mean = total / count
+    variance = max(total_sq / count - mean * mean, 0.0)
+    return mean, math.sqrt(variance)
@@ -0,0 +1,252 @@
+"""
+Set-based survey submission.
+
+A submission loads every question of the survey (with its factor) in one
+query, scores the answers in memory and writes all responses with a single
+bulk upsert, so the number of queries no longer grows with the number of
+questions.
+"""
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from analytics.rollups import RollupDelta
+from .answers import STORED_FIELDS, fill as fill_typed_answer
+from .counters import adjust as adjust_counters
+from .drafts import promote as promote_draft
+from .models import Question, ResponseAnnotation, SurveyAssignment, SurveyResponse
+from .scoring import score_responses
+from .statistics import StatisticsDelta
+
+# Upper bound on rows per INSERT statement for very long surveys.
+UPSERT_BATCH_SIZE = 500
+
+# Most assignments accepted in one batch submission.
+BATCH_MAX_ITEMS = 500
+
+
+def load_questions(survey_id):
+    """Return ``{question_id: question}`` for a survey, with factors joined."""
+    return {
+        question.id: question
+        for question in Question.objects.filter(survey_id=survey_id).select_related('factor')
+    }
+
+
+def weighted_score(score, question):
+    """Apply the question's factor weight to a score (unweighted if no factor)."""
+    if score is None:
+        return None
+    if question.factor_id:
+        return score * question.factor.weight
+    return score
+
+
+def build_responses(assignment, responses_data, questions):
+    """
+    Build unsaved, scored ``SurveyResponse`` objects for a submission.
+
+    Answers for questions outside ``questions`` are ignored, and when the same
+    question is answered twice the last answer wins.
+    """
+    by_question = {}
+    for item in responses_data:
+        question = questions.get(item.get('question_id'))
+        if question is None:
+            continue
+        by_question[question.id] = fill_typed_answer(SurveyResponse(
+            assignment=assignment, question=question, answer=item.get('answer')
+        ))
+    return score_responses(list(by_question.values()))
+
+
+def save_responses(responses):
+    """Insert or update responses on ``(assignment, question)`` in bulk."""
+    if not responses:
+        return
+    SurveyResponse.objects.bulk_create(
+        responses,
+        batch_size=UPSERT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['assignment', 'question'],
+        update_fields=['answer', 'score', *STORED_FIELDS],
+    )
+
+
+def total_for(scores, questions):
+    """Sum the weighted scores of ``{question_id: score}`` for questions in ``questions``."""
+    total = 0
+    for question_id, score in scores.items():
+        if question_id in questions:
+            weighted = weighted_score(score, questions[question_id])
+            if weighted is not None:
+                total += weighted
+    return total
+
+
+def _rollup_completion(rollup, assignment, completed_at, scores, questions, sign):
+    """Add (``sign=1``) or remove a completion and its scores on its day."""
+    rollup.add(completed_at, employee_id=assignment.employee_id, assignments_completed=sign)
+    for question_id, score in scores.items():
+        if score is not None and question_id in questions:
+            rollup.add(
+                completed_at, employee_id=assignment.employee_id, factor_id=questions[question_id].factor_id,
+                score_sum=sign * score, score_count=sign
+            )
+
+
+def submit_assignment(assignment, responses_data, questions=None, delta=None, rollup=None):
+    """
+    Store a submission for ``assignment`` and mark it completed.
+
+    Must run inside a transaction holding a lock on the assignment row.
+    A saved draft is merged under the submitted answers and removed.
+    Statistics and rollup changes are applied immediately unless a
+    ``StatisticsDelta`` for the survey and a ``RollupDelta`` are passed in
+    to collect them. Returns the assignment's new total score.
+    """
+    if questions is None:
+        questions = load_questions(assignment.survey_id)
+
+    responses_data = promote_draft(assignment, responses_data)
+    responses = build_responses(assignment, responses_data, questions)
+    previous = {
+        question_id: (score, text)
+        for question_id, score, text in SurveyResponse.objects.filter(
+            assignment=assignment
+        ).values_list('question_id', 'score', 'answer_text')
+    }
+    save_responses(responses)
+
+    # Changed free-text answers need fresh sentiment annotations.
+    changed_text = [
+        response.question_id for response in responses
+        if response.question_id in previous and previous[response.question_id][1] != response.answer_text
+    ]
+    if changed_text:
+        ResponseAnnotation.objects.filter(
+            response__assignment=assignment, response__question_id__in=changed_text
+        ).delete()
+
+    collect = delta is not None
+    if not collect:
+        delta = StatisticsDelta(assignment.survey_id)
+    old_completed, old_total = assignment.is_completed, assignment.total_score
+    old_completed_at = assignment.completed_at
+
+    # Answers stored earlier and not resubmitted still count towards the total.
+    old_scores = {question_id: score for question_id, (score, _) in previous.items()}
+    new_scores = {**old_scores, **{response.question_id: response.score for response in responses}}
+
+    assignment.is_completed = True
+    assignment.completed_at = timezone.now()
+    assignment.total_score = total_for(new_scores, questions)
+    assignment.save(update_fields=['is_completed', 'completed_at', 'total_score'])
+
+    delta.assignment_changed(old_completed, old_total, True, assignment.total_score)
+    for response in responses:
+        delta.response_changed(
+            response.question.factor_id, previous.get(response.question_id, (None,))[0], response.score
+        )
+
+    # Completion and scores are dated by completed_at, so a resubmission
+    # moves the assignment's earlier contribution to the new day.
+    collect_rollup = rollup is not None
+    if not collect_rollup:
+        rollup = RollupDelta()
+    if old_completed and old_completed_at is not None:
+        _rollup_completion(rollup, assignment, old_completed_at, old_scores, questions, -1)
+    _rollup_completion(rollup, assignment, assignment.completed_at, new_scores, questions, 1)
+
+    if not collect:
+        adjust_counters(delta.survey_id, responses=delta.completed)
+        delta.apply()
+    if not collect_rollup:
+        rollup.apply()
+    return assignment.total_score
+
+
+def lock_assignment(survey, user, assignment_id):
+    """
+    Lock and return the user's assignment; call inside a transaction.
+
+    Raises ``SurveyAssignment.DoesNotExist`` if the assignment is not theirs.
+    """
+    return SurveyAssignment.objects.select_for_update(of=('self',)).get(
+        id=assignment_id,
+        survey=survey,
+        employee__user=user
+    )
+
+
+def submit_for_user(survey, user, assignment_id, responses_data):
+    """
+    Lock the user's assignment and submit it in one transaction.
+
+    Raises ``SurveyAssignment.DoesNotExist`` if the assignment is not theirs.
+    """
+    with transaction.atomic():
+        assignment = lock_assignment(survey, user, assignment_id)
+        return submit_assignment(assignment, responses_data)
+
+
+def submit_batch(assignments, items):
+    """
+    Submit many assignments in one transaction.
+
+    ``assignments`` limits which assignments may be submitted and ``items``
+    is a list of ``{'assignment_id': ..., 'responses': [...]}``. All
+    assignments are locked with one query and questions are loaded once per
+    survey. Each item runs in its own savepoint, so a failing item does not
+    undo the others; statistics (per survey) and rollups are applied once
+    at the end. Returns one result per item, in order.
+    """
+    assignment_ids = sorted({item['assignment_id'] for item in items})
+    results = []
+
+    with transaction.atomic():
+        locked = {
+            assignment.pk: assignment
+            for assignment in assignments.select_for_update(of=('self',)).filter(
+                pk__in=assignment_ids
+            ).order_by('pk')
+        }
+        survey_ids = {assignment.survey_id for assignment in locked.values()}
+        questions = {survey_id: {} for survey_id in survey_ids}
+        for question in Question.objects.filter(survey_id__in=survey_ids).select_related('factor'):
+            questions[question.survey_id][question.id] = question
+        deltas = {survey_id: StatisticsDelta(survey_id) for survey_id in survey_ids}
+        rollup = RollupDelta()
+
+        for item in items:
+            assignment_id = item['assignment_id']
+            assignment = locked.get(assignment_id)
+            if assignment is None:
+                results.append({
+                    'assignment_id': assignment_id,
+                    'status': 'error',
+                    'detail': 'Survey assignment not found'
+                })
+                continue
+
+            survey_delta, item_rollup = StatisticsDelta(assignment.survey_id), RollupDelta()
+            try:
+                with transaction.atomic():
+                    total_score = submit_assignment(
+                        assignment, item['responses'], questions[assignment.survey_id],
+                        delta=survey_delta, rollup=item_rollup
+                    )
+            except DatabaseError as exc:
+                assignment.refresh_from_db(fields=['is_completed', 'completed_at', 'total_score'])
+                results.append({'assignment_id': assignment_id, 'status': 'error', 'detail': str(exc)})
+                continue
+
+            deltas[assignment.survey_id].merge(survey_delta)
+            rollup.merge(item_rollup)
+            results.append({'assignment_id': assignment_id, 'status': 'submitted', 'total_score': total_score})
+
+        for delta in deltas.values():
+            adjust_counters(delta.survey_id, responses=delta.completed)
+            delta.apply()
+        rollup.apply()
+    return results
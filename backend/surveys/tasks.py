@@ -0,0 +1,21 @@
+from jobs.registry import register
+from .models import SurveyAssignment
+from .rescoring import DEFAULT_CHUNK_SIZE, rescore
+
+
+@register('surveys.rescore')
+def rescore_task(job, survey_id=None, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Recompute scores and totals, reporting progress per chunk."""
+    assignments = SurveyAssignment.objects.filter(is_completed=True)
+    if survey_id is not None:
+        assignments = assignments.filter(survey_id=survey_id)
+    total = assignments.count()
+
+    def report(result):
+        if total:
+            job.set_progress(
+                result.assignments_scanned / total,
+                f"{result.assignments_scanned} of {total} assignments"
+            )
+
+    return rescore(survey_id=survey_id, chunk_size=chunk_size, dry_run=dry_run, progress=report).as_dict()
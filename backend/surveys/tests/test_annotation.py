@@ -0,0 +1,80 @@
+import io
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from surveys import annotation
+from surveys.models import Factor, Question, ResponseAnnotation, SurveyAssignment, SurveyResponse
+from surveys.sentiment import analyze
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class AnalyzeTests(SimpleTestCase):
+    def test_sign_follows_valence_and_negation(self):
+        positive, _ = analyze('My manager is supportive and helpful')
+        negative, _ = analyze('I feel stressed and underpaid')
+        negated, _ = analyze('The team is not supportive')
+
+        self.assertGreater(positive, 0)
+        self.assertLess(negative, 0)
+        self.assertLess(negated, 0)
+        self.assertTrue(-1 < negative < positive < 1)
+
+    def test_intensifiers_scale_the_score(self):
+        plain, _ = analyze('The pay is good')
+        intensified, _ = analyze('The pay is very good')
+        softened, _ = analyze('The pay is slightly good')
+
+        self.assertGreater(intensified, plain)
+        self.assertLess(softened, plain)
+
+    def test_keywords_are_canonical_topics(self):
+        self.assertEqual(analyze('Low salary, too much overtime; thinking of leaving')[1],
+                         ['exit', 'salary', 'workload'])
+        self.assertEqual(analyze(''), (0.0, []))
+
+
+class AnnotateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = make_user('admin@example.com', role='ADMIN')
+        cls.survey = make_survey(admin)
+        cls.factor = Factor.objects.create(name='Culture')
+        question = Question.objects.create(
+            survey=cls.survey, text='Comments', type='TEXTAREA', factor=cls.factor, order=1
+        )
+        choice = Question.objects.create(survey=cls.survey, text='Pick', type='RADIO', options=['a'], order=2)
+        cls.responses = []
+        for number, text in enumerate(['A toxic and stressful culture', 'Great colleagues, I love it']):
+            assignment = SurveyAssignment.objects.create(
+                survey=cls.survey, employee=make_employee(f'e{number}@example.com'), assigned_by=admin
+            )
+            cls.responses.append(
+                SurveyResponse.objects.create(assignment=assignment, question=question, answer={'value': text})
+            )
+            SurveyResponse.objects.create(assignment=assignment, question=choice, answer={'value': 'a'})
+
+    def test_annotates_pending_text_answers_once(self):
+        self.assertEqual(annotation.annotate(chunk_size=1).annotated, 2)
+        self.assertEqual(annotation.annotate().annotated, 0)
+
+        negative = ResponseAnnotation.objects.get(response=self.responses[0])
+        self.assertLess(negative.sentiment, 0)
+        self.assertEqual((negative.survey_id, negative.factor_id), (self.survey.pk, self.factor.pk))
+        self.assertEqual(negative.keywords, ['culture', 'wellbeing'])
+
+        [row] = annotation.factor_sentiment(self.survey.pk)
+        self.assertEqual((row['factor__name'], row['response_count'], row['negative_count']), ('Culture', 2, 1))
+
+    def test_changed_answer_is_annotated_again(self):
+        annotation.annotate()
+        response = self.responses[1]
+        response.answer = {'value': 'Terrible, I plan to quit'}
+        response.save(update_fields=['answer'])
+
+        self.assertEqual(list(annotation.pending().values_list('pk', flat=True)), [response.pk])
+        out = io.StringIO()
+        call_command('annotate_responses', '--workers', '1', stdout=out)
+
+        self.assertIn('Annotated 1 responses', out.getvalue())
+        self.assertLess(ResponseAnnotation.objects.get(response=response).sentiment, 0)
@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from surveys import answers
+from surveys.models import Question, SurveyAssignment, SurveyResponse
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+OPTIONS = ['Low', 'Medium', 'High']
+
+
+def selected(mask, options):
+    return [option for position, option in enumerate(options) if mask >> position & 1]
+
+
+class EncodeTests(SimpleTestCase):
+    def test_choice_is_the_option_position(self):
+        self.assertEqual(answers.encode('RADIO', OPTIONS, {'value': 'High'}), (2, None, None))
+        self.assertEqual(answers.encode('DROPDOWN', OPTIONS, 'Low'), (0, None, None))
+        self.assertEqual(answers.encode('RADIO', OPTIONS, {'value': 'Other'}), (None, None, None))
+        self.assertEqual(answers.encode('RADIO', OPTIONS, {}), (None, None, None))
+
+    def test_rating_is_a_number(self):
+        self.assertEqual(answers.encode('RATING', None, {'value': '4'}), (None, 4.0, None))
+        self.assertEqual(answers.encode('RATING', None, {'value': 'many'}), (None, None, None))
+
+    def test_checkbox_mask_decodes_to_the_known_selected_options(self):
+        _, _, mask = answers.encode('CHECKBOX', OPTIONS, {'values': ['High', 'Other', 'Low']})
+
+        self.assertEqual(mask, 0b101)
+        self.assertEqual(selected(mask, OPTIONS), ['Low', 'High'])
+        self.assertEqual(answers.encode('CHECKBOX', OPTIONS, []), (None, None, 0))
+
+    def test_positions_beyond_the_mask_are_left_out(self):
+        options = [f'Option {position}' for position in range(answers.MASK_BITS + 1)]
+
+        _, _, mask = answers.encode('CHECKBOX', options, options[-2:])
+
+        self.assertEqual(selected(mask, options), [options[-2]])
+
+    def test_text_is_stripped_free_text_only(self):
+        self.assertEqual(answers.text('TEXTAREA', {'value': '  Too many meetings '}), 'Too many meetings')
+        self.assertIsNone(answers.text('TEXT', {'value': '   '}))
+        self.assertIsNone(answers.text('RADIO', {'value': 'Low'}))
+
+
+class StoredAnswerTests(APITestCase):
+    def test_columns_follow_the_answer_and_the_question_options(self):
+        admin = make_user('admin@example.com', role='ADMIN')
+        survey = make_survey(admin)
+        question = Question.objects.create(survey=survey, text='Workload', type='RADIO', options=OPTIONS, order=1)
+        assignment = SurveyAssignment.objects.create(
+            survey=survey, employee=make_employee('e@example.com'), assigned_by=admin
+        )
+        response = SurveyResponse.objects.create(assignment=assignment, question=question, answer={'value': 'Medium'})
+        self.assertEqual(response.answer_index, 1)
+
+        response.answer = {'value': 'High'}
+        response.save(update_fields=['answer'])
+        response.refresh_from_db()
+        self.assertEqual(response.answer_index, 2)
+
+        self.client.force_authenticate(admin)
+        self.client.patch(f'/api/surveys/questions/{question.pk}/', {'options': ['High', 'Low']}, format='json')
+        response.refresh_from_db()
+        self.assertEqual(response.answer_index, 0)
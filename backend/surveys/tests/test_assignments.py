@@ -0,0 +1,69 @@
+from rest_framework.test import APITestCase
+
+from surveys.models import SurveyAssignment, SurveyStatistics
+from surveys.tests.utils import make_department, make_employee, make_survey, make_user
+
+
+class MyAssignmentsQueryBudgetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hr = make_user('hr@example.com', role='HR')
+        cls.employee = make_employee('e@example.com')
+        for number in range(10):
+            SurveyAssignment.objects.create(
+                survey=make_survey(hr, title=f'Survey {number}'), employee=cls.employee, assigned_by=hr
+            )
+
+    def test_runs_one_query_regardless_of_assignment_count(self):
+        self.client.force_authenticate(self.employee.user)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/surveys/assignments/my_assignments/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[0]['survey_details']['title'], 'Survey 0')
+
+
+class BulkAssignTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.sales, cls.support = make_department('Sales'), make_department('Support')
+        cls.sellers = [make_employee(f's{number}@example.com', department=cls.sales) for number in range(3)]
+        cls.supporter = make_employee('support@example.com', department=cls.support)
+        cls.former = make_employee('former@example.com', department=cls.sales, is_active=False)
+        cls.survey = make_survey(cls.admin)
+
+    def bulk_assign(self, user, **targets):
+        self.client.force_authenticate(user)
+        return self.client.post(f'/api/surveys/forms/{self.survey.pk}/bulk_assign/', targets, format='json')
+
+    def assigned(self):
+        return set(SurveyAssignment.objects.filter(survey=self.survey).values_list('employee_id', flat=True))
+
+    def test_counts_created_and_skipped_assignments(self):
+        self.bulk_assign(self.admin, employee_ids=[self.sellers[0].pk])
+
+        response = self.bulk_assign(self.admin, department_ids=[self.sales.pk], employee_ids=[self.supporter.pk])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'assignments_created': 3, 'skipped': 1, 'targeted': 4})
+        self.assertEqual(self.assigned(), {employee.pk for employee in [*self.sellers, self.supporter]})
+        self.assertEqual(SurveyStatistics.objects.get(survey=self.survey).total_assignments, 4)
+
+    def test_all_active_skips_inactive_employees(self):
+        response = self.bulk_assign(self.admin, all_active=True)
+
+        self.assertEqual(response.data['assignments_created'], 4)
+        self.assertNotIn(self.former.pk, self.assigned())
+
+    def test_hr_assigns_within_their_department_only(self):
+        hr = make_user('hr@example.com', role='HR', department=self.sales)
+
+        response = self.bulk_assign(hr, employee_ids=[self.supporter.pk, self.sellers[0].pk])
+
+        self.assertEqual(response.data, {'assignments_created': 1, 'skipped': 0, 'targeted': 1})
+        self.assertEqual(self.assigned(), {self.sellers[0].pk})
+
+    def test_requires_a_target(self):
+        self.assertEqual(self.bulk_assign(self.admin).status_code, 400)
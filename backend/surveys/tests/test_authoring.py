@@ -0,0 +1,99 @@
+from rest_framework.test import APITestCase
+
+from surveys.authoring import create_questions
+from surveys.models import Factor, Question, Survey, SurveyAssignment, SurveyResponse
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class AuthoringTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.survey = make_survey(cls.admin)
+        cls.factor = Factor.objects.create(name='Pay')
+        cls.questions = create_questions([
+            {'survey': cls.survey, 'text': 'Workload', 'type': 'RADIO', 'options': ['Low', 'High'], 'order': 0},
+            {'survey': cls.survey, 'text': 'Comments', 'type': 'TEXT', 'order': 1},
+            {'survey': cls.survey, 'text': 'Pay', 'type': 'RATING', 'order': 2, 'factor': cls.factor,
+             'has_scoring': True},
+        ])
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def survey_state(self, survey=None):
+        return Survey.objects.values_list('question_count', 'content_version').get(pk=(survey or self.survey).pk)
+
+    def test_bulk_create_counts_questions_and_bumps_the_version(self):
+        count, version = self.survey_state()
+
+        response = self.client.post('/api/surveys/questions/bulk/', {'survey': self.survey.pk, 'questions': [
+            {'text': 'Team', 'type': 'TEXT', 'order': 3},
+            {'text': 'Manager', 'type': 'TEXT', 'order': 4},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['text'] for item in response.data], ['Team', 'Manager'])
+        new_count, new_version = self.survey_state()
+        self.assertEqual(new_count, count + 2)
+        self.assertGreater(new_version, version)
+
+    def test_bulk_update_refreshes_derived_data(self):
+        workload, comments, _ = self.questions
+        assignment = SurveyAssignment.objects.create(
+            survey=self.survey, employee=make_employee('e@example.com'), assigned_by=self.admin
+        )
+        answer = SurveyResponse.objects.create(assignment=assignment, question=workload, answer={'value': 'High'})
+        scoring_version = Question.objects.get(pk=workload.pk).scoring_version
+
+        response = self.client.patch('/api/surveys/questions/bulk/', {'questions': [
+            {'id': workload.pk, 'options': ['High', 'Low']},
+            {'id': comments.pk, 'text': 'Anything else?'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        answer.refresh_from_db()
+        self.assertEqual(answer.answer_index, 0)
+        self.assertEqual(Question.objects.get(pk=comments.pk).text, 'Anything else?')
+        self.assertGreater(Question.objects.get(pk=workload.pk).scoring_version, scoring_version)
+
+    def test_bulk_update_with_an_invalid_item_changes_nothing(self):
+        response = self.client.patch('/api/surveys/questions/bulk/', {'questions': [
+            {'id': self.questions[1].pk, 'text': 'Changed'},
+            {'id': 0, 'text': 'Missing'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(0, response.data['questions'])
+        self.assertEqual(Question.objects.get(pk=self.questions[1].pk).text, 'Comments')
+
+    def test_reorder_requires_every_question_once(self):
+        ids = [question.pk for question in reversed(self.questions)]
+        _, version = self.survey_state()
+
+        self.assertEqual(self.client.post('/api/surveys/questions/reorder/', {
+            'survey': self.survey.pk, 'question_ids': ids[:2]
+        }, format='json').status_code, 400)
+        response = self.client.post('/api/surveys/questions/reorder/', {
+            'survey': self.survey.pk, 'question_ids': ids
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(Question.objects.filter(survey=self.survey).values_list('pk', flat=True)), ids)
+        self.assertGreater(self.survey_state()[1], version)
+
+    def test_clone_copies_questions_without_assignments(self):
+        SurveyAssignment.objects.create(
+            survey=self.survey, employee=make_employee('e@example.com'), assigned_by=self.admin
+        )
+
+        response = self.client.post(f'/api/surveys/forms/{self.survey.pk}/clone/', {}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        clone = Survey.objects.get(pk=response.data['id'])
+        self.assertEqual((clone.title, clone.question_count, response.data['response_count']), ('Survey (copy)', 3, 0))
+        self.assertEqual(
+            list(clone.questions.values_list('text', 'order', 'factor_id')),
+            list(self.survey.questions.values_list('text', 'order', 'factor_id'))
+        )
+        self.assertFalse(clone.assignments.exists())
@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from rest_framework.test import APITestCase
+
+from analytics.models import MonthlyRollup
+from surveys import submission
+from surveys.authoring import create_questions
+from surveys.models import Factor, Survey, SurveyAssignment, SurveyResponse, SurveyStatistics
+from surveys.statistics import rebuild
+from surveys.tests.utils import make_department, make_employee, make_survey, make_user
+
+
+class BatchSubmitTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        department = make_department()
+        cls.hr = make_user('hr@example.com', role='HR', department=department)
+        cls.survey = make_survey(cls.hr)
+        [cls.question] = create_questions([{
+            'survey': cls.survey, 'text': 'Paid fairly?', 'type': 'RADIO', 'options': ['Yes', 'No'],
+            'has_scoring': True, 'scoring_guide': {'Yes': 3, 'No': 1}, 'factor': Factor.objects.create(name='Pay')
+        }])
+        cls.assignments = [
+            SurveyAssignment.objects.create(
+                survey=cls.survey, employee=make_employee(f'e{number}@example.com', department), assigned_by=cls.hr
+            )
+            for number in range(3)
+        ]
+        cls.outsider = SurveyAssignment.objects.create(
+            survey=cls.survey, employee=make_employee('other@example.com'), assigned_by=cls.hr
+        )
+        rebuild(cls.survey.pk)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.hr)
+
+    def batch_submit(self, assignments):
+        return self.client.post('/api/surveys/assignments/batch_submit/', {'submissions': [
+            {'assignment_id': assignment.pk, 'responses': [{'question_id': self.question.pk, 'answer': 'Yes'}]}
+            for assignment in assignments
+        ]}, format='json')
+
+    def test_failing_item_does_not_undo_the_others(self):
+        first, failing, last = self.assignments
+        save_responses = submission.save_responses
+
+        def fail_for_one(responses):
+            save_responses(responses)
+            if responses and responses[0].assignment_id == failing.pk:
+                raise DatabaseError('disk full')
+
+        with mock.patch.object(submission, 'save_responses', side_effect=fail_for_one):
+            response = self.batch_submit([first, failing, last, self.outsider])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['submitted'], response.data['failed']), (2, 2))
+        self.assertEqual(
+            [(result['assignment_id'], result['status']) for result in response.data['results']],
+            [(first.pk, 'submitted'), (failing.pk, 'error'), (last.pk, 'submitted'), (self.outsider.pk, 'error')]
+        )
+        self.assertEqual(response.data['results'][0]['total_score'], 3.0)
+        self.assertEqual(response.data['results'][1]['detail'], 'disk full')
+        self.assertEqual(response.data['results'][3]['detail'], 'Survey assignment not found')
+
+        self.assertEqual(
+            set(SurveyResponse.objects.values_list('assignment_id', flat=True)), {first.pk, last.pk}
+        )
+        self.assertFalse(SurveyAssignment.objects.get(pk=failing.pk).is_completed)
+        self.assertEqual(SurveyStatistics.objects.get(survey=self.survey).completed_assignments, 2)
+
+    def test_statistics_and_rollups_merge_every_submitted_item(self):
+        response = self.batch_submit(self.assignments)
+
+        self.assertEqual(response.data['submitted'], 3)
+        statistics = SurveyStatistics.objects.get(survey=self.survey)
+        self.assertEqual((statistics.completed_assignments, statistics.score_sum), (3, 9.0))
+        self.assertEqual(Survey.objects.get(pk=self.survey.pk).response_count, 3)
+        completed = sum(MonthlyRollup.objects.values_list('assignments_completed', flat=True))
+        scores = sum(MonthlyRollup.objects.values_list('score_sum', flat=True))
+        self.assertEqual((completed, scores), (3, 9.0))
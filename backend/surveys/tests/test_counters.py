@@ -0,0 +1,72 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from surveys.models import Question, Survey, SurveyAssignment
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+def counters(survey):
+    return tuple(Survey.objects.filter(pk=survey.pk).values_list('question_count', 'response_count').get())
+
+
+class CounterTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.survey = make_survey(cls.admin)
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def test_question_writes_adjust_question_count(self):
+        response = self.client.post('/api/surveys/questions/', {
+            'survey': self.survey.pk, 'text': 'Comments', 'type': 'TEXT', 'order': 1
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(counters(self.survey), (1, 0))
+
+        other = make_survey(self.admin, 'Other')
+        self.client.patch(f'/api/surveys/questions/{response.data["id"]}/', {'survey': other.pk}, format='json')
+        self.assertEqual((counters(self.survey), counters(other)), ((0, 0), (1, 0)))
+
+        self.client.delete(f'/api/surveys/questions/{response.data["id"]}/')
+        self.assertEqual(counters(other), (0, 0))
+
+    def test_submission_adjusts_response_count_once(self):
+        question = Question.objects.create(survey=self.survey, text='Comments', type='TEXT', order=1)
+        employee = make_employee('employee@example.com')
+        assignment = SurveyAssignment.objects.create(survey=self.survey, employee=employee, assigned_by=self.admin)
+        self.client.force_authenticate(employee.user)
+
+        for answer in ('First', 'Second'):
+            response = self.client.post(f'/api/surveys/forms/{self.survey.pk}/submit/', {
+                'assignment_id': assignment.pk, 'responses': [{'question_id': question.pk, 'answer': answer}]
+            }, format='json')
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(counters(self.survey)[1], 1)
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get('/api/surveys/forms/').data['results'][0]['response_count'], 1)
+
+
+class RepairCommandTests(TestCase):
+    def test_recomputes_counters_of_selected_surveys(self):
+        admin = make_user('admin@example.com', role='ADMIN')
+        surveys = [make_survey(admin, title) for title in ('First', 'Second')]
+        for survey in surveys:
+            Question.objects.create(survey=survey, text='Comments', type='TEXT', order=1)
+            SurveyAssignment.objects.create(
+                survey=survey, employee=make_employee(f'{survey.pk}@example.com'), assigned_by=admin, is_completed=True
+            )
+        Survey.objects.update(question_count=7, response_count=7)
+
+        out = io.StringIO()
+        call_command('repair_survey_counters', '--survey', str(surveys[0].pk), stdout=out)
+
+        self.assertIn('Repaired counters of 1 surveys.', out.getvalue())
+        self.assertEqual([counters(survey) for survey in surveys], [(1, 1), (7, 7)])
+        call_command('repair_survey_counters', stdout=io.StringIO())
+        self.assertEqual(counters(surveys[1]), (1, 1))
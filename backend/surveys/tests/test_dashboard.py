@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from surveys.models import SurveyAssignment
+from surveys.tests.utils import make_department, make_employee, make_survey, make_user
+
+URL = '/api/surveys/analytics/turnover/'
+
+
+class TurnoverDashboardTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.sales, cls.support = make_department('Sales'), make_department('Support')
+        cls.hr = make_user('hr@example.com', role='HR', department=cls.support)
+        cls.sellers = [
+            make_employee(f's{number}@example.com', department=cls.sales, turnover_risk='HIGH', risk_score=score)
+            for number, score in enumerate([0.7, 0.9, 0.8])
+        ]
+        cls.supporter = make_employee('support@example.com', department=cls.support, turnover_risk='MEDIUM')
+        SurveyAssignment.objects.create(survey=make_survey(cls.admin), employee=cls.supporter, assigned_by=cls.admin)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get(URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_hr_sees_their_department_only(self):
+        everyone, department = self.get(self.admin), self.get(self.hr)
+
+        self.assertEqual((everyone['total'], everyone['highRiskTotal'], everyone['pendingSurveys']), (4, 3, 1))
+        self.assertEqual((department['total'], department['highRiskTotal'], department['pendingSurveys']), (1, 0, 1))
+        self.assertEqual(department['byDepartment'], [{'name': 'Support', 'count': 1}])
+        self.assertEqual([row['value'] for row in department['byRisk']], [0, 1, 0])
+
+    def test_pages_high_risk_employees_by_score(self):
+        data = self.get(self.admin, high_risk_limit=2, high_risk_offset=1)
+
+        self.assertEqual([row['riskScore'] for row in data['highRiskEmployees']], [0.8, 0.7])
+        self.assertEqual((data['highRiskLimit'], data['highRiskOffset']), (2, 1))
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get(URL, {'high_risk_limit': 'ten'}).status_code, 400)
+
+    def test_cached_until_a_write_invalidates_it(self):
+        self.get(self.admin)
+        with self.assertNumQueries(0):
+            self.get(self.admin)
+
+        employee = self.supporter
+        employee.turnover_risk = 'HIGH'
+        with self.captureOnCommitCallbacks(execute=True):
+            employee.save()
+
+        self.assertEqual(self.get(self.admin)['highRiskTotal'], 4)
+        self.assertEqual(self.get(self.hr)['highRiskTotal'], 1)
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from surveys.models import Survey, SurveyAssignment
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class ContentVersionTests(TestCase):
+    def test_save_from_stale_instance_bumps_past_current_version(self):
+        survey = make_survey(make_user('hr@example.com', role='HR'))
+        stale = Survey.objects.get(pk=survey.pk)
+        Survey.bump_content_version([survey.pk])
+        survey.title = 'Renamed'
+        survey.save()
+        stale.save()
+
+        self.assertEqual(survey.content_version, 3)
+        self.assertEqual(stale.content_version, 4)
+        self.assertEqual(Survey.objects.get(pk=survey.pk).content_version, 4)
+
+
+class DefinitionRetrieveTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = make_user('admin@example.com', role='ADMIN')
+        cls.employee = make_employee('employee@example.com')
+        cls.survey = make_survey(admin)
+        cls.assignment = SurveyAssignment.objects.create(survey=cls.survey, employee=cls.employee, assigned_by=admin)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.employee.user)
+        self.url = f'/api/surveys/forms/{self.survey.pk}/'
+
+    def test_repeat_request_is_answered_without_queries(self):
+        tag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=tag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleting_assignment_revokes_cached_access(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assignment.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,69 @@
+import datetime
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from surveys.models import Question, SurveyAssignment, SurveyResponse
+from surveys.tests.utils import make_department, make_employee, make_survey, make_user
+
+
+class DistributionTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.sales, cls.support = make_department('Sales'), make_department('Support')
+        survey = make_survey(cls.admin)
+        cls.question = Question.objects.create(
+            survey=survey, text='Perks used', type='CHECKBOX', options=['Gym', 'Meals', 'Travel'], order=1
+        )
+        cls.comments = Question.objects.create(survey=survey, text='Comments', type='TEXT', order=2)
+        january, february = (timezone.make_aware(datetime.datetime(2026, month, 15)) for month in (1, 2))
+        for number, (department, values, submitted_at) in enumerate([
+            (cls.sales, ['Gym', 'Meals'], january),
+            (cls.sales, ['Gym'], february),
+            (cls.support, ['Travel', 'Gym'], january),
+        ]):
+            assignment = SurveyAssignment.objects.create(
+                survey=survey, employee=make_employee(f'e{number}@example.com', department=department),
+                assigned_by=cls.admin
+            )
+            response = SurveyResponse.objects.create(
+                assignment=assignment, question=cls.question, answer={'values': values}
+            )
+            SurveyResponse.objects.filter(pk=response.pk).update(submitted_at=submitted_at)
+
+    def get(self, user, question=None, **params):
+        self.client.force_authenticate(user)
+        question = question or self.question
+        return self.client.get(f'/api/surveys/questions/{question.pk}/distribution/', params)
+
+    def test_counts_every_selected_option(self):
+        data = self.get(self.admin).data
+
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['groups'], [{'total': 3, 'counts': {'Gym': 3, 'Meals': 1, 'Travel': 1}}])
+
+    def test_groups_by_department_and_month(self):
+        data = self.get(self.admin, group_by='department,month').data
+
+        self.assertEqual(data['group_by'], ['department', 'month'])
+        self.assertEqual(
+            [(group['department'], group['month'], group['counts']) for group in data['groups']],
+            [
+                ('Sales', '2026-01', {'Gym': 1, 'Meals': 1}),
+                ('Sales', '2026-02', {'Gym': 1}),
+                ('Support', '2026-01', {'Gym': 1, 'Travel': 1}),
+            ]
+        )
+
+    def test_hr_sees_their_department_only(self):
+        hr = make_user('hr@example.com', role='HR', department=self.support)
+
+        data = self.get(hr, group_by='department').data
+
+        self.assertEqual(data['total'], 1)
+        self.assertEqual([group['department'] for group in data['groups']], ['Support'])
+
+    def test_rejects_free_text_questions_and_unknown_groupings(self):
+        self.assertEqual(self.get(self.admin, self.comments).status_code, 400)
+        self.assertEqual(self.get(self.admin, group_by='role').status_code, 400)
@@ -0,0 +1,115 @@
+import tempfile
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from surveys import drafts
+from surveys.authoring import create_questions
+from surveys.models import SurveyAssignment, SurveyDraft, SurveyResponse
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class DraftTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.survey = make_survey(cls.admin)
+        cls.first, cls.second = create_questions([
+            {'survey': cls.survey, 'text': 'First', 'type': 'TEXT', 'order': 1},
+            {'survey': cls.survey, 'text': 'Second', 'type': 'TEXT', 'order': 2},
+        ])
+        cls.employees = [make_employee(f'e{number}@example.com') for number in range(2)]
+        cls.assignments = [
+            SurveyAssignment.objects.create(survey=cls.survey, employee=employee, assigned_by=cls.admin)
+            for employee in cls.employees
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def autosave(self, assignment, answers, method='patch'):
+        self.client.force_authenticate(assignment.employee.user)
+        return getattr(self.client, method)(
+            f'/api/surveys/assignments/{assignment.pk}/draft/', {'answers': answers}, format='json'
+        )
+
+    def stored(self, assignment):
+        return SurveyDraft.objects.filter(assignment=assignment).values_list('answers', flat=True).first()
+
+
+class WriteThroughDraftTests(DraftTestCase):
+    def test_patch_merges_and_put_replaces(self):
+        assignment = self.assignments[0]
+
+        self.autosave(assignment, {self.first.pk: 'a'})
+        self.autosave(assignment, {self.second.pk: 'b'})
+        self.assertEqual(self.stored(assignment), {str(self.first.pk): 'a', str(self.second.pk): 'b'})
+
+        self.autosave(assignment, {self.second.pk: 'c'}, method='put')
+        self.assertEqual(self.stored(assignment), {str(self.second.pk): 'c'})
+        self.assertEqual(self.client.get(f'/api/surveys/assignments/{assignment.pk}/draft/').data['answers'],
+                         {str(self.second.pk): 'c'})
+
+    def test_submit_promotes_draft_under_submitted_answers(self):
+        assignment = self.assignments[0]
+        self.autosave(assignment, {self.first.pk: 'drafted', self.second.pk: 'drafted'})
+
+        response = self.client.post(f'/api/surveys/forms/{self.survey.pk}/submit/', {
+            'assignment_id': assignment.pk, 'responses': [{'question_id': self.second.pk, 'answer': 'final'}]
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            dict(SurveyResponse.objects.filter(assignment=assignment).values_list('question_id', 'answer')),
+            {self.first.pk: 'drafted', self.second.pk: 'final'}
+        )
+        self.assertIsNone(self.stored(assignment))
+
+
+class BufferedDraftTests(DraftTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared_cache = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory.name
+        }})
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+        super().setUp()
+
+    def test_flush_writes_buffered_drafts(self):
+        self.assertTrue(drafts.buffered())
+        self.autosave(self.assignments[0], {self.first.pk: 'a'})
+        self.assertIsNone(self.stored(self.assignments[0]))
+
+        self.assertEqual(drafts.flush(), 1)
+
+        self.assertEqual(self.stored(self.assignments[0]), {str(self.first.pk): 'a'})
+        self.assertEqual(drafts.flush(), 0)
+
+    def test_draft_of_deleted_assignment_does_not_block_flush(self):
+        deleted, kept = self.assignments
+        self.autosave(deleted, {self.first.pk: 'a'})
+        SurveyAssignment.objects.filter(pk=deleted.pk).delete()
+        self.autosave(kept, {self.first.pk: 'b'})
+
+        self.assertEqual(drafts.flush(), 1)
+
+        self.assertEqual(self.stored(kept), {str(self.first.pk): 'b'})
+        self.assertFalse(SurveyDraft.objects.filter(assignment_id=deleted.pk).exists())
+        self.autosave(kept, {self.first.pk: 'c'})
+        self.assertEqual(drafts.flush(), 1)
+        self.assertEqual(self.stored(kept), {str(self.first.pk): 'c'})
+
+    def test_deleting_assignment_drops_its_buffered_draft(self):
+        assignment = self.assignments[0]
+        self.autosave(assignment, {self.first.pk: 'a'})
+        self.client.force_authenticate(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/surveys/assignments/{assignment.pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNone(cache.get(f'surveys:draft:{assignment.pk}'))
+        self.assertEqual(drafts.flush(), 0)
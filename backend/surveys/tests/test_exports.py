@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from surveys.models import Question, SurveyAssignment, SurveyResponse
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class ResponseExportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.survey = make_survey(cls.admin)
+        question = Question.objects.create(survey=cls.survey, text='@SUM(A1:A9)', type='TEXT', order=1)
+        answered, empty = (
+            SurveyAssignment.objects.create(
+                survey=cls.survey, employee=make_employee(f'e{number}@example.com'), assigned_by=cls.admin,
+                is_completed=True, completed_at=timezone.now()
+            )
+            for number in range(2)
+        )
+        cls.answered, cls.empty = answered, empty
+        SurveyResponse.objects.create(
+            assignment=answered, question=question, answer='=HYPERLINK("http://evil")'
+        )
+
+    def export(self, export_format):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(
+            '/api/surveys/responses/by_survey/', {'survey_id': self.survey.pk, 'format': export_format}
+        )
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_quotes_formula_cells(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+
+        answered = next(row for row in rows if row['assignment_id'] == str(self.answered.pk))
+        self.assertEqual(answered['answer'], '\'=HYPERLINK("http://evil")')
+        self.assertEqual(answered['question_text'], "'@SUM(A1:A9)")
+
+    def test_all_formats_include_assignments_without_responses(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+        lines = [json.loads(line) for line in self.export('ndjson').splitlines()]
+
+        self.assertEqual({row['assignment_id'] for row in rows}, {str(self.answered.pk), str(self.empty.pk)})
+        self.assertEqual(
+            {line['id']: len(line['responses']) for line in lines}, {self.answered.pk: 1, self.empty.pk: 0}
+        )
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from surveys import idempotency
+from surveys.models import Question, SubmissionReceipt, SurveyAssignment, SurveyResponse
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class IdempotentSubmitTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = make_user('admin@example.com', role='ADMIN')
+        cls.employee = make_employee('employee@example.com')
+        cls.first, cls.second = (
+            SurveyAssignment.objects.create(survey=survey, employee=cls.employee, assigned_by=admin)
+            for survey in (make_survey(admin, 'First'), make_survey(admin, 'Second'))
+        )
+        cls.questions = {
+            assignment.pk: Question.objects.create(survey=assignment.survey, text='Comments', type='TEXT', order=1)
+            for assignment in (cls.first, cls.second)
+        }
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.employee.user)
+
+    def submit(self, assignment):
+        return self.client.post(
+            f'/api/surveys/forms/{assignment.survey_id}/submit/',
+            {
+                'assignment_id': assignment.pk,
+                'responses': [{'question_id': self.questions[assignment.pk].pk, 'answer': 'Fine'}]
+            },
+            format='json',
+            HTTP_IDEMPOTENCY_KEY='key-1'
+        )
+
+    def test_key_reused_for_another_assignment_is_a_conflict(self):
+        self.assertEqual(self.submit(self.first).status_code, 200)
+        cache.clear()
+
+        response = self.submit(self.second)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(SurveyResponse.objects.filter(assignment=self.second).exists())
+
+    def test_concurrent_reuse_for_another_assignment_is_a_conflict(self):
+        SubmissionReceipt.objects.create(
+            user=self.employee.user, key='key-1', assignment=self.first, fingerprint='other'
+        )
+        # The other request commits its receipt after this one looked for it.
+        lookups = [SubmissionReceipt.objects.none()]
+
+        def racing_filter(*args, **kwargs):
+            return lookups.pop() if lookups else SubmissionReceipt.objects.filter(*args, **kwargs)
+
+        with mock.patch.object(idempotency, 'SubmissionReceipt') as receipts:
+            receipts.objects.filter.side_effect = racing_filter
+            receipts.objects.create.side_effect = SubmissionReceipt.objects.create
+            response = self.submit(self.second)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(SurveyResponse.objects.filter(assignment=self.second).exists())
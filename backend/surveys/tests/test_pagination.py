@@ -0,0 +1,94 @@
+import datetime
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlsplit
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from config.pagination import KeysetPagination
+from surveys.models import Question, SurveyAssignment
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class QuestionKeysetPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = make_user('hr@example.com', role='HR')
+        survey = make_survey(cls.hr)
+        cls.questions = [
+            Question.objects.create(survey=survey, text=f'Q{number}', type='TEXT', order=number // 3)
+            for number in range(7)
+        ]
+
+    def walk(self, url, link):
+        """Follow ``link`` from ``url``; returns the pages' ids and the last response."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([item['id'] for item in response.data['results']])
+            url = response.data[link]
+        return pages, response
+
+    def test_pages_cover_shared_order_values_once(self):
+        self.client.force_authenticate(self.hr)
+        expected = [question.pk for question in sorted(self.questions, key=lambda q: (q.order, q.pk))]
+
+        pages, last = self.walk('/api/surveys/questions/?page_size=2', 'next')
+        self.assertEqual([pk for page in pages for pk in page], expected)
+
+        pages, _ = self.walk(last.data['previous'], 'previous')
+        self.assertEqual([pk for page in reversed(pages) for pk in page], expected[:-1])
+
+    def test_deleting_a_seen_row_does_not_skip_rows(self):
+        self.client.force_authenticate(self.hr)
+        first = self.client.get('/api/surveys/questions/?page_size=2')
+        self.questions[0].delete()
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual(
+            [item['id'] for item in second.data['results']], [self.questions[2].pk, self.questions[3].pk]
+        )
+
+    def test_lists_are_paginated_by_default(self):
+        self.client.force_authenticate(self.hr)
+
+        response = self.client.get('/api/surveys/questions/')
+
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+
+
+class NullableKeysetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = make_user('admin@example.com', role='ADMIN')
+        survey = make_survey(admin)
+        due_dates = [None, datetime.date(2026, 1, 2), None, datetime.date(2026, 1, 1), None]
+        cls.assignments = [
+            SurveyAssignment.objects.create(
+                survey=survey, employee=make_employee(f'e{number}@example.com'), due_date=due_date
+            )
+            for number, due_date in enumerate(due_dates)
+        ]
+
+    def page(self, pagination, query):
+        request = Request(APIRequestFactory().get('/assignments/', query))
+        view = SimpleNamespace(keyset_ordering=('due_date', 'id'))
+        rows = pagination.paginate_queryset(SurveyAssignment.objects.all(), request, view)
+        return [row.pk for row in rows], pagination.get_next_link()
+
+    def test_null_ordering_values_sort_last_across_pages(self):
+        expected = [
+            assignment.pk
+            for assignment in sorted(self.assignments, key=lambda a: (a.due_date is None, a.due_date, a.pk))
+        ]
+        pages, query = [], {'page_size': 2}
+        while query is not None:
+            pagination = KeysetPagination()
+            ids, link = self.page(pagination, query)
+            pages.append(ids)
+            query = None if link is None else dict(parse_qsl(urlsplit(link).query))
+
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual(len(pages), 3)
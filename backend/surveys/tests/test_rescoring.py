@@ -0,0 +1,42 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from surveys.models import Question, SurveyAssignment, SurveyResponse
+from surveys.rescoring import rescore
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class RescoreManualGradesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hr = make_user('hr@example.com', role='HR')
+        survey = make_survey(hr)
+        cls.text = Question.objects.create(
+            survey=survey, text='Why?', type='TEXTAREA', has_scoring=True, order=1, scoring_points=5
+        )
+        cls.guideless = Question.objects.create(
+            survey=survey, text='Pick', type='RADIO', options=['a', 'b'], has_scoring=True, order=2
+        )
+        cls.choice = Question.objects.create(
+            survey=survey, text='Choose', type='RADIO', options=['a', 'b'], has_scoring=True,
+            scoring_guide={'a': 1, 'b': 3}, order=3
+        )
+        cls.assignment = SurveyAssignment.objects.create(
+            survey=survey, employee=make_employee('e@example.com'), assigned_by=hr,
+            is_completed=True, completed_at=timezone.now(), total_score=10.0
+        )
+        SurveyResponse.objects.create(assignment=cls.assignment, question=cls.text, answer={'value': 'Pay'}, score=4)
+        SurveyResponse.objects.create(assignment=cls.assignment, question=cls.guideless, answer={'value': 'a'}, score=3)
+        SurveyResponse.objects.create(assignment=cls.assignment, question=cls.choice, answer={'value': 'b'}, score=1)
+
+    def score(self, question):
+        return SurveyResponse.objects.get(assignment=self.assignment, question=question).score
+
+    def test_manual_grades_are_kept(self):
+        result = rescore()
+
+        self.assertEqual(self.score(self.text), 4)
+        self.assertEqual(self.score(self.guideless), 3)
+        self.assertEqual(self.score(self.choice), 3)
+        self.assertEqual(result.responses_changed, 1)
+        self.assertEqual(SurveyAssignment.objects.get(pk=self.assignment.pk).total_score, 10.0)
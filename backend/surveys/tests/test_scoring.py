@@ -0,0 +1,14 @@
+from django.test import SimpleTestCase
+
+from surveys.scoring import _compile_guide
+
+
+class CompileGuideTests(SimpleTestCase):
+    def test_non_canonical_integer_keys_stay_strings(self):
+        lookup = _compile_guide({'--1': 1, '①': 2, '01': 3, '1': 4, '-2': 5})
+
+        self.assertEqual(lookup[1], 4)
+        self.assertEqual(lookup[-2], 5)
+        self.assertEqual(lookup['01'], 3)
+        self.assertEqual(lookup['①'], 2)
+        self.assertNotIn(-1, lookup)
@@ -0,0 +1,31 @@
+from rest_framework.test import APITestCase
+
+from surveys.models import Question, SurveyAssignment, SurveyResponse
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class SearchHighlightTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = make_user('hr@example.com', role='ADMIN')
+        survey = make_survey(cls.hr)
+        question = Question.objects.create(survey=survey, text='Comments', type='TEXTAREA', order=1)
+        assignment = SurveyAssignment.objects.create(
+            survey=survey, employee=make_employee('e@example.com'), assigned_by=cls.hr
+        )
+        SurveyResponse.objects.create(
+            assignment=assignment, question=question,
+            answer={'value': 'salary <script>alert(1)</script> <img src=x onerror="steal()">'}
+        )
+
+    def test_highlight_escapes_answer_html(self):
+        self.client.force_authenticate(self.hr)
+        response = self.client.get('/api/surveys/responses/search/', {'q': 'salary'})
+
+        self.assertEqual(response.status_code, 200)
+        highlight = response.data['results'][0]['highlight']
+        self.assertIn('<mark>salary</mark>', highlight)
+        self.assertNotIn('<script>', highlight)
+        self.assertNotIn('<img', highlight)
+        self.assertIn('&lt;script&gt;', highlight)
+        self.assertIn('&quot;steal()&quot;', highlight)
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from surveys.authoring import create_questions
+from surveys.counters import repair as repair_counters
+from surveys.models import Factor, Survey, SurveyAssignment, SurveyFactorStatistics, SurveyResponse, SurveyStatistics
+from surveys.statistics import rebuild
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class FactorStatisticsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.pay = Factor.objects.create(name='Pay')
+        cls.growth = Factor.objects.create(name='Growth')
+        cls.survey = make_survey(cls.admin)
+        cls.question, cls.growth_question = create_questions([
+            {'survey': cls.survey, 'text': 'Rate pay', 'type': 'RATING', 'has_scoring': True, 'factor': cls.pay},
+            {'survey': cls.survey, 'text': 'Rate growth', 'type': 'RATING', 'has_scoring': True, 'factor': cls.growth},
+        ])
+        cls.assignments, cls.responses = [], []
+        for number, score in enumerate([2, 4]):
+            assignment = SurveyAssignment.objects.create(
+                survey=cls.survey, employee=make_employee(f'e{number}@example.com'), assigned_by=cls.admin,
+                is_completed=True, completed_at=timezone.now(), total_score=score
+            )
+            cls.assignments.append(assignment)
+            cls.responses.append(SurveyResponse.objects.create(
+                assignment=assignment, question=cls.question, answer={'value': score}, score=score
+            ))
+        rebuild(cls.survey.pk)
+        repair_counters([cls.survey.pk])
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def factor_totals(self):
+        return {
+            row.factor_id: (row.response_count, row.score_sum)
+            for row in SurveyFactorStatistics.objects.filter(survey=self.survey)
+        }
+
+    def test_factor_reassignment_moves_statistics(self):
+        response = self.client.patch(f'/api/surveys/questions/{self.question.pk}/', {'factor': self.growth.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.factor_totals(), {self.growth.pk: (2, 6.0)})
+
+    def test_bulk_factor_reassignment_moves_statistics(self):
+        response = self.client.patch(
+            '/api/surveys/questions/bulk/', {'questions': [{'id': self.question.pk, 'factor': self.growth.pk}]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.factor_totals(), {self.growth.pk: (2, 6.0)})
+
+    def test_response_deletion_updates_statistics(self):
+        response = self.client.delete(f'/api/surveys/responses/{self.responses[0].pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.factor_totals(), {self.pay.pk: (1, 4.0)})
+
+    def test_question_deletion_updates_statistics(self):
+        response = self.client.delete(f'/api/surveys/questions/{self.question.pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.factor_totals(), {})
+
+    def test_response_update_moves_score_incrementally(self):
+        with mock.patch('surveys.views.rebuild_statistics') as rebuild_in_view, \
+                mock.patch('surveys.statistics.rebuild') as rebuild_in_delta:
+            response = self.client.patch(
+                f'/api/surveys/responses/{self.responses[0].pk}/', {'question': self.growth_question.pk}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        rebuild_in_view.assert_not_called()
+        rebuild_in_delta.assert_not_called()
+        self.assertEqual(self.factor_totals(), {self.pay.pk: (1, 4.0), self.growth.pk: (1, 2.0)})
+
+    def test_reopening_assignment_updates_statistics_and_counter(self):
+        response = self.client.patch(f'/api/surveys/assignments/{self.assignments[0].pk}/', {'is_completed': False})
+
+        self.assertEqual(response.status_code, 200)
+        statistics = SurveyStatistics.objects.get(survey=self.survey)
+        self.assertEqual((statistics.completed_assignments, statistics.score_sum), (1, 4.0))
+        self.assertEqual(Survey.objects.get(pk=self.survey.pk).response_count, 1)
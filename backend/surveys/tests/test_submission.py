@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from surveys.authoring import create_questions
+from surveys.models import Factor, SurveyAssignment, SurveyStatistics
+from surveys.tests.utils import make_employee, make_survey, make_user
+
+
+class SubmitTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = make_user('admin@example.com', role='ADMIN')
+        factor = Factor.objects.create(name='Pay', weight=2.0)
+        cls.survey = make_survey(admin)
+        cls.questions = create_questions([
+            {
+                'survey': cls.survey, 'text': f'Question {number}', 'type': 'RADIO', 'options': ['Yes', 'No'],
+                'has_scoring': True, 'scoring_guide': {'Yes': 3, 'No': 1}, 'factor': factor if number else None,
+                'order': number
+            }
+            for number in range(2)
+        ])
+        cls.employee = make_employee('employee@example.com')
+        cls.assignment = SurveyAssignment.objects.create(survey=cls.survey, employee=cls.employee, assigned_by=admin)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.employee.user)
+
+    def submit(self, answers):
+        return self.client.post(f'/api/surveys/forms/{self.survey.pk}/submit/', {
+            'assignment_id': self.assignment.pk,
+            'responses': [{'question_id': question.pk, 'answer': answer} for question, answer in answers]
+        }, format='json')
+
+    def test_partial_resubmission_keeps_stored_scores_in_total(self):
+        first, second = self.questions
+        self.assertEqual(self.submit([(first, 'Yes'), (second, 'Yes')]).data['total_score'], 9.0)
+
+        response = self.submit([(first, 'No')])
+
+        self.assertEqual(response.data['total_score'], 7.0)
+        self.assertEqual(SurveyAssignment.objects.get(pk=self.assignment.pk).total_score, 7.0)
+        self.assertEqual(SurveyStatistics.objects.get(survey=self.survey).score_sum, 7.0)
+
+    def test_resubmission_query_count(self):
+        self.submit([(question, 'Yes') for question in self.questions])
+
+        # Survey, lock, questions, draft, stored responses, one upsert and
+        # the assignment, statistics and rollup updates, whatever the length.
+        with self.assertNumQueries(20):
+            response = self.submit([(question, 'No') for question in self.questions])
+
+        self.assertEqual(response.status_code, 200)
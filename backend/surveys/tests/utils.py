@@ -0,0 +1,24 @@
+import datetime
+
+from departments.models import Department
+from users.models import Employee, User
+from surveys.models import Survey
+
+
+def make_department(name='Engineering'):
+    return Department.objects.create(name=name)
+
+
+def make_user(email, role='EMPLOYEE', department=None, **extra):
+    return User.objects.create_user(email, 'password', role=role, department=department, **extra)
+
+
+def make_employee(email, department=None, **extra):
+    user = make_user(email, department=department)
+    extra.setdefault('position', 'Developer')
+    extra.setdefault('hire_date', datetime.date(2023, 1, 1))
+    return Employee.objects.create(user=user, **extra)
+
+
+def make_survey(created_by, title='Survey'):
+    return Survey.objects.create(title=title, category='MID_CONTRACT', created_by=created_by)
@@ -1,17 +1,44 @@
-from django.utils import timezone
-from django.db.models import Sum, Avg, Count
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.db.models import Prefetch
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework import viewsets, status, permissions, filters
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Factor, Survey, Question, SurveyAssignment, SurveyResponse
+from .models import (
+    Factor, Survey, Question, SurveyAssignment, SurveyResponse,
+    SurveyStatistics, SurveyFactorStatistics, ResponseAnnotation
+)
 from .serializers import (
     FactorSerializer, SurveySerializer, QuestionSerializer,
     SurveyAssignmentSerializer, SurveyResponseSerializer,
     SurveyWithQuestionsSerializer, SurveySubmissionSerializer,
-    SurveyResponseSummarySerializer
+    SurveyResponseSummarySerializer, BulkScoreSerializer,
+    BulkSurveyAssignmentSerializer, BatchSubmissionSerializer, SurveyDraftSerializer,
+    QuestionItemSerializer, BulkQuestionCreateSerializer, BulkQuestionUpdateSerializer,
+    QuestionReorderSerializer, SurveyCloneSerializer
 )
+from .annotation import factor_sentiment
+from .answers import refresh as refresh_typed_answers
+from .assignment import bulk_assign, resolve_employees
+from .authoring import clone_survey, create_questions, reorder_questions, update_questions
+from .counters import adjust as adjust_counters
+from . import dashboard
+from .definitions import can_view, current_version, etag, forget_access, get_definition
+from . import drafts
+from .distribution import GROUPINGS, distribution, supports as supports_distribution
+from .exports import assignment_item, iter_csv, iter_ndjson, with_responses
+from .grading import apply_scores, validate_score
+from .idempotency import MAX_KEY_LENGTH, IdempotencyConflict, submit_once
+from .renderers import CSVRenderer, NDJSONRenderer
+from .search import search as search_responses
+from .statistics import StatisticsDelta, rebuild as rebuild_statistics, summarize
+from .submission import submit_batch, submit_for_user
+from analytics.rollups import assignment_facts, record_difference
+from jobs.views import accepted
 from users.permissions import IsAdmin, IsHROfficer, IsEmployee
 
 
@@ -47,12 +74,12 @@ class SurveyViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if user.role in ['ADMIN', 'HR']:
-            return Survey.objects.all()
+            return Survey.objects.all().select_related('created_by')
 
         # ✅ Allow employee to view both completed and pending surveys
         return Survey.objects.filter(
             assignments__employee__user=user
-        ).distinct()
+        ).select_related('created_by').distinct()
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -60,13 +87,100 @@ class SurveyViewSet(viewsets.ModelViewSet):
         return SurveySerializer
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_assign', 'clone']:
             self.permission_classes = [permissions.IsAuthenticated, IsAdmin | IsHROfficer]
         return super().get_permissions()
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        drafts.forget(instance.assignments.values_list('pk', flat=True))
+        instance.delete()
+    
+    @action(detail=True, methods=['post'])
+    def clone(self, request, pk=None):
+        """Duplicate the survey and all of its questions."""
+        survey = self.get_object()
+        serializer = SurveyCloneSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        clone = clone_survey(survey, request.user, serializer.validated_data.get('title'))
+        return Response(SurveySerializer(clone).data, status=status.HTTP_201_CREATED)
+    
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the survey definition from the cache, keyed by content version.
+        
+        Responses carry an ``ETag``; a repeated request with a matching
+        ``If-None-Match`` returns 304 without querying the database.
+        """
+        try:
+            survey_id = int(kwargs[self.lookup_field])
+        except ValueError:
+            raise Http404
+        version = current_version(survey_id)
+        if version is None:
+            raise Http404
+        if request.user.role not in ['ADMIN', 'HR'] and not can_view(survey_id, request.user, version):
+            raise Http404
+        
+        tag = etag(survey_id, version)
+        response = get_conditional_response(request, etag=tag)
+        if response is None:
+            response = Response(get_definition(survey_id, version, lambda: self._render_definition(survey_id)))
+        response['ETag'] = tag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    def _render_definition(self, survey_id):
+        survey = Survey.objects.select_related('created_by').prefetch_related(
+            Prefetch('questions', queryset=Question.objects.select_related('factor'))
+        ).get(pk=survey_id)
+        return SurveyWithQuestionsSerializer(survey, context=self.get_serializer_context()).data
+    
+    @action(detail=True, methods=['post'])
+    def bulk_assign(self, request, pk=None):
+        """Assign the survey to employees, departments or all active employees."""
+        survey = self.get_object()
+        serializer = BulkSurveyAssignmentSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not survey.is_active:
+            return Response(
+                {'detail': 'Cannot assign inactive survey'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # HR can only assign to employees in their department
+        department = None
+        if request.user.role == 'HR':
+            department = request.user.department
+            if department is None:
+                return Response(
+                    {'detail': 'HR officers without a department cannot assign surveys'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+        
+        data = serializer.validated_data
+        employee_ids = resolve_employees(
+            employee_ids=data['employee_ids'],
+            department_ids=data['department_ids'],
+            all_active=data['all_active'],
+            department=department
+        )
+        created, skipped = bulk_assign(survey, employee_ids, request.user, data.get('due_date'))
+        
+        return Response({
+            'assignments_created': created,
+            'skipped': skipped,
+            'targeted': len(employee_ids)
+        })
+    
     @action(detail=True, methods=['get'])
     def responses(self, request, pk=None):
         """Get all responses for a survey."""
@@ -83,41 +197,36 @@ class SurveyViewSet(viewsets.ModelViewSet):
         """Get statistics for a survey."""
         survey = self.get_object()
         
-        # Get all completed assignments for this survey
-        completed_assignments = SurveyAssignment.objects.filter(
-            survey=survey,
-            is_completed=True
-        )
+        try:
+            stats = SurveyStatistics.objects.get(survey=survey)
+        except SurveyStatistics.DoesNotExist:
+            rebuild_statistics(survey.id)
+            stats = SurveyStatistics.objects.get(survey=survey)
         
-        # Total assignments and completion rate
-        total_assignments = SurveyAssignment.objects.filter(survey=survey).count()
-        completed_count = completed_assignments.count()
+        # Completion rate and average score from the running totals
+        total_assignments = stats.total_assignments
+        completed_count = stats.completed_assignments
         completion_rate = (completed_count / total_assignments * 100) if total_assignments > 0 else 0
-        
-        # Average score
-        avg_score = completed_assignments.filter(total_score__isnull=False).aggregate(
-            avg_score=Avg('total_score')
-        )
+        avg_score, score_std_dev = summarize(stats.score_count, stats.score_sum, stats.score_sum_sq)
         
         # Factor analysis
         factors_data = []
-        for factor in Factor.objects.filter(questions__survey=survey).distinct():
-            factor_responses = SurveyResponse.objects.filter(
-                question__survey=survey,
-                question__factor=factor,
-                score__isnull=False
+        factor_stats = SurveyFactorStatistics.objects.filter(
+            survey=survey,
+            response_count__gt=0
+        ).select_related('factor').order_by('factor_id')
+        for factor_stat in factor_stats:
+            avg_factor_score, factor_std_dev = summarize(
+                factor_stat.response_count, factor_stat.score_sum, factor_stat.score_sum_sq
             )
-            
-            if factor_responses.exists():
-                avg_factor_score = factor_responses.aggregate(avg_score=Avg('score'))
-                
-                factors_data.append({
-                    'id': factor.id,
-                    'name': factor.name,
-                    'type': factor.type,
-                    'avg_score': avg_factor_score['avg_score'],
-                    'response_count': factor_responses.count()
-                })
+            factors_data.append({
+                'id': factor_stat.factor.id,
+                'name': factor_stat.factor.name,
+                'type': factor_stat.factor.type,
+                'avg_score': avg_factor_score,
+                'std_dev': factor_std_dev,
+                'response_count': factor_stat.response_count
+            })
         
         return Response({
             'survey_id': survey.id,
@@ -125,10 +234,31 @@ class SurveyViewSet(viewsets.ModelViewSet):
             'total_assignments': total_assignments,
             'completed_assignments': completed_count,
             'completion_rate': completion_rate,
-            'avg_score': avg_score['avg_score'],
-            'factor_analysis': factors_data
+            'avg_score': avg_score,
+            'score_std_dev': score_std_dev,
+            'factor_analysis': factors_data,
+            'text_sentiment': [
+                {
+                    'factor_id': row['factor_id'],
+                    'factor_name': row['factor__name'],
+                    'avg_sentiment': row['avg_sentiment'],
+                    'negative_share': row['negative_count'] / row['response_count'],
+                    'response_count': row['response_count']
+                }
+                for row in factor_sentiment(survey.id)
+            ]
         })
     
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated, IsAdmin])
+    def rescore(self, request, pk=None):
+        """
+        Queue recomputation of stored scores and totals after scoring or
+        weight changes. Returns 202 with the id of the background job.
+        """
+        survey = self.get_object()
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+        return accepted(request, 'surveys.rescore', {'survey_id': survey.id, 'dry_run': dry_run})
+    
     @action(detail=True, methods=['post'])
     def submit(self, request, pk=None):
         """Submit survey responses."""
@@ -137,58 +267,38 @@ class SurveyViewSet(viewsets.ModelViewSet):
         
         if serializer.is_valid():
             assignment_id = serializer.validated_data.get('assignment_id')
+            responses_data = serializer.validated_data.get('responses', [])
+            key = request.headers.get('Idempotency-Key')
+            replayed = False
             
-            try:
-                assignment = SurveyAssignment.objects.get(
-                    id=assignment_id, 
-                    survey=survey,
-                    employee__user=request.user
+            if key is not None and not 0 < len(key) <= MAX_KEY_LENGTH:
+                return Response(
+                    {'detail': f'Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters'},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
+            
+            try:
+                if key is None:
+                    total_score = submit_for_user(survey, request.user, assignment_id, responses_data)
+                else:
+                    total_score, replayed = submit_once(
+                        survey, request.user, assignment_id, responses_data, key
+                    )
             except SurveyAssignment.DoesNotExist:
                 return Response(
                     {'detail': 'Survey assignment not found'}, 
                     status=status.HTTP_404_NOT_FOUND
                 )
-            
-            # Create responses and calculate scores
-            responses = []
-            total_score = 0
-            
-            for response_data in serializer.validated_data.get('responses', []):
-                question_id = response_data.get('question_id')
-                answer = response_data.get('answer')
-                
-                try:
-                    question = Question.objects.get(id=question_id, survey=survey)
-                except Question.DoesNotExist:
-                    continue
-                
-                response, created = SurveyResponse.objects.update_or_create(
-                    assignment=assignment,
-                    question=question,
-                    defaults={'answer': answer}
+            except IdempotencyConflict:
+                return Response(
+                    {'detail': 'Idempotency-Key was already used for a different submission'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
                 )
-                
-                # Calculate and save score if question has scoring
-                if question.has_scoring:
-                    response.score = response.calculate_score()
-                    response.save()
-                    
-                    # Add to total score if there's a valid score
-                    if response.score is not None and question.factor:
-                        # Apply factor weight to the score
-                        weighted_score = response.score * question.factor.weight
-                        total_score += weighted_score
-                
-                responses.append(response)
             
-            # Mark assignment as completed and save total score
-            assignment.is_completed = True
-            assignment.completed_at = timezone.now()
-            assignment.total_score = total_score
-            assignment.save()
-            
-            return Response({'status': 'survey submitted', 'total_score': total_score}, status=status.HTTP_200_OK)
+            response = Response({'status': 'survey submitted', 'total_score': total_score}, status=status.HTTP_200_OK)
+            if replayed:
+                response['Idempotent-Replayed'] = 'true'
+            return response
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -202,12 +312,124 @@ class QuestionViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsAdmin | IsHROfficer]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['survey', 'type', 'has_scoring']
+    keyset_ordering = ('order', 'id')
     
     def get_queryset(self):
         survey_id = self.request.query_params.get('survey_id')
         if survey_id:
             return Question.objects.filter(survey_id=survey_id).order_by('order')
         return Question.objects.all().order_by('order')
+    
+    @transaction.atomic
+    def perform_create(self, serializer):
+        question = serializer.save()
+        adjust_counters(question.survey_id, questions=1)
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_survey_id = serializer.instance.survey_id
+        old_shape = (serializer.instance.type, serializer.instance.options)
+        old_factor_id = serializer.instance.factor_id
+        question = serializer.save()
+        if (question.type, question.options) != old_shape:
+            refresh_typed_answers(question)
+        if question.factor_id != old_factor_id:
+            ResponseAnnotation.objects.filter(response__question=question).update(factor_id=question.factor_id)
+        if question.survey_id != old_survey_id:
+            Survey.bump_content_version([old_survey_id])
+            adjust_counters(old_survey_id, questions=-1)
+            adjust_counters(question.survey_id, questions=1)
+            rebuild_statistics(old_survey_id)
+        if (question.survey_id, question.factor_id) != (old_survey_id, old_factor_id):
+            rebuild_statistics(question.survey_id)
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        survey_id = instance.survey_id
+        instance.delete()
+        adjust_counters(survey_id, questions=-1)
+        rebuild_statistics(survey_id)
+    
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """
+        Create (POST) or partially update (PATCH) many questions at once.
+        
+        POST takes ``survey`` and a list of ``questions``; PATCH takes
+        ``questions`` with an ``id`` each. All changes are applied in one
+        transaction.
+        """
+        if request.method == 'POST':
+            serializer = BulkQuestionCreateSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            survey = serializer.validated_data['survey']
+            questions = create_questions([
+                {**item, 'survey': survey} for item in serializer.validated_data['questions']
+            ])
+            return Response(QuestionSerializer(questions, many=True).data, status=status.HTTP_201_CREATED)
+        
+        serializer = BulkQuestionUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        items = serializer.validated_data['questions']
+        questions = Question.objects.select_related('factor').in_bulk([item['id'] for item in items])
+        
+        changes, errors = [], {}
+        for item in items:
+            question = questions.get(item['id'])
+            if question is None:
+                errors[item['id']] = {'id': ['Question not found']}
+                continue
+            if 'survey' in item:
+                errors[item['id']] = {'survey': ['Questions cannot be moved between surveys here']}
+                continue
+            item_serializer = QuestionItemSerializer(question, data=item, partial=True)
+            if item_serializer.is_valid():
+                changes.append((question, item_serializer.validated_data))
+            else:
+                errors[item['id']] = item_serializer.errors
+        if errors:
+            return Response({'questions': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(QuestionSerializer(update_questions(changes), many=True).data)
+    
+    @action(detail=False, methods=['post'])
+    def reorder(self, request):
+        """Set the order of all questions of a survey from a list of ids."""
+        serializer = QuestionReorderSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        reorder_questions(serializer.validated_data['survey'], serializer.validated_data['question_ids'])
+        return Response({'status': 'reordered'})
+    
+    @action(detail=True, methods=['get'])
+    def distribution(self, request, pk=None):
+        """
+        Answer histogram of a closed-form question.
+        
+        ``group_by`` takes a comma-separated subset of ``department`` and
+        ``month``. HR officers only see their own department.
+        """
+        question = self.get_object()
+        if not supports_distribution(question):
+            return Response(
+                {'detail': 'Distributions are only available for choice and rating questions'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        group_by = [name for name in request.query_params.get('group_by', '').split(',') if name]
+        unknown = set(group_by) - set(GROUPINGS)
+        if unknown:
+            return Response(
+                {'group_by': f"Unknown grouping: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        responses = SurveyResponse.objects.all()
+        if request.user.role == 'HR':
+            responses = responses.filter(assignment__employee__user__department=request.user.department)
+        return Response(distribution(question, group_by, responses))
 
 
 class SurveyAssignmentViewSet(viewsets.ModelViewSet):
@@ -228,31 +450,150 @@ class SurveyAssignmentViewSet(viewsets.ModelViewSet):
                 # HR can see assignments for employees in their department
                 return SurveyAssignment.objects.filter(
                     employee__user__department=user.department
-                ).select_related('survey', 'employee__user')
-            return SurveyAssignment.objects.all().select_related('survey', 'employee__user')
+                ).select_related('survey__created_by', 'employee__user', 'assigned_by')
+            return SurveyAssignment.objects.all().select_related(
+                'survey__created_by', 'employee__user', 'assigned_by'
+            )
         
         # Employees can only see their own assignments
         return SurveyAssignment.objects.filter(
             employee__user=user
-        ).select_related('survey', 'employee__user')
+        ).select_related('survey__created_by', 'employee__user', 'assigned_by')
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             self.permission_classes = [permissions.IsAuthenticated, IsAdmin | IsHROfficer]
         return super().get_permissions()
     
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(assigned_by=self.request.user)
+        assignment = serializer.save(assigned_by=self.request.user)
+        delta = StatisticsDelta(assignment.survey_id)
+        delta.assignment(1, assignment.is_completed, assignment.total_score)
+        adjust_counters(delta.survey_id, responses=delta.completed)
+        delta.apply()
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old = serializer.instance
+        old_survey_id, old_completed, old_total = old.survey_id, old.is_completed, old.total_score
+        old_user_id = old.employee.user_id
+        before = assignment_facts([old.pk])
+        assignment = serializer.save()
+        if (old_survey_id, old_user_id) != (assignment.survey_id, assignment.employee.user_id):
+            forget_access(old_survey_id, [old_user_id])
+        record_difference(before, assignment_facts([assignment.pk]))
+        removed = StatisticsDelta(old_survey_id)
+        removed.assignment(-1, old_completed, old_total)
+        added = StatisticsDelta(assignment.survey_id)
+        added.assignment(1, assignment.is_completed, assignment.total_score)
+        if added.survey_id == removed.survey_id:
+            added.merge(removed)
+            deltas = [added]
+        else:
+            deltas = [removed, added]
+        for delta in deltas:
+            adjust_counters(delta.survey_id, responses=delta.completed)
+            delta.apply()
+    
+    def perform_destroy(self, instance):
+        delta = StatisticsDelta(instance.survey_id)
+        delta.assignment(-1, instance.is_completed, instance.total_score)
+        for factor_id, score in instance.responses.values_list('question__factor_id', 'score'):
+            delta.response(-1, factor_id, score)
+        with transaction.atomic():
+            drafts.forget([instance.pk])
+            instance.delete()
+            adjust_counters(delta.survey_id, responses=delta.completed)
+            delta.apply()
+    
+    @action(detail=False, methods=['post'])
+    def batch_submit(self, request):
+        """
+        Submit many completed assignments in one request.
+        
+        Employees may only submit their own assignments; HR officers those of
+        their department. Returns a result per submission, in order.
+        """
+        serializer = BatchSubmissionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = submit_batch(
+            self.get_queryset().select_related(None),
+            serializer.validated_data['submissions']
+        )
+        return Response({
+            'submitted': sum(1 for result in results if result['status'] == 'submitted'),
+            'failed': sum(1 for result in results if result['status'] != 'submitted'),
+            'results': results
+        })
+    
+    @action(detail=True, methods=['get', 'put', 'patch', 'delete'])
+    def draft(self, request, pk=None):
+        """
+        Autosaved answers of one of the user's own in-progress assignments.
+        
+        PATCH merges ``answers`` (keyed by question id) into the draft and
+        PUT replaces them; the final ``submit`` takes the draft into account.
+        """
+        try:
+            assignment_id = int(pk)
+        except ValueError:
+            raise Http404
+        entry = drafts.load(assignment_id, request.user)
+        if entry is None:
+            raise Http404
+        
+        if request.method == 'GET':
+            return Response({'answers': entry['answers'], 'saved_at': entry['saved_at']})
+        
+        if request.method == 'DELETE':
+            drafts.discard(assignment_id)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        
+        if entry['is_completed']:
+            return Response(
+                {'detail': 'Survey already completed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = SurveyDraftSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        entry = drafts.save(entry, serializer.validated_data['answers'], replace=request.method == 'PUT')
+        return Response({'saved_at': entry['saved_at'], 'answer_count': len(entry['answers'])})
     
     @action(detail=False, methods=['get'])
     def my_assignments(self, request):
-        """Get current user's survey assignments."""
-        assignments = SurveyAssignment.objects.filter(
+        """
+        Get current user's pending survey assignments.
+        
+        Reads only the columns the employee dashboard shows, in one query.
+        """
+        rows = SurveyAssignment.objects.filter(
             employee__user=request.user,
             is_completed=False
+        ).order_by('id').values(
+            'id', 'survey_id', 'assigned_at', 'due_date', 'is_completed',
+            'survey__title', 'survey__description', 'survey__category', 'survey__question_count'
         )
-        serializer = self.get_serializer(assignments, many=True)
-        return Response(serializer.data)
+        return Response([
+            {
+                'id': row['id'],
+                'survey': row['survey_id'],
+                'survey_details': {
+                    'id': row['survey_id'],
+                    'title': row['survey__title'],
+                    'description': row['survey__description'],
+                    'category': row['survey__category'],
+                    'question_count': row['survey__question_count'],
+                },
+                'assigned_at': row['assigned_at'],
+                'due_date': row['due_date'],
+                'is_completed': row['is_completed'],
+            }
+            for row in rows
+        ])
     
     @action(detail=True, methods=['get'])
     def responses(self, request, pk=None):
@@ -263,6 +604,10 @@ class SurveyAssignmentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+SEARCH_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+
 class SurveyResponseViewSet(viewsets.ModelViewSet):
     """
     API endpoint for survey responses.
@@ -289,14 +634,102 @@ class SurveyResponseViewSet(viewsets.ModelViewSet):
             assignment__employee__user=user
         ).select_related('assignment', 'question')
     
+    @transaction.atomic
+    def perform_create(self, serializer):
+        response = serializer.save()
+        delta = StatisticsDelta(response.question.survey_id)
+        delta.response(1, response.question.factor_id, response.score)
+        delta.apply()
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old = serializer.instance
+        old_survey_id, old_factor_id, old_score = old.question.survey_id, old.question.factor_id, old.score
+        response = serializer.save()
+        removed = StatisticsDelta(old_survey_id)
+        removed.response(-1, old_factor_id, old_score)
+        added = StatisticsDelta(response.question.survey_id)
+        added.response(1, response.question.factor_id, response.score)
+        if added.survey_id == removed.survey_id:
+            added.merge(removed)
+            added.apply()
+        else:
+            removed.apply()
+            added.apply()
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        delta = StatisticsDelta(instance.question.survey_id)
+        delta.response(-1, instance.question.factor_id, instance.score)
+        instance.delete()
+        delta.apply()
+    
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_score']:
             self.permission_classes = [permissions.IsAuthenticated, IsAdmin | IsHROfficer]
         return super().get_permissions()
     
-    @action(detail=False, methods=['get'], url_path='by_survey')
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over free-text answers, best matches first.
+        
+        Takes ``q`` and optionally ``survey_id``, ``question_id`` and
+        ``limit`` (default 20, at most 100).
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'detail': 'q parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', SEARCH_LIMIT)), 1), SEARCH_MAX_LIMIT)
+        except ValueError:
+            limit = SEARCH_LIMIT
+        
+        responses = self.get_queryset()
+        survey_id = request.query_params.get('survey_id')
+        if survey_id:
+            responses = responses.filter(assignment__survey_id=survey_id)
+        question_id = request.query_params.get('question_id')
+        if question_id:
+            responses = responses.filter(question_id=question_id)
+        
+        results = search_responses(responses, query).order_by('-rank', '-id').values(
+            'id', 'assignment_id', 'assignment__survey_id', 'question_id', 'question__text',
+            'answer_text', 'submitted_at', 'rank', 'highlight'
+        )[:limit]
+        return Response({
+            'query': query,
+            'results': [
+                {
+                    'id': row['id'],
+                    'assignment': row['assignment_id'],
+                    'survey': row['assignment__survey_id'],
+                    'question': row['question_id'],
+                    'question_text': row['question__text'],
+                    'answer_text': row['answer_text'],
+                    'submitted_at': row['submitted_at'],
+                    'rank': row['rank'],
+                    'highlight': row['highlight'],
+                }
+                for row in results
+            ]
+        })
+    
+    @action(
+        detail=False, methods=['get'], url_path='by_survey',
+        renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer, CSVRenderer]
+    )
     def by_survey(self, request):
-        """Get responses grouped by survey assignment."""
+        """
+        Get responses grouped by survey assignment.
+        
+        ``?format=ndjson`` streams one assignment per line and ``?format=csv``
+        streams one response per row.
+        """
         survey_id = request.query_params.get('survey_id')
         
         if not survey_id:
@@ -317,7 +750,7 @@ class SurveyResponseViewSet(viewsets.ModelViewSet):
         assignments = SurveyAssignment.objects.filter(
             survey=survey,
             is_completed=True
-        ).select_related('employee__user').prefetch_related('responses__question')
+        )
         
         # Check permissions
         user = request.user
@@ -330,38 +763,15 @@ class SurveyResponseViewSet(viewsets.ModelViewSet):
             # Employees can only see their own assignments
             assignments = assignments.filter(employee__user=user)
         
-        response_data = []
+        export_format = request.query_params.get('format')
+        if export_format == 'ndjson':
+            return StreamingHttpResponse(iter_ndjson(assignments), content_type='application/x-ndjson')
+        if export_format == 'csv':
+            response = StreamingHttpResponse(iter_csv(assignments), content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="survey-{survey.id}-responses.csv"'
+            return response
         
-        for assignment in assignments:
-            # Get all responses for this assignment
-            responses = assignment.responses.all().select_related('question')
-            
-            response_items = []
-            for response in responses:
-                response_items.append({
-                    'id': response.id,
-                    'question_text': response.question.text,
-                    'question_id': response.question.id,
-                    'answer': response.answer,
-                    'score': response.score,
-                    'max_points': response.question.scoring_points,
-                    'has_scoring': response.question.has_scoring
-                })
-            
-            response_data.append({
-                'id': assignment.id,
-                'employee_details': {
-                    'name': f"{assignment.employee.user.first_name} {assignment.employee.user.last_name}".strip() or assignment.employee.user.username,
-                    'email': assignment.employee.user.email,
-                    'department': getattr(assignment.employee.user, 'department', 'N/A'),
-                    'position': getattr(assignment.employee, 'position', 'N/A')
-                },
-                'completed_at': assignment.completed_at,
-                'total_score': assignment.total_score,
-                'responses': response_items
-            })
-        
-        return Response(response_data)
+        return Response([assignment_item(assignment) for assignment in with_responses(assignments)])
 
     @action(detail=True, methods=['patch'])
     def score(self, request, pk=None):
@@ -377,199 +787,80 @@ class SurveyResponseViewSet(viewsets.ModelViewSet):
             
         try:
             score = float(score)
-            
-            # Validate score against max points
-            if response.question.has_scoring:
-                max_points = response.question.scoring_points
-                if score < 0 or score > max_points:
-                    return Response(
-                        {'detail': f'Score must be between 0 and {max_points}'}, 
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            
-            response.score = score
-            response.save()
-            
-            # Recalculate total score for the assignment
-            assignment = response.assignment
-            
-            # Get all responses for this assignment that have scoring enabled
-            scored_responses = assignment.responses.filter(
-                question__has_scoring=True,
-                score__isnull=False
-            )
-            
-            # Calculate total with factor weights
-            total_score = 0
-            for resp in scored_responses:
-                if resp.question.factor:
-                    # Apply factor weight to the score
-                    weighted_score = resp.score * resp.question.factor.weight
-                    total_score += weighted_score
-                else:
-                    # If no factor, just add the raw score
-                    total_score += resp.score
-            
-            assignment.total_score = total_score
-            assignment.save()
-            
-            return Response({
-                'status': 'score updated',
-                'score': score,
-                'total_score': total_score
-            })
-            
-        except ValueError:
+        except (TypeError, ValueError):
             return Response(
                 {'detail': 'Invalid score value'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
-# views.py (add at the bottom or create analytics/views.py)
-from django.db.models import Count, Avg, Q
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
-
-from users.models import Employee
-from surveys.models import SurveyAssignment, SurveyResponse, Factor
-
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def turnover_analytics(request):
-    user = request.user
-    is_hr = user.role == 'HR'
-    
-    # Scope employees
-    employees = Employee.objects.select_related('user')
-    if is_hr:
-        employees = employees.filter(user__department=user.department)
-
-    # Risk counts
-    risk_levels = {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
-    high_risk_employees = []
-    for emp in employees:
-        risk = getattr(emp, 'turnover_risk', None)
-        if risk:
-            risk_levels[risk] += 1
-            if risk == 'HIGH':
-                high_risk_employees.append({
-                    'name': f"{emp.user.first_name} {emp.user.last_name}".strip() or emp.user.username,
-                    'department': getattr(emp.user.department, 'name', 'N/A')
-                })
-
-    # Department counts
-    dept_counts = employees.values('user__department__name').annotate(count=Count('id'))
-    by_department = [{'name': d['user__department__name'] or 'N/A', 'count': d['count']} for d in dept_counts]
-
-    # Risk by department
-    dept_risk = employees.values('user__department__name', 'turnover_risk').annotate(count=Count('id'))
-    risk_by_department = {}
-    for row in dept_risk:
-        dept = row['user__department__name'] or 'N/A'
-        risk = row['turnover_risk']
-        if dept not in risk_by_department:
-            risk_by_department[dept] = {'department': dept, 'lowRiskCount': 0, 'mediumRiskCount': 0, 'highRiskCount': 0}
-        if risk == 'LOW':
-            risk_by_department[dept]['lowRiskCount'] += row['count']
-        elif risk == 'MEDIUM':
-            risk_by_department[dept]['mediumRiskCount'] += row['count']
-        elif risk == 'HIGH':
-            risk_by_department[dept]['highRiskCount'] += row['count']
-
-    # Pending and completed surveys
-    assignments = SurveyAssignment.objects.all()
-    if is_hr:
-        assignments = assignments.filter(employee__user__department=user.department)
-    pending = assignments.filter(is_completed=False).count()
-    completed = assignments.filter(is_completed=True).count()
+        
+        # Validate score against max points
+        error = validate_score(response, score)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Update the assignment total by the change in weighted score
+        totals = apply_scores(self.get_queryset(), {response.pk: score})
+        
+        return Response({
+            'status': 'score updated',
+            'score': score,
+            'total_score': totals[response.assignment_id]
+        })
 
-    # Top risk factors by avg score
-    top_factors_qs = SurveyResponse.objects.filter(
-        score__isnull=False,
-        question__factor__type='TURNOVER'
-    ).values('question__factor__name').annotate(avg=Avg('score')).order_by('-avg')[:5]
-    top_factors = [{'factor': f['question__factor__name'], 'avgScore': round(f['avg'], 2)} for f in top_factors_qs]
+    @action(detail=False, methods=['post'])
+    def bulk_score(self, request):
+        """Update many response scores in one request."""
+        serializer = BulkScoreSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        scores = {item['response_id']: item['score'] for item in serializer.validated_data['scores']}
+        queryset = self.get_queryset()
+        responses = {
+            response.pk: response
+            for response in queryset.filter(pk__in=scores).select_related('question')
+        }
+        
+        errors = {}
+        for response_id, score in scores.items():
+            response = responses.get(response_id)
+            if response is None:
+                errors[response_id] = 'Response not found'
+                continue
+            error = validate_score(response, score)
+            if error:
+                errors[response_id] = error
+        
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        totals = apply_scores(queryset, scores)
+        
+        return Response({
+            'status': 'scores updated',
+            'updated': len(scores),
+            'totals': totals
+        })
 
-    return Response({
-        'total': employees.count(),
-        'byRisk': [
-            {'name': 'Low Risk', 'value': risk_levels['LOW'], 'color': '#16A34A'},
-            {'name': 'Medium Risk', 'value': risk_levels['MEDIUM'], 'color': '#EAB308'},
-            {'name': 'High Risk', 'value': risk_levels['HIGH'], 'color': '#DC2626'},
-        ],
-        'byDepartment': by_department,
-        'pendingSurveys': pending,
-        'completedSurveys': completed,
-        'highRiskEmployees': high_risk_employees,
-        'topRiskFactors': top_factors,
-        'riskByDepartment': list(risk_by_department.values()),
-    })
 
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([permissions.IsAuthenticated])
 def turnover_analytics(request):
+    """
+    Turnover dashboard: HR officers see their department, everyone else all
+    employees. ``high_risk_limit`` (default 10, at most 100) and
+    ``high_risk_offset`` page through the high-risk employees, highest
+    risk score first.
+    """
     user = request.user
-    is_hr = user.role == 'HR'
-
-    employees = Employee.objects.select_related('user')
-    if is_hr:
-        employees = employees.filter(user__department=user.department)
-
-    risk_levels = {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
-    high_risk_employees = []
-
-    for emp in employees:
-        risk = getattr(emp, 'turnover_risk', None)
-        if risk:
-            risk_levels[risk] += 1
-            if risk == 'HIGH':
-                high_risk_employees.append({
-                    'name': f"{emp.user.first_name} {emp.user.last_name}".strip() or emp.user.username,
-                    'department': getattr(emp.user.department, 'name', 'N/A')
-                })
-
-    dept_counts = employees.values('user__department__name').annotate(count=Count('id'))
-    by_department = [{'name': d['user__department__name'] or 'N/A', 'count': d['count']} for d in dept_counts]
-
-    dept_risk = employees.values('user__department__name', 'turnover_risk').annotate(count=Count('id'))
-    risk_by_department = {}
-    for row in dept_risk:
-        dept = row['user__department__name'] or 'N/A'
-        risk = row['turnover_risk']
-        if dept not in risk_by_department:
-            risk_by_department[dept] = {'department': dept, 'lowRiskCount': 0, 'mediumRiskCount': 0, 'highRiskCount': 0}
-        if risk == 'LOW':
-            risk_by_department[dept]['lowRiskCount'] += row['count']
-        elif risk == 'MEDIUM':
-            risk_by_department[dept]['mediumRiskCount'] += row['count']
-        elif risk == 'HIGH':
-            risk_by_department[dept]['highRiskCount'] += row['count']
-
-    assignments = SurveyAssignment.objects.all()
-    if is_hr:
-        assignments = assignments.filter(employee__user__department=user.department)
-
-    pending = assignments.filter(is_completed=False).count()
-    completed = assignments.filter(is_completed=True).count()
-
-    top_factors_qs = SurveyResponse.objects.filter(
-        score__isnull=False,
-        question__factor__type='TURNOVER'
-    ).values('question__factor__name').annotate(avg=Avg('score')).order_by('-avg')[:5]
-
-    top_factors = [{'factor': f['question__factor__name'], 'avgScore': round(f['avg'], 2)} for f in top_factors_qs]
-
-    return Response({
-        'total': employees.count(),
-        'byRisk': [
-            {'name': 'Low Risk', 'value': risk_levels['LOW'], 'color': '#16A34A'},
-            {'name': 'Medium Risk', 'value': risk_levels['MEDIUM'], 'color': '#EAB308'},
-            {'name': 'High Risk', 'value': risk_levels['HIGH'], 'color': '#DC2626'},
-        ],
-        'byDepartment': by_department,
-        'pendingSurveys': pending,
-        'completedSurveys': completed,
-        'highRiskEmployees': high_risk_employees,
-        'topRiskFactors': top_factors,
-        'riskByDepartment': list(risk_by_department.values()),
-    })
\ No newline at end of file
+    department_id = user.department_id if user.role == 'HR' else dashboard.ALL
+    try:
+        limit = min(
+            max(int(request.query_params.get('high_risk_limit', dashboard.HIGH_RISK_PAGE_SIZE)), 1),
+            dashboard.HIGH_RISK_MAX_PAGE_SIZE
+        )
+        offset = max(int(request.query_params.get('high_risk_offset', 0)), 0)
+    except ValueError:
+        return Response({'detail': 'high_risk_limit and high_risk_offset must be integers.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    return Response(dashboard.turnover_dashboard(department_id, limit, offset))
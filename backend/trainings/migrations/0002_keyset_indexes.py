@@ -0,0 +1,20 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0001_initial'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trainingassignment',
+            index=models.Index(fields=['employee', 'id'], name='trainassign_employee_id_idx'),
+        ),
+    ]
@@ -71,6 +71,9 @@ class TrainingAssignment(models.Model):
     
     class Meta:
         unique_together = ['training', 'employee']
+        indexes = [
+            models.Index(fields=['employee', 'id'], name='trainassign_employee_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.training.title} - {self.employee.user.email}"
\ No newline at end of file
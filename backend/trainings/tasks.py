@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+
+from jobs.registry import register
+from users.models import Employee
+from .models import Training, TrainingAssignment
+
+User = get_user_model()
+
+
+def assign_employees(training, employee_ids, assigned_by, notes=''):
+    """Assign a training to employees, returning ``(created, errors)``."""
+    assignments = []
+    errors = []
+    
+    for employee_id in employee_ids:
+        try:
+            employee = Employee.objects.get(id=employee_id)
+            
+            # Check if assignment already exists
+            if TrainingAssignment.objects.filter(
+                training=training,
+                employee=employee
+            ).exists():
+                errors.append(f"Employee {employee.user.email} already assigned")
+                continue
+            
+            assignment = TrainingAssignment.objects.create(
+                training=training,
+                employee=employee,
+                assigned_by=assigned_by,
+                notes=notes
+            )
+            assignments.append(assignment)
+            
+        except Employee.DoesNotExist:
+            errors.append(f"Employee ID {employee_id} not found")
+    
+    return len(assignments), errors
+
+
+@register('trainings.assign')
+def assign_task(job, training_id, employee_ids, assigned_by_id=None, notes=''):
+    training = Training.objects.get(pk=training_id)
+    assigned_by = User.objects.filter(pk=assigned_by_id).first()
+    created, errors = assign_employees(training, employee_ids, assigned_by, notes)
+    return {
+        'assignments_created': created,
+        'errors': errors if errors else None
+    }
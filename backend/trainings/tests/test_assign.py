@@ -0,0 +1,49 @@
+import datetime
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from jobs.models import Job
+from jobs.worker import claim, execute
+from surveys.tests.utils import make_employee, make_user
+from trainings.models import Training, TrainingAssignment
+
+
+class AssignTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='ADMIN')
+        cls.training = Training.objects.create(
+            title='Onboarding', description='Basics', start_date=datetime.date(2026, 1, 1),
+            end_date=datetime.date(2026, 1, 2), created_by=cls.admin
+        )
+        cls.employees = [make_employee(f'e{number}@example.com') for number in range(3)]
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def assign(self):
+        return self.client.post(f'/api/trainings/programs/{self.training.pk}/assign/', {
+            'employee_ids': [employee.pk for employee in self.employees]
+        }, format='json')
+
+    def test_small_batch_is_assigned_in_the_request(self):
+        response = self.assign()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'assignments_created': 3, 'errors': None})
+
+    def test_large_batch_job_result_matches_the_synchronous_response(self):
+        with mock.patch('trainings.views.ASYNC_ASSIGNMENT_THRESHOLD', 2):
+            response = self.assign()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.data['status_url'].endswith(f'/api/jobs/{response.data["job_id"]}/'))
+        self.assertEqual(claim(1), [response.data['job_id']])
+        execute(response.data['job_id'])
+
+        job = self.client.get(response.data['status_url']).data
+        self.assertEqual(job['status'], 'SUCCEEDED')
+        self.assertEqual(job['result'], {'assignments_created': 3, 'errors': None})
+        self.assertEqual(TrainingAssignment.objects.filter(training=self.training).count(), 3)
+        self.assertEqual(Job.objects.get().created_by, self.admin)
@@ -9,7 +9,11 @@ from .serializers import (
     BulkAssignmentSerializer
 )
 from users.permissions import IsAdmin, IsHROfficer
-from users.models import Employee
+from jobs.views import accepted
+from .tasks import assign_employees
+
+# Assignments above this many employees run as a background job
+ASYNC_ASSIGNMENT_THRESHOLD = 200
 
 
 class TrainingViewSet(viewsets.ModelViewSet):
@@ -67,35 +71,19 @@ class TrainingViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        # Create assignments
-        assignments = []
-        errors = []
-        
-        for employee_id in employee_ids:
-            try:
-                employee = Employee.objects.get(id=employee_id)
-                
-                # Check if assignment already exists
-                if TrainingAssignment.objects.filter(
-                    training=training,
-                    employee=employee
-                ).exists():
-                    errors.append(f"Employee {employee.user.email} already assigned")
-                    continue
-                
-                assignment = TrainingAssignment.objects.create(
-                    training=training,
-                    employee=employee,
-                    assigned_by=request.user,
-                    notes=notes
-                )
-                assignments.append(assignment)
-                
-            except Employee.DoesNotExist:
-                errors.append(f"Employee ID {employee_id} not found")
+        # Large batches are handed off to the background job worker
+        if len(employee_ids) > ASYNC_ASSIGNMENT_THRESHOLD:
+            return accepted(request, 'trainings.assign', {
+                'training_id': training.id,
+                'employee_ids': employee_ids,
+                'assigned_by_id': request.user.id,
+                'notes': notes
+            })
+        
+        created, errors = assign_employees(training, employee_ids, request.user, notes)
         
         response_data = {
-            'assignments_created': len(assignments),
+            'assignments_created': created,
             'errors': errors if errors else None
         }
         
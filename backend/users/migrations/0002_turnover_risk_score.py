@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-16 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='risk_score',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='risk_scored_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
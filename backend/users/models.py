@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 
+from analytics.rollups import employee_facts, record_difference
+from surveys.dashboard import invalidate as invalidate_dashboard
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -66,6 +69,15 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.email} ({self.get_role_display()})"
 
+    # Fields shown on or grouping the turnover dashboard.
+    DASHBOARD_FIELDS = {'first_name', 'last_name', 'email', 'department'}
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.DASHBOARD_FIELDS & set(update_fields):
+            invalidate_dashboard()
+
 
 class Employee(models.Model):
     """Employee model extending the User model."""
@@ -83,6 +95,26 @@ class Employee(models.Model):
         ),
         default='LOW'
     )
+    # Maintained by the analytics risk model; turnover_risk is its band.
+    risk_score = models.FloatField(null=True, blank=True, editable=False, db_index=True)
+    risk_scored_at = models.DateTimeField(null=True, blank=True, editable=False)
     
     def __str__(self):
-        return f"{self.user.first_name} {self.user.last_name} - {self.position}"
\ No newline at end of file
+        return f"{self.user.first_name} {self.user.last_name} - {self.position}"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            # Hire date and active flag decide whether and when the hire counts
+            before = {} if self._state.adding else employee_facts(self.pk, ['hires'])
+            super().save(*args, **kwargs)
+            record_difference(before, employee_facts(self.pk, ['hires']))
+        invalidate_dashboard()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # Take out the facts of the exits and assignments deleted with the employee
+            before = employee_facts(self.pk)
+            result = super().delete(*args, **kwargs)
+            record_difference(before, {})
+        invalidate_dashboard()
+        return result
\ No newline at end of file
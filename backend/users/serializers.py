@@ -97,4 +97,5 @@ class EmployeeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = ['id', 'user', 'user_details', 'position', 
-                 'hire_date', 'is_active', 'turnover_risk']
\ No newline at end of file
+                 'hire_date', 'is_active', 'turnover_risk', 'risk_score']
+        read_only_fields = ['risk_score']
\ No newline at end of file
@@ -11,6 +11,7 @@ from .serializers import (
     CustomTokenObtainPairSerializer, PasswordResetSerializer
 )
 from .permissions import IsAdmin, IsHROfficer
+from config.pagination import KeysetPagination
 
 User = get_user_model()
 
@@ -71,5 +72,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 @permission_classes([permissions.IsAuthenticated])
 def active_employees(request):
     employees = Employee.objects.filter(user__is_active=True)
-    serializer = EmployeeSerializer(employees, many=True)
-    return Response(serializer.data)
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(employees, request)
+    serializer = EmployeeSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
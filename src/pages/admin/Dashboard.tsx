@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import AdminLayout from '../../components/layout/AdminLayout';
 import { Users, Building2, ClipboardList } from 'lucide-react';
-import api from '../../services/api';
+import { getAll } from '../../services/api';
 
 interface Stats {
   userCount: number;
@@ -25,10 +25,10 @@ const AdminDashboard: React.FC = () => {
         // For demo purposes, we're making separate API calls
         // In a real app, you might want a dedicated stats endpoint
         const [usersRes, departmentsRes, surveysRes, employeesRes] = await Promise.all([
-          api.get('/users/accounts/'),
-          api.get('/departments/'),
-          api.get('/surveys/forms/'),
-          api.get('/users/employees/')
+          getAll('/users/accounts/'),
+          getAll('/departments/'),
+          getAll('/surveys/forms/'),
+          getAll('/users/employees/')
         ]);
 
         setStats({
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { toast } from 'react-toastify';
 import { Building2, Plus, Edit2, Trash2, Users } from 'lucide-react';
 import AdminLayout from '../../components/layout/AdminLayout';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 interface Department {
   id: number;
@@ -31,7 +31,7 @@ const DepartmentManagement: React.FC = () => {
 
   const fetchDepartments = async () => {
     try {
-      const response = await api.get('/departments/');
+      const response = await getAll('/departments/');
       setDepartments(response.data);
     } catch (error) {
       console.error('Error fetching departments:', error);
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { toast } from 'react-toastify';
 import { Users, UserPlus, Key, Trash2, Edit } from 'lucide-react';
 import AdminLayout from '../../components/layout/AdminLayout';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 interface User {
   id: number;
@@ -48,7 +48,7 @@ const UserManagement: React.FC = () => {
 
   const fetchUsers = async () => {
     try {
-      const response = await api.get('/users/accounts/');
+      const response = await getAll('/users/accounts/');
       setUsers(response.data);
     } catch (error) {
       toast.error('Failed to load users');
@@ -59,7 +59,7 @@ const UserManagement: React.FC = () => {
 
   const fetchDepartments = async () => {
     try {
-      const response = await api.get('/departments/');
+      const response = await getAll('/departments/');
       setDepartments(response.data);
     } catch (error) {
       toast.error('Failed to load departments');
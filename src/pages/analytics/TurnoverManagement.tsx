@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { toast } from 'react-toastify';
 import { Users, FileText, Edit2, Trash2 } from 'lucide-react';
 import HRLayout from '../../components/layout/HRLayout';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 interface TurnoverRecord {
   id: string;
@@ -75,7 +75,7 @@ const TurnoverManagement: React.FC = () => {
 
   const fetchTurnoverRecords = async () => {
     try {
-      const response = await api.get('/analytics/turnover/records/');
+      const response = await getAll('/analytics/turnover/records/');
       setTurnoverRecords(response.data);
     } catch (err) {
       toast.error('Failed to load turnover records');
@@ -86,7 +86,7 @@ const TurnoverManagement: React.FC = () => {
 
   const fetchActiveEmployees = async () => {
     try {
-      const response = await api.get('/users/employees/active/');
+      const response = await getAll('/users/employees/active/');
       setActiveEmployees(response.data);
     } catch {
       toast.error('Failed to load active employees');
@@ -95,7 +95,7 @@ const TurnoverManagement: React.FC = () => {
 
   const fetchFactors = async () => {
     try {
-      const response = await api.get('/surveys/factors/');
+      const response = await getAll('/surveys/factors/');
       setFactors(response.data);
     } catch {
       toast.error('Failed to load risk factors');
@@ -3,7 +3,7 @@ import { Link, useSearchParams } from 'react-router-dom';
 import { Loader2 } from 'lucide-react';
 import { toast } from 'react-toastify';
 import EmployeeLayout from '../../components/layout/EmployeeLayout';
-import api from '../../services/api';
+import { getAll } from '../../services/api';
 
 interface SurveyAssignment {
   id: number;
@@ -24,7 +24,7 @@ const SurveysList: React.FC = () => {
   useEffect(() => {
     const fetchSurveys = async () => {
       try {
-        const response = await api.get('/surveys/assignments/');
+        const response = await getAll('/surveys/assignments/');
         setSurveys(response.data);
       } catch (error) {
         console.error('Error fetching surveys:', error);
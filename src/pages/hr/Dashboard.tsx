@@ -5,7 +5,7 @@ import {
   Tooltip, Legend, ResponsiveContainer, Cell
 } from 'recharts';
 import { AlertTriangle, CheckCircle, Users, ListChecks, TrendingDown } from 'lucide-react';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 import { EmployeeStats, TurnoverData } from '../../types/analytics';
 import TurnoverRateCard from '../../components/analytics/TurnoverRateCard';
 import TurnoverTrendsChart from '../../components/analytics/TurnoverTrendsChart';
@@ -22,7 +22,7 @@ import {
   AlertTriangle, CheckCircle, Users, ListChecks, 
   Download, Filter, Calendar, Building2
 } from 'lucide-react';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 interface EmployeeStats {
   total: number;
@@ -76,15 +76,15 @@ const HRDashboard: React.FC = () => {
     const fetchEmployeeData = async () => {
       try {
         // Fetch employees
-        const employeesResponse = await api.get('/users/employees/');
+        const employeesResponse = await getAll('/users/employees/');
         const employees = employeesResponse.data;
         
         // Fetch departments
-        const departmentsResponse = await api.get('/departments/');
+        const departmentsResponse = await getAll('/departments/');
         const departments = departmentsResponse.data;
         
         // Fetch survey assignments
-        const assignmentsResponse = await api.get('/surveys/assignments/');
+        const assignmentsResponse = await getAll('/surveys/assignments/');
         const assignments = assignmentsResponse.data;
         
         // Process employee risk data
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { toast } from 'react-toastify';
 import { Users, UserPlus, Edit2, Trash2 } from 'lucide-react';
 import HRLayout from '../../components/layout/HRLayout';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 interface User {
   id: number;
@@ -59,7 +59,7 @@ const EmployeeManagement: React.FC = () => {
 
   const fetchEmployees = async () => {
     try {
-      const response = await api.get('/users/employees/');
+      const response = await getAll('/users/employees/');
       setEmployees(response.data);
     } catch (error) {
       console.error('Error fetching employees:', error);
@@ -71,7 +71,7 @@ const EmployeeManagement: React.FC = () => {
 
   const fetchDepartments = async () => {
     try {
-      const response = await api.get('/departments/');
+      const response = await getAll('/departments/');
       setDepartments(response.data);
     } catch (error) {
       console.error('Error fetching departments:', error);
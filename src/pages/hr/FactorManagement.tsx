@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { toast } from 'react-toastify';
 import { ListChecks, Plus, Edit2, Trash2 } from 'lucide-react';
 import HRLayout from '../../components/layout/HRLayout';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 interface Factor {
   id: number;
@@ -31,7 +31,7 @@ const FactorManagement: React.FC = () => {
 
   const fetchFactors = async () => {
     try {
-      const response = await api.get('/surveys/factors/');
+      const response = await getAll('/surveys/factors/');
       setFactors(response.data);
     } catch (error) {
       console.error('Error fetching factors:', error);
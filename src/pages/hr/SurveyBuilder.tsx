@@ -8,7 +8,7 @@ import {
   GripVertical, AlertCircle
 } from 'lucide-react';
 import HRLayout from '../../components/layout/HRLayout';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 // Survey form types
 interface Question {
@@ -102,7 +102,7 @@ const SurveyBuilder: React.FC = () => {
 
     const fetchFactors = async () => {
       try {
-        const response = await api.get('/surveys/factors/');
+        const response = await getAll('/surveys/factors/');
         setFactors(response.data);
       } catch (error) {
         console.error('Error fetching factors:', error);
@@ -276,7 +276,7 @@ const SurveyBuilder: React.FC = () => {
       // Handle questions - create, update, or delete
       if (isEditMode) {
         // Get existing questions
-        const existingQuestionsRes = await api.get(`/surveys/questions/?survey_id=${surveyId}`);
+        const existingQuestionsRes = await getAll(`/surveys/questions/?survey_id=${surveyId}`);
         const existingQuestions = existingQuestionsRes.data;
 
         // Determine which questions to update, create, or delete
@@ -6,7 +6,7 @@ import {
 } from 'lucide-react';
 import { toast } from 'react-toastify';
 import HRLayout from '../../components/layout/HRLayout';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 
 // Types
 interface Survey {
@@ -74,7 +74,7 @@ const SurveyList = () => {
   const fetchSurveys = async () => {
     setIsLoading(true);
     try {
-      const response = await api.get('/surveys/forms/');
+      const response = await getAll('/surveys/forms/');
       setSurveys(response.data);
     } catch (error) {
       console.error('Error fetching surveys:', error);
@@ -115,7 +115,7 @@ const SurveyList = () => {
 
     // Fetch employees - using the correct endpoint from your Django views
     try {
-      const response = await api.get('/users/employees/');
+      const response = await getAll('/users/employees/');
       console.log('Employee API response:', response.data); // Debug log
       setEmployees(response.data);
     } catch (error) {
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { toast } from 'react-toastify';
 import { BookOpen, Plus, Edit2, Trash2, Users } from 'lucide-react';
 import HRLayout from '../../components/layout/HRLayout';
-import api from '../../services/api';
+import api, { getAll, jobResult } from '../../services/api';
 
 interface Training {
   id: number;
@@ -82,7 +82,7 @@ const TrainingManagement: React.FC = () => {
 
   const fetchTrainings = async () => {
     try {
-      const response = await api.get('/trainings/programs/');
+      const response = await getAll('/trainings/programs/');
       setTrainings(response.data);
     } catch (error) {
       console.error('Error fetching trainings:', error);
@@ -94,7 +94,7 @@ const TrainingManagement: React.FC = () => {
 
   const fetchDepartments = async () => {
     try {
-      const response = await api.get('/departments/');
+      const response = await getAll('/departments/');
       setDepartments(response.data);
     } catch (error) {
       console.error('Error fetching departments:', error);
@@ -104,7 +104,7 @@ const TrainingManagement: React.FC = () => {
 
   const fetchFactors = async () => {
     try {
-      const response = await api.get('/surveys/factors/');
+      const response = await getAll('/surveys/factors/');
       setFactors(response.data);
     } catch (error) {
       console.error('Error fetching factors:', error);
@@ -114,7 +114,7 @@ const TrainingManagement: React.FC = () => {
 
   const fetchEmployees = async () => {
     try {
-      const response = await api.get('/users/employees/');
+      const response = await getAll('/users/employees/');
       setEmployees(response.data);
     } catch (error) {
       console.error('Error fetching employees:', error);
@@ -166,10 +166,11 @@ const TrainingManagement: React.FC = () => {
     }
 
     try {
-      const response = await api.post(`/trainings/programs/${selectedTraining.id}/assign/`, {
+      // Large batches are assigned by a background job
+      const response = await jobResult(await api.post(`/trainings/programs/${selectedTraining.id}/assign/`, {
         employee_ids: selectedEmployees,
         notes: assignmentNotes,
-      });
+      }));
 
       if (response.data.errors) {
         toast.warning(`Assignment completed with some issues: ${response.data.errors.join(', ')}`);
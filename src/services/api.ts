@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { AxiosRequestConfig, AxiosResponse } from 'axios';
 
 const baseURL = process.env.NODE_ENV === 'production' 
   ? 'https://api.example.com/api' // Replace with your production API URL
@@ -61,4 +61,35 @@ api.interceptors.response.use(
   }
 );
 
+// List endpoints are paginated; follow the `next` links and return every row
+// as `data`, like a plain `api.get` of an unpaginated list.
+export const getAll = async (url: string, config?: AxiosRequestConfig) => {
+  let response = await api.get(url, config);
+  const rows = [...response.data.results];
+  while (response.data.next) {
+    response = await api.get(response.data.next);
+    rows.push(...response.data.results);
+  }
+  return { ...response, data: rows };
+};
+
+// Endpoints answer 202 with a job reference when the work runs in the
+// background; poll the job and return its result as `data`, like the
+// synchronous response would have.
+export const jobResult = async (response: AxiosResponse, interval = 1000) => {
+  if (response.status !== 202) {
+    return response;
+  }
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, interval));
+    const job = await api.get(response.data.status_url);
+    if (job.data.status === 'SUCCEEDED') {
+      return { ...job, data: job.data.result };
+    }
+    if (job.data.status === 'FAILED') {
+      throw new Error(job.data.error || `Job ${job.data.id} failed`);
+    }
+  }
+};
+
 export default api;
\ No newline at end of file